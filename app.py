@@ -1,9 +1,13 @@
-import json
+from datetime import datetime, timezone
+from functools import wraps
+import os
+import time
 
-from flask import Flask, request, jsonify, make_response, Response, request
+from flask import Blueprint, Flask, g, request, jsonify, make_response, Response
 from flask_sqlalchemy import SQLAlchemy
+from werkzeug.http import is_resource_modified
 from movie_collection.db import db
-from movie_collection.models.user_model import Users
+from movie_collection.models.user_model import Users, clear_user_cache
 
 from movie_collection.models.movie_model import (
     Movie, 
@@ -12,14 +16,35 @@ from movie_collection.models.movie_model import (
     find_movie_by_language,
     find_movie_by_director,
     find_movie_by_genre,
+    get_genres,
+    start_genre_refresher,
+    clear_tmdb_cache,
     add_movie_to_list,
+    bulk_add_movies,
+    bulk_update_movies,
+    list_movies,
+    pick_random_movie,
     delete_movie_from_list,
     clear_movie_list,
     mark_movie_as_favorite,
-    list_favorite_movies
+    list_favorite_movies_page
 )
 
+from movie_collection.mirror_sync import start_mirror_scheduler
+from movie_collection.utils.catalog_version import catalog_version
+from movie_collection.utils.session_utils import (
+    SESSION_TTL,
+    issue_session_token,
+    migrate_session_revocations,
+    revoke_session_token,
+    revoke_user_sessions,
+    verify_session_token
+)
+from movie_collection.utils.logger import configure_logger, log_rate_limited
+from movie_collection.utils.metrics_utils import metrics
 from movie_collection.utils.sql_utils import check_database_connection, check_table_exists
+from movie_collection.utils.tmdb_client import reset_tmdb_client
+from movie_collection.utils.stream_utils import iter_json_records
 
 import logging
 from dotenv import load_dotenv
@@ -30,11 +55,95 @@ load_dotenv()
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+bp = Blueprint('movie_collection', __name__)
+
+DEFAULT_CONFIG = {
+    'SQLALCHEMY_DATABASE_URI': 'sqlite:///users.db',
+    'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+}
+
+def create_app(config: dict = None) -> Flask:
+    """
+    Build the Flask application.
 
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///users.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
+    Args:
+        config (dict, optional): Settings that override DEFAULT_CONFIG.
+
+    Returns:
+        Flask: The configured application with every route registered.
+    """
+    flask_app = Flask(__name__)
+    flask_app.config.update(DEFAULT_CONFIG)
+    flask_app.config.update(config or {})
+    db.init_app(flask_app)
+    flask_app.register_blueprint(bp)
+    return flask_app
+
+def create_tables(flask_app: Flask) -> None:
+    """Create the users and session revocation tables if they do not exist. Run once, before workers start."""
+    with flask_app.app_context():
+        db.create_all()
+        migrate_session_revocations()
+        logger.info('Database tables created successfully')
+
+def init_worker() -> None:
+    """
+    Set up per-process resources in a newly started worker.
+
+    A forked worker must not reuse the parent's TMDB sockets, starts with empty
+    caches and metrics so nothing is reported twice, and has to start its own
+    background jobs because threads do not survive fork. Every worker runs a
+    mirror scheduler, but they share a lock so each slice is synced once per
+    interval. The SQLite pool and the logging pipeline reset themselves at fork.
+    """
+    reset_tmdb_client()
+    clear_tmdb_cache()
+    clear_user_cache()
+    metrics.reset()
+    start_genre_refresher()
+    start_mirror_scheduler()
+
+##########################################################
+#
+# Instrumentation
+#
+##########################################################
+
+@bp.before_app_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@bp.after_app_request
+def record_request_metrics(response: Response) -> Response:
+    # Label by URL rule rather than path so IDs in paths do not create new series.
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    labels = (('route', route), ('method', request.method))
+    metrics.inc('http_requests_total', labels + (('status', str(response.status_code)),))
+    start = g.get('request_start')
+    if start is not None:
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - start, labels)
+    return response
+
+# Metrics are kept per worker process; this tells a scraper which one answered.
+metrics.register_collector(lambda: [(
+    'process_info', 'gauge', 'The process that served this scrape; every other metric covers this process only.',
+    [((('pid', str(os.getpid())),), 1)]
+)])
+
+@bp.route('/api/metrics', methods=['GET'])
+def metrics_page() -> Response:
+    """
+    Expose request, TMDB, SQLite, cache and pool metrics for Prometheus to scrape.
+
+    Under gunicorn each worker has its own metrics, so a scrape reports the
+    worker that served it, identified by process_info{pid}.
+
+    Returns:
+        Response: The metrics in the Prometheus text format, 200
+    """
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 ##########################################################
 #
@@ -42,7 +151,7 @@ db.init_app(app)
 #
 ##########################################################
 
-@app.route('/api/health', methods=['GET'])
+@bp.route('/api/health', methods=['GET'])
 def healthcheck() -> Response:
     """
     Health check route to verify the service is running.
@@ -50,10 +159,10 @@ def healthcheck() -> Response:
     Returns:
         JSON Response: {"status": "healthy"}, 200
     """
-    logger.info('Health check requested')
+    logger.debug('Health check requested')
     return make_response(jsonify({'status': 'healthy'}), 200)
 
-@app.route('/api/db-check', methods=['GET'])
+@bp.route('/api/db-check', methods=['GET'])
 def db_check() -> Response:
     """
     Route to check if the database connection and movies table are functional.
@@ -64,12 +173,12 @@ def db_check() -> Response:
         404 error if there is an issue with the database.
     """
     try:
-        app.logger.info("Checking database connection...")
+        logger.info("Checking database connection...")
         check_database_connection()
-        app.logger.info("Database connection is OK.")
-        app.logger.info("Checking if movies table exists...")
+        logger.info("Database connection is OK.")
+        logger.info("Checking if movies table exists...")
         check_table_exists("movies")
-        app.logger.info("movies table exists.")
+        logger.info("movies table exists.")
         return make_response(jsonify({'database_status': 'healthy'}), 200)
     except Exception as e:
         return make_response(jsonify({'error': str(e)}), 404)
@@ -80,7 +189,36 @@ def db_check() -> Response:
 #
 ##########################################################
 
-@app.route('/create-account', methods=['POST'])
+def _bearer_token() -> str:
+    """Read the token from an 'Authorization: Bearer <token>' header, or None."""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token.strip():
+        return None
+    return token.strip()
+
+def login_required(view):
+    """
+    Require a valid session token from /login on a route.
+
+    The token is verified in memory (signature, expiry and revocations), so no
+    user lookup or password hash runs per request; revocations are reloaded
+    from the database only after one is recorded. The username is available
+    to the view as flask.g.username.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            g.username = verify_session_token(_bearer_token())
+        except ValueError as e:
+            log_rate_limited(logger, logging.WARNING, 10, 'Rejected session: %s', str(e))
+            return make_response(jsonify({'error': str(e)}), 401)
+        except Exception as e:
+            logger.error('Unexpected error while checking session: %s', str(e))
+            return make_response(jsonify({'error': 'An error occurred while checking the session'}), 500)
+        return view(*args, **kwargs)
+    return wrapper
+
+@bp.route('/create-account', methods=['POST'])
 def create_account():
     """
     Create a new user account with secure password storage.
@@ -118,7 +256,7 @@ def create_account():
         logger.error('Unexpected error during account creation: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while creating the account'}), 500)
 
-@app.route('/login', methods=['POST'])
+@bp.route('/login', methods=['POST'])
 def login():
     """
     Verify user credentials against stored password hash.
@@ -129,7 +267,8 @@ def login():
 
     Returns:
         JSON Response:
-            - success: {"status": "success", "message": "Login successful"}, 200
+            - success: {"status": "success", "message": "Login successful",
+                        "token": session_token, "expires_in": seconds}, 200
             - error: {"error": error_message}, status_code
 
     Raises:
@@ -137,7 +276,7 @@ def login():
         401: If authentication fails
         404: If user not found
     """
-    logger.info('Processing login request')
+    logger.debug('Processing login request')
     data = request.get_json()
     username = data.get('username')
     password = data.get('password')
@@ -149,7 +288,12 @@ def login():
     try:
         if Users.check_password(username, password):
             logger.info('Login successful for user: %s', username)
-            return make_response(jsonify({'status': 'success', 'message': 'Login successful'}), 200)
+            return make_response(jsonify({
+                'status': 'success',
+                'message': 'Login successful',
+                'token': issue_session_token(username),
+                'expires_in': SESSION_TTL
+            }), 200)
         logger.warning('Failed login attempt for user: %s', username)
         return make_response(jsonify({'error': 'Invalid credentials'}), 401)
     except ValueError as e:
@@ -159,7 +303,7 @@ def login():
         logger.error('Unexpected error during login: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred during login'}), 500)
 
-@app.route('/update-password', methods=['POST'])
+@bp.route('/update-password', methods=['POST'])
 def update_password():
     """
     Update a user's password after verifying their current password.
@@ -171,15 +315,18 @@ def update_password():
 
     Returns:
         JSON Response:
-            - success: {"status": "success", "message": "Password updated successfully"}, 200
+            - success: {"status": "success", "message": "Password updated successfully",
+                        "token": session_token, "expires_in": seconds}, 200
             - error: {"error": error_message}, status_code
 
+    Existing session tokens for the user are revoked and a new one is returned.
+
     Raises:
         400: If input validation fails
         401: If old password is invalid
         404: If user not found
     """
-    logger.info('Processing password update request')
+    logger.debug('Processing password update request')
     data = request.get_json()
     username = data.get('username')
     old_password = data.get('old_password')
@@ -192,8 +339,14 @@ def update_password():
     try:
         if Users.check_password(username, old_password):
             Users.update_password(username, new_password)
+            revoke_user_sessions(username)
             logger.info('Password updated successfully for user: %s', username)
-            return make_response(jsonify({'status': 'success', 'message': 'Password updated successfully'}), 200)
+            return make_response(jsonify({
+                'status': 'success',
+                'message': 'Password updated successfully',
+                'token': issue_session_token(username),
+                'expires_in': SESSION_TTL
+            }), 200)
         logger.warning('Invalid old password provided for user: %s', username)
         return make_response(jsonify({'error': 'Invalid old password'}), 401)
     except ValueError as e:
@@ -203,35 +356,80 @@ def update_password():
         logger.error('Unexpected error during password update: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while updating the password'}), 500)
 
+@bp.route('/logout', methods=['POST'])
+@login_required
+def logout():
+    """
+    Revoke the session token sent in the Authorization header.
+
+    Expected Headers:
+        - Authorization: Bearer <token from /login>
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success", "message": "Logged out"}, 200
+            - error: {"error": error_message}, 401 or 500
+    """
+    try:
+        revoke_session_token(_bearer_token())
+    except Exception as e:
+        logger.error('Unexpected error during logout: %s', str(e))
+        return make_response(jsonify({'error': 'An error occurred while logging out'}), 500)
+    logger.info('Logged out user: %s', g.username)
+    return make_response(jsonify({'status': 'success', 'message': 'Logged out'}), 200)
+
+@bp.route('/session', methods=['GET'])
+@login_required
+def current_session():
+    """
+    Report which user the session token belongs to.
+
+    Expected Headers:
+        - Authorization: Bearer <token from /login>
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success", "username": username}, 200
+            - error: {"error": error_message}, 401
+    """
+    return make_response(jsonify({'status': 'success', 'username': g.username}), 200)
+
 ##########################################################
 #
 # Movie Management
 #
 ##########################################################
 
-@app.route('/movies/search-by-name', methods=['POST'])
+@bp.route('/movies/search-by-name', methods=['POST'])
 def search_by_name():
     """
     Search for a movie by name.
 
     Expected Query Parameters:
         - name (str): The name of the movie to search for
+        - mode (str, optional): 'remote' (default) always asks TMDB; 'local-first'
+          answers from the stored catalog and asks TMDB only on a miss
 
     Returns:
         JSON Response:
             - success: Movie details, 200
             - error: {"error": error_message}, status_code
     """
-    logger.info('Processing movie search by name request')
+    logger.debug('Processing movie search by name request')
     data = request.get_json()
     name = data.get('name')
+    mode = data.get('mode', 'remote')
     
     if not name:
         logger.error('Missing movie name in request')
         return make_response(jsonify({'error': 'Movie name is required'}), 400)
+
+    if mode not in ('remote', 'local-first'):
+        logger.error('Invalid search mode: %s', mode)
+        return make_response(jsonify({'error': "Mode must be 'remote' or 'local-first'"}), 400)
     
     try:
-        movie = find_movie_by_name(name)
+        movie = find_movie_by_name(name, local_first=(mode == 'local-first'))
         logger.info('Movie found: %s', movie.name)
         return make_response(jsonify({
             'status': 'success',
@@ -248,7 +446,7 @@ def search_by_name():
         logger.error('Unexpected error during movie search: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while searching for the movie'}), 500)
 
-@app.route('/movies/search-by-year', methods=['POST'])
+@bp.route('/movies/search-by-year', methods=['POST'])
 def search_by_year():
     """
     Get a random movie from a specific year.
@@ -261,7 +459,7 @@ def search_by_year():
             - success: Movie details, 200
             - error: {"error": error_message}, status_code
     """
-    logger.info('Processing random movie by year request')
+    logger.debug('Processing random movie by year request')
     try:
         data = request.get_json()
         year = int(data.get('year'))
@@ -291,7 +489,7 @@ def search_by_year():
         logger.error('Unexpected error during movie search: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while searching for the movie'}), 500)
 
-@app.route('/movies/search-by-language', methods=['POST'])
+@bp.route('/movies/search-by-language', methods=['POST'])
 def search_by_language():
     """
     Search for movies by original language.
@@ -304,7 +502,7 @@ def search_by_language():
             - success: Movie details, 200
             - error: {"error": error_message}, status_code
     """
-    logger.info('Processing movie search by language request')
+    logger.debug('Processing movie search by language request')
     data = request.get_json()
     language_code = data.get('language_code')
     
@@ -330,7 +528,7 @@ def search_by_language():
         logger.error('Unexpected error during movie search: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while searching for the movie'}), 500)
 
-@app.route('/movies/search-by-director', methods=['POST'])
+@bp.route('/movies/search-by-director', methods=['POST'])
 def search_by_director():
     """
     Search for movies by director name.
@@ -343,7 +541,7 @@ def search_by_director():
             - success: Movie details, 200
             - error: {"error": error_message}, status_code
     """
-    logger.info('Processing movie search by director request')    
+    logger.debug('Processing movie search by director request')    
     data = request.get_json()
     director = data.get('director')
     
@@ -369,7 +567,7 @@ def search_by_director():
         logger.error('Unexpected error during movie search: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while searching for the movie'}), 500)
 
-@app.route('/movies/search-by-genre', methods=['POST'])
+@bp.route('/movies/search-by-genre', methods=['POST'])
 def search_by_genre():
     """
     Search for movies by genre ID.
@@ -382,7 +580,7 @@ def search_by_genre():
             - success: Movie details, 200
             - error: {"error": error_message}, status_code
     """
-    logger.info('Processing movie search by genre request')
+    logger.debug('Processing movie search by genre request')
 
     try:
         data = request.get_json()
@@ -413,7 +611,27 @@ def search_by_genre():
         logger.error('Unexpected error during movie search: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while searching for the movie'}), 500)
     
-@app.route('/movies/add-to-list', methods=['POST'])
+@bp.route('/movies/genres', methods=['GET'])
+def list_genres() -> Response:
+    """
+    List the TMDB movie genres known to the service.
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success", "genres": [{"id": int, "name": str}, ...]}, 200
+            - error: {"error": error_message}, status_code
+    """
+    try:
+        genres = get_genres()
+        return make_response(jsonify({
+            'status': 'success',
+            'genres': [{'id': genre_id, 'name': name} for genre_id, name in sorted(genres.items())]
+        }), 200)
+    except Exception as e:
+        logger.error('Unexpected error while listing genres: %s', str(e))
+        return make_response(jsonify({'error': 'An error occurred while retrieving genres'}), 500)
+
+@bp.route('/movies/add-to-list', methods=['POST'])
 def add_to_list():
     """
     Add a movie to the database.
@@ -489,7 +707,206 @@ def add_to_list():
         logger.error('Unexpected error: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while adding movie to the database'}), 500)
     
-@app.route('/movies/delete-from-list', methods=['DELETE'])
+@bp.route('/movies/bulk-add', methods=['POST'])
+def bulk_add():
+    """
+    Add many movies to the database from a streamed request body.
+
+    Expected Body:
+        Either a JSON array of movie objects or NDJSON (one movie object per line).
+        Each object takes the fields of /movies/add-to-list.
+
+    Returns:
+        JSON Response:
+            - success: Import summary with per-row duplicates and rejects, 200
+            - error: Import summary with an "error" key if the body is malformed, 400
+            - error: {"error": error_message}, 500
+    """
+    logger.info('Bulk adding movies to the database')
+    try:
+        summary = bulk_add_movies(iter_json_records(request.stream))
+        if 'error' in summary:
+            return make_response(jsonify({'status': 'error', **summary}), 400)
+        return make_response(jsonify({'status': 'success', **summary}), 200)
+    except Exception as e:
+        logger.error('Unexpected error: %s', str(e))
+        return make_response(jsonify({'error': 'An error occurred while bulk adding movies to the database'}), 500)
+
+@bp.route('/movies/bulk-update', methods=['POST'])
+def bulk_update():
+    """
+    Favorite, unfavorite, delete or restore many movies in one transaction.
+
+    Expected JSON Input:
+        - operation (str): 'favorite', 'unfavorite', 'delete' or 'restore'
+        - ids (list of int, optional): Movie IDs
+        - names (list of str, optional): Movie names
+
+    Returns:
+        JSON Response:
+            - success: Summary with updated, unchanged and missing movies, 200
+            - error: {"error": error_message}, status_code
+
+    Raises:
+        400: If the operation is unknown or the ids/names are missing or invalid
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        logger.error('Missing JSON body in bulk update request')
+        return make_response(jsonify({'error': 'A JSON object body is required'}), 400)
+
+    try:
+        summary = bulk_update_movies(data.get('operation'), ids=data.get('ids'), names=data.get('names'))
+        return make_response(jsonify({'status': 'success', **summary}), 200)
+    except ValueError as e:
+        logger.error('Value error: %s', str(e))
+        return make_response(jsonify({'error': str(e)}), 400)
+    except Exception as e:
+        logger.error('Unexpected error: %s', str(e))
+        return make_response(jsonify({'error': 'An error occurred while updating movies'}), 500)
+
+def _int_arg(name: str):
+    """Read an optional integer query parameter, raising ValueError if it is malformed."""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a valid integer")
+
+def _bool_arg(name: str, default=None):
+    """Read an optional true/false query parameter; 'any' means no filter."""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    value = value.lower()
+    if value in ('true', '1'):
+        return True
+    if value in ('false', '0'):
+        return False
+    if value == 'any':
+        return None
+    raise ValueError(f"{name} must be true, false or any")
+
+def catalog_conditional(view):
+    """
+    Validate a catalog read against the catalog version before running it.
+
+    Responses carry an ETag and Last-Modified taken from catalog_version, so a
+    request whose If-None-Match (or, without one, If-Modified-Since) still
+    matches gets an empty 304 without the view or any database query running.
+    Last-Modified has one-second resolution, so it is left out until the second
+    of the last change has passed; a later change in that same second would
+    otherwise still match it.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Read before the view queries, so the validators never claim newer data than was served.
+        state = catalog_version.current()
+        if state is None:
+            return view(*args, **kwargs)
+        epoch, version, modified_at = state
+        etag = f"{epoch}-{version}"
+        last_modified = None
+        if int(time.time()) > int(modified_at):
+            last_modified = datetime.fromtimestamp(int(modified_at), timezone.utc)
+
+        if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        else:
+            response = Response(status=304)
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return wrapper
+
+@bp.route('/movies/list', methods=['GET'])
+@catalog_conditional
+def list_catalog():
+    """
+    List stored movies with optional filters and keyset pagination.
+
+    Expected Query Parameters:
+        - year_from (int, optional): Earliest release year, inclusive
+        - year_to (int, optional): Latest release year, inclusive
+        - director (str, optional): Exact director name
+        - original_language (str, optional): Exact original language code
+        - genre_id (int, optional): TMDB genre ID
+        - favorite (true/false/any, optional): Favorite filter, defaults to any
+        - deleted (true/false/any, optional): Deleted filter, defaults to false
+        - cursor (int, optional): The next_cursor of the previous page
+        - limit (int, optional): Page size, defaults to 50, at most 500
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success", "movies": [...], "next_cursor": int or null}, 200
+            - not modified: empty body, 304, if the catalog has not changed since the validators were issued
+            - error: {"error": error_message}, status_code
+    """
+    try:
+        filters = {
+            'year_from': _int_arg('year_from'),
+            'year_to': _int_arg('year_to'),
+            'director': request.args.get('director') or None,
+            'original_language': request.args.get('original_language') or None,
+            'genre_id': _int_arg('genre_id'),
+            'favorite': _bool_arg('favorite'),
+            'deleted': _bool_arg('deleted', default=False),
+            'after_id': _int_arg('cursor'),
+        }
+        limit = _int_arg('limit')
+        if limit is not None:
+            filters['limit'] = limit
+        page = list_movies(**filters)
+    except ValueError as e:
+        logger.error('Value error: %s', str(e))
+        return make_response(jsonify({'error': str(e)}), 400)
+    except Exception as e:
+        logger.error('Unexpected error: %s', str(e))
+        return make_response(jsonify({'error': 'An error occurred while listing movies'}), 500)
+    return make_response(jsonify({'status': 'success', **page}), 200)
+
+@bp.route('/movies/random', methods=['GET'])
+def random_stored_movie():
+    """
+    Pick a random stored movie, optionally filtered, without calling TMDB.
+
+    Expected Query Parameters:
+        - year (int, optional): Release year
+        - genre_id (int, optional): TMDB genre ID
+        - original_language (str, optional): Original language code
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success", "movie": {...}}, 200
+            - error: {"error": error_message}, status_code
+    """
+    try:
+        filters = {
+            'year': _int_arg('year'),
+            'genre_id': _int_arg('genre_id'),
+            'original_language': request.args.get('original_language') or None,
+        }
+    except ValueError as e:
+        logger.error('Value error: %s', str(e))
+        return make_response(jsonify({'error': str(e)}), 400)
+
+    try:
+        movie = pick_random_movie(**filters)
+    except ValueError as e:
+        logger.error('Value error: %s', str(e))
+        return make_response(jsonify({'error': str(e)}), 404)
+    except Exception as e:
+        logger.error('Unexpected error: %s', str(e))
+        return make_response(jsonify({'error': 'An error occurred while picking a random movie'}), 500)
+    return make_response(jsonify({'status': 'success', 'movie': movie}), 200)
+
+@bp.route('/movies/delete-from-list', methods=['DELETE'])
 def delete_from_list():
     """
     Soft deletes a movie from the catalog by marking it as deleted.
@@ -525,7 +942,7 @@ def delete_from_list():
         logger.error('Unexpected error: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while deleting movie from the database'}), 500)
 
-@app.route('/movies/clear-list', methods=['DELETE'])
+@bp.route('/movies/clear-list', methods=['DELETE'])
 def clear_list():
     """
     Recreates the movie table, effectively deleting all movies.
@@ -548,7 +965,7 @@ def clear_list():
         logger.error('Unexpected error: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while clearing the database'}), 500)
     
-@app.route('/movies/mark-as-favorite', methods=['POST'])
+@bp.route('/movies/mark-as-favorite', methods=['POST'])
 def mark_as_favorite():
     """
     Marks a movie as a favorite in the database.
@@ -577,32 +994,42 @@ def mark_as_favorite():
         logger.error('Unexpected error: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while marking a movie favorite'}), 500)
     
-@app.route('/movies/list-favorite', methods=['GET'])
-def list_favorite() -> list:
+@bp.route('/movies/list-favorite', methods=['GET'])
+@catalog_conditional
+def list_favorite() -> Response:
     """
-    Fetches the names of all favorite movies from the database.
+    Fetches one page of the names of favorite movies that have not been deleted.
+
+    Expected Query Parameters:
+        - cursor (int, optional): The next_cursor of the previous page
+        - limit (int, optional): Page size, defaults to 100, at most 500
 
     Returns:
         JSON Response:
-            - success: Movie List, 200
+            - success: {"status": "success", "favorite_movies": [...], "next_cursor": int or null}, 200
+            - not modified: empty body, 304, if the catalog has not changed since the validators were issued
             - error: {"error": error_message}, status_code
     """
     try:
-        logger.info('Retriving Favorites')
-        favorite_movies = list_favorite_movies()
-        return make_response(jsonify({
-            'status': 'success',
-            'favorite_movies': json.dumps(favorite_movies)
-        }), 200)
+        logger.debug('Retriving Favorites')
+        page_args = {'after_id': _int_arg('cursor')}
+        limit = _int_arg('limit')
+        if limit is not None:
+            page_args['limit'] = limit
+        page = list_favorite_movies_page(**page_args)
     except ValueError as e:
         logger.error('Value error: %s', str(e))
-        return make_response(jsonify({'error': str(e)}), 404)
+        return make_response(jsonify({'error': str(e)}), 400)
     except Exception as e:
         logger.error('Unexpected error: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while retriving favorite movies'}), 500)
 
+    return make_response(jsonify({'status': 'success', **page}), 200)
+
+app = create_app()
+
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
-        logger.info('Database tables created successfully')
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py).
+    create_tables(app)
+    init_worker()
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', host='0.0.0.0', port=int(os.getenv('PORT', '5000')))
\ No newline at end of file
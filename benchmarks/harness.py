@@ -0,0 +1,176 @@
+"""
+Timing, percentile and baseline helpers for the benchmark runner.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import json
+import math
+import os
+import threading
+import time
+
+
+# Metrics compared against a baseline, and whether a higher value is better.
+COMPARED_METRICS = (
+    ('ops_per_sec', True),
+    ('p50_ms', False),
+    ('p95_ms', False),
+    ('p99_ms', False),
+)
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values (list): Values in ascending order.
+        pct (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The value at that percentile, or 0.0 for an empty list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(durations: list, errors: int, wall_seconds: float) -> dict:
+    """
+    Turn raw per-operation durations into the reported statistics.
+
+    Args:
+        durations (list): Seconds taken by each operation, failed ones included.
+        errors (int): Operations that raised.
+        wall_seconds (float): Elapsed time for the whole run.
+
+    Returns:
+        dict: iterations, errors, ops_per_sec and mean/p50/p95/p99/max latency in milliseconds.
+    """
+    ordered = sorted(durations)
+    count = len(ordered)
+    return {
+        'iterations': count,
+        'errors': errors,
+        'ops_per_sec': round(count / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        'mean_ms': round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+def run_benchmark(func, iterations: int, concurrency: int = 1, setup=None, warmup: int = 0) -> dict:
+    """
+    Call func repeatedly and time each call.
+
+    Args:
+        func: Called with the iteration index. Exceptions are counted as errors.
+        iterations (int): Number of timed calls.
+        concurrency (int): Number of threads making calls at once.
+        setup (optional): Called with the iteration index before each call, untimed.
+        warmup (int): Untimed calls made first, e.g. to fill connection pools.
+
+    Returns:
+        dict: The statistics from summarize().
+    """
+    for index in range(warmup):
+        if setup is not None:
+            setup(-index - 1)
+        try:
+            func(-index - 1)
+        except Exception:
+            pass
+
+    durations = []
+    errors = [0]
+    indexes = itertools.count()
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        failed = 0
+        while True:
+            index = next(indexes)
+            if index >= iterations:
+                break
+            if setup is not None:
+                setup(index)
+            start = time.perf_counter()
+            try:
+                func(index)
+            except Exception:
+                failed += 1
+            local.append(time.perf_counter() - start)
+        with lock:
+            durations.extend(local)
+            errors[0] += failed
+
+    start = time.perf_counter()
+    if concurrency <= 1:
+        worker()
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [executor.submit(worker) for _ in range(concurrency)]:
+                future.result()
+    wall_seconds = time.perf_counter() - start
+    return summarize(durations, errors[0], wall_seconds)
+
+
+def save_baseline(path: str, results: dict, meta: dict) -> None:
+    """
+    Write benchmark results to a JSON file.
+
+    Args:
+        path (str): The file to write; parent directories are created.
+        results (dict): Statistics keyed by benchmark name.
+        meta (dict): Run settings recorded with the results, e.g. latency and commit.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as fh:
+        json.dump({'meta': meta, 'results': results}, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+
+
+def load_baseline(path: str) -> dict:
+    """
+    Read a file written by save_baseline.
+
+    Returns:
+        dict: {'meta': {...}, 'results': {...}}.
+
+    Raises:
+        ValueError: If the file is not a benchmark baseline.
+    """
+    with open(path, 'r') as fh:
+        data = json.load(fh)
+    if not isinstance(data, dict) or not isinstance(data.get('results'), dict):
+        raise ValueError(f"Not a benchmark baseline: '{path}'")
+    return data
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results (dict): Statistics keyed by benchmark name.
+        baseline (dict): The 'results' of a loaded baseline.
+        threshold (float): Relative change that counts as a regression, e.g. 0.1 for 10%.
+
+    Returns:
+        list: (name, metric, baseline value, current value, relative change, regressed)
+        tuples for every benchmark present in both. A positive change is an improvement.
+    """
+    rows = []
+    for name in sorted(set(results) & set(baseline)):
+        for metric, higher_is_better in COMPARED_METRICS:
+            old = baseline[name].get(metric)
+            new = results[name].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old if higher_is_better else (old - new) / old
+            rows.append((name, metric, old, new, change, change < -threshold))
+    return rows
@@ -0,0 +1,351 @@
+"""
+Benchmark the model functions and HTTP routes against a local TMDB stand-in.
+
+Everything runs in one process against a throwaway SQLite catalog and users
+database. TMDB calls go to benchmarks.stub_tmdb with the requested latency.
+
+    python -m benchmarks.run --latency 0.05 --iterations 200
+    python -m benchmarks.run --save benchmarks/baselines/main.json
+    python -m benchmarks.run --compare benchmarks/baselines/main.json
+
+--compare exits with status 1 if any benchmark regressed by more than
+--threshold, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.harness import compare, load_baseline, run_benchmark, save_baseline
+from benchmarks.stub_tmdb import GENRES, LANGUAGES, StubTMDBServer
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQL_DIR = os.path.join(REPO_ROOT, "sql")
+PASSWORD = "bench-password"
+
+
+def prepare_environment(workdir: str, tmdb_base_url: str, log_level: str) -> None:
+    """
+    Point the app at the stub server and a scratch database.
+
+    Must run before movie_collection is imported, since its modules read their
+    settings from the environment at import time.
+    """
+    os.environ.update({
+        'TMDB_BASE_URL': tmdb_base_url,
+        'TMDB_API_KEY': 'benchmark',
+        # The stub has no rate limit; do not let the client's limiter set the pace.
+        'TMDB_RATE_LIMIT': '1000000',
+        'TMDB_RATE_BURST': '1000000',
+        'TMDB_MAX_RETRIES': '0',
+        'DB_PATH': os.path.join(workdir, 'movies.db'),
+        'SQL_CREATE_TABLE_PATH': os.path.join(SQL_DIR, 'create_movie_table.sql'),
+        'SQL_MIGRATE_GENRES_PATH': os.path.join(SQL_DIR, 'migrate_movie_genres.sql'),
+        'SQL_MIGRATE_FTS_PATH': os.path.join(SQL_DIR, 'migrate_movies_fts.sql'),
+        'SQL_MIGRATE_SAMPLING_PATH': os.path.join(SQL_DIR, 'migrate_movie_sampling.sql'),
+        'SQL_MIGRATE_MIRROR_PATH': os.path.join(SQL_DIR, 'migrate_tmdb_mirror.sql'),
+        'SQL_MIGRATE_SESSIONS_PATH': os.path.join(SQL_DIR, 'migrate_session_revocations.sql'),
+        'LOG_FILE': os.path.join(workdir, 'benchmark.log'),
+        'LOG_LEVEL': log_level,
+    })
+
+
+def build_catalog(db_path: str, size: int) -> list:
+    """
+    Create the catalog schema and fill it with movies, a tenth of them favorites.
+
+    Returns:
+        list: The names of the movies added.
+    """
+    with sqlite3.connect(db_path) as conn:
+        for script in ('create_movie_table.sql', 'migrate_tmdb_mirror.sql'):
+            with open(os.path.join(SQL_DIR, script), 'r') as fh:
+                conn.executescript(fh.read())
+    from movie_collection.models.movie_model import bulk_add_movies
+    rows = [{
+        'name': f"Seed Movie {index}",
+        'year': 1950 + index % 70,
+        'director': f"Seed Director {index % 100}",
+        'genres': [GENRES[index % len(GENRES)]['name']],
+        'original_language': LANGUAGES[index % len(LANGUAGES)],
+        'favorite': index % 10 == 0,
+    } for index in range(size)]
+    bulk_add_movies(rows)
+    return [row['name'] for row in rows]
+
+
+def _insert_movie(name: str) -> int:
+    from movie_collection.utils.sql_utils import get_db_connection
+    with get_db_connection() as conn:
+        cursor = conn.execute(
+            "INSERT INTO movies (name, year, director, genres, original_language, favorite) VALUES (?, 2000, 'Bench', 'Drama', 'en', FALSE)",
+            (name,)
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+
+def model_cases(flask_app, warm_cache: bool) -> dict:
+    """
+    Benchmarks that call the model layer directly.
+
+    Returns:
+        dict: name -> (func, setup); both take the iteration index.
+    """
+    from movie_collection.models import movie_model
+    from movie_collection.models.user_model import Users
+
+    # Each find_* call adds the movie it finds. The stub never repeats a title,
+    # but with --warm-cache a repeated query can return a cached result that was
+    # already added, which is then served from the catalog.
+    cold = None if warm_cache else (lambda index: movie_model.clear_tmdb_cache())
+
+    def with_app(func):
+        def call(index):
+            with flask_app.app_context():
+                func(index)
+        return call
+
+    def create_password_user(index):
+        with flask_app.app_context():
+            Users.create_user(f"model-pw-{index}", PASSWORD)
+
+    return {
+        'model.find_movie_by_name': (lambda i: movie_model.find_movie_by_name(f"query {i}"), cold),
+        'model.find_movie_by_year': (lambda i: movie_model.find_movie_by_year(1950 + i % 70), cold),
+        'model.find_movie_by_language': (lambda i: movie_model.find_movie_by_language(LANGUAGES[i % len(LANGUAGES)]), cold),
+        'model.find_movie_by_director': (lambda i: movie_model.find_movie_by_director(f"Director {i}"), cold),
+        # Five directors asked for over and over: after the first round, answered from the director index.
+        'model.find_movie_by_director (repeat)': (
+            lambda i: movie_model.find_movie_by_director(f"Repeat Director {i % 5}"), cold
+        ),
+        'model.find_movie_by_genre': (lambda i: movie_model.find_movie_by_genre(GENRES[i % len(GENRES)]['id']), cold),
+        'model.add_movie_to_list': (
+            lambda i: movie_model.add_movie_to_list(f"Added Movie {i}", 2001, 'Bench', ['Drama'], 'en'), None
+        ),
+        'model.list_favorite_movies': (lambda i: movie_model.list_favorite_movies(), None),
+        'model.list_favorite_movies_page': (lambda i: movie_model.list_favorite_movies_page(), None),
+        'model.bulk_update_movies (100 ids)': (
+            lambda i: movie_model.bulk_update_movies('favorite' if i % 2 else 'unfavorite', ids=list(range(1, 101))), None
+        ),
+        'model.users_create_user': (with_app(lambda i: Users.create_user(f"model-user-{i}", PASSWORD)), None),
+        'model.users_check_password': (with_app(lambda i: Users.check_password('bench', PASSWORD)), None),
+        'model.users_update_password': (
+            with_app(lambda i: Users.update_password(f"model-pw-{i}", PASSWORD + '2')), create_password_user
+        ),
+    }
+
+
+def route_cases(flask_app, seed_names: list, warm_cache: bool) -> dict:
+    """
+    Benchmarks that go through the Flask routes with the test client.
+
+    A response with status 400 or above counts as an error.
+
+    Returns:
+        dict: name -> (func, setup); both take the iteration index.
+    """
+    from movie_collection.models import movie_model
+    from movie_collection.models.user_model import Users
+    from movie_collection.utils.session_utils import issue_session_token
+
+    client = flask_app.test_client()
+    session_token = issue_session_token('bench')
+    logout_tokens = {}
+    movie_ids = {}
+    cold = None if warm_cache else (lambda index: movie_model.clear_tmdb_cache())
+
+    def request(method, path, body=None, data=None, headers=None):
+        def call(index):
+            response = client.open(
+                path, method=method,
+                json=body(index) if callable(body) else body,
+                data=data(index) if callable(data) else data,
+                headers=headers(index) if callable(headers) else headers,
+            )
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {response.request.path} returned {response.status_code}")
+        return call
+
+    def create_password_user(index):
+        with flask_app.app_context():
+            Users.create_user(f"route-pw-{index}", PASSWORD)
+
+    def issue_logout_token(index):
+        logout_tokens[index] = issue_session_token('bench')
+
+    def insert_movie(index):
+        movie_ids[index] = _insert_movie(f"Delete Movie {index}")
+
+    def bulk_body(index):
+        return json.dumps([{
+            'name': f"Bulk Movie {index}-{row}", 'year': 2005, 'director': 'Bench',
+            'genres': ['Drama'], 'original_language': 'en',
+        } for row in range(100)])
+
+    return {
+        'route.GET /api/health': (request('GET', '/api/health'), None),
+        'route.GET /api/db-check': (request('GET', '/api/db-check'), None),
+        'route.GET /api/metrics': (request('GET', '/api/metrics'), None),
+        'route.POST /create-account': (
+            request('POST', '/create-account', body=lambda i: {'username': f"route-user-{i}", 'password': PASSWORD}), None
+        ),
+        'route.POST /login': (request('POST', '/login', body={'username': 'bench', 'password': PASSWORD}), None),
+        'route.POST /update-password': (request('POST', '/update-password', body=lambda i: {
+            'username': f"route-pw-{i}", 'old_password': PASSWORD, 'new_password': PASSWORD + '2'
+        }), create_password_user),
+        'route.POST /logout': (
+            request('POST', '/logout', headers=lambda i: {'Authorization': f"Bearer {logout_tokens.pop(i)}"}),
+            issue_logout_token
+        ),
+        'route.GET /session': (
+            request('GET', '/session', headers={'Authorization': f"Bearer {session_token}"}), None
+        ),
+        'route.POST /movies/search-by-name': (
+            request('POST', '/movies/search-by-name', body=lambda i: {'name': f"route query {i}"}), cold
+        ),
+        'route.POST /movies/search-by-year': (
+            request('POST', '/movies/search-by-year', body=lambda i: {'year': 1950 + i % 70}), cold
+        ),
+        'route.POST /movies/search-by-language': (
+            request('POST', '/movies/search-by-language', body=lambda i: {'language_code': LANGUAGES[i % len(LANGUAGES)]}), cold
+        ),
+        'route.POST /movies/search-by-director': (
+            request('POST', '/movies/search-by-director', body=lambda i: {'director': f"Route Director {i}"}), cold
+        ),
+        'route.POST /movies/search-by-genre': (
+            request('POST', '/movies/search-by-genre', body=lambda i: {'genre_id': GENRES[i % len(GENRES)]['id']}), cold
+        ),
+        'route.GET /movies/genres': (request('GET', '/movies/genres'), None),
+        'route.POST /movies/add-to-list': (request('POST', '/movies/add-to-list', body=lambda i: {
+            'name': f"Route Movie {i}", 'year': 2002, 'language_code': 'en', 'director': 'Bench', 'genres': ['Drama']
+        }), None),
+        'route.POST /movies/bulk-add (100 rows)': (
+            request('POST', '/movies/bulk-add', data=bulk_body, headers={'Content-Type': 'application/json'}), None
+        ),
+        'route.POST /movies/bulk-update (100 names)': (request('POST', '/movies/bulk-update', body=lambda i: {
+            'operation': 'favorite' if i % 2 else 'unfavorite', 'names': seed_names[:100]
+        }), None),
+        'route.GET /movies/list': (request('GET', '/movies/list?limit=50'), None),
+        'route.GET /movies/random': (request('GET', '/movies/random'), None),
+        'route.POST /movies/mark-as-favorite': (
+            request('POST', '/movies/mark-as-favorite', body=lambda i: {'name': seed_names[i % len(seed_names)]}), None
+        ),
+        'route.GET /movies/list-favorite': (request('GET', '/movies/list-favorite'), None),
+        'route.DELETE /movies/delete-from-list': (
+            request('DELETE', '/movies/delete-from-list', body=lambda i: {'movie_id': movie_ids.pop(i)}), insert_movie
+        ),
+        # Last, since it empties the catalog the other benchmarks read.
+        'route.DELETE /movies/clear-list': (request('DELETE', '/movies/clear-list'), None),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def _print_results(results: dict) -> None:
+    width = max(len(name) for name in results)
+    print(f"{'benchmark':<{width}}  {'ops/s':>10}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'errors':>6}")
+    for name, stats in results.items():
+        print(f"{name:<{width}}  {stats['ops_per_sec']:>10.1f}  {stats['p50_ms']:>9.2f}  "
+              f"{stats['p95_ms']:>9.2f}  {stats['p99_ms']:>9.2f}  {stats['errors']:>6}")
+
+
+def _print_comparison(rows: list) -> None:
+    for name, metric, old, new, change, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{name} {metric}: {old} -> {new} ({change:+.1%}){flag}")
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark model functions and routes against a stub TMDB server.")
+    parser.add_argument("--iterations", type=int, default=100, help="Timed calls per benchmark")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed calls before each benchmark")
+    parser.add_argument("--concurrency", type=int, default=1, help="Threads calling at once")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the stub delays each TMDB request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random stub delay of up to this many seconds")
+    parser.add_argument("--catalog-size", type=int, default=1000, help="Movies seeded into the catalog")
+    parser.add_argument("--warm-cache", action="store_true", help="Keep the TMDB response cache between calls")
+    parser.add_argument("--filter", action="append", default=[], help="Only run benchmarks whose name contains this")
+    parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare results with this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change that counts as a regression")
+    parser.add_argument("--log-level", default="ERROR", help="Log level for the app while benchmarking")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    with tempfile.TemporaryDirectory(prefix="movie-bench-") as workdir, \
+            StubTMDBServer(latency=args.latency, jitter=args.jitter) as stub:
+        prepare_environment(workdir, stub.base_url, args.log_level)
+        from app import create_app, create_tables
+        from movie_collection.models.user_model import Users
+
+        flask_app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(workdir, 'users.db')}", 'TESTING': True})
+        create_tables(flask_app)
+        with flask_app.app_context():
+            Users.create_user('bench', PASSWORD)
+        seed_names = build_catalog(os.environ['DB_PATH'], args.catalog_size)
+
+        cases = {}
+        cases.update(model_cases(flask_app, args.warm_cache))
+        cases.update(route_cases(flask_app, seed_names, args.warm_cache))
+        if args.filter:
+            cases = {name: case for name, case in cases.items() if any(text in name for text in args.filter)}
+        if args.list:
+            print("\n".join(cases))
+            return 0
+        if not cases:
+            parser.error("No benchmarks match --filter")
+
+        results = {}
+        for name, (func, setup) in cases.items():
+            results[name] = run_benchmark(func, args.iterations, args.concurrency, setup, args.warmup)
+        tmdb_requests = stub.requests
+
+    _print_results(results)
+    print(f"\n{tmdb_requests} requests served by the stub TMDB server")
+
+    if args.save:
+        save_baseline(args.save, results, {
+            'commit': _git_commit(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'iterations': args.iterations,
+            'concurrency': args.concurrency,
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'catalog_size': args.catalog_size,
+            'warm_cache': args.warm_cache,
+        })
+        print(f"Saved results to {args.save}")
+
+    if baseline is not None:
+        meta = baseline.get('meta', {})
+        print(f"\nCompared with {args.compare} (commit {meta.get('commit', 'unknown')}):")
+        for setting in ('iterations', 'concurrency', 'latency', 'jitter', 'catalog_size', 'warm_cache'):
+            if setting in meta and meta[setting] != getattr(args, setting):
+                print(f"warning: baseline {setting}={meta[setting]}, this run {setting}={getattr(args, setting)}")
+        rows = compare(results, baseline['results'], args.threshold)
+        _print_comparison(rows)
+        if any(row[-1] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
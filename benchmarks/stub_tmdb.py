@@ -0,0 +1,159 @@
+"""
+A local stand-in for the TMDB API used by the benchmarks.
+
+It answers the endpoints movie_model calls with generated, well-formed
+payloads after an injected delay, so benchmarks measure our code against a
+predictable upstream instead of the network.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+import zlib
+
+
+GENRES = [
+    {'id': 28, 'name': 'Action'},
+    {'id': 12, 'name': 'Adventure'},
+    {'id': 16, 'name': 'Animation'},
+    {'id': 35, 'name': 'Comedy'},
+    {'id': 80, 'name': 'Crime'},
+    {'id': 18, 'name': 'Drama'},
+    {'id': 27, 'name': 'Horror'},
+    {'id': 878, 'name': 'Science Fiction'},
+]
+LANGUAGES = ['en', 'fr', 'es', 'ja', 'ko']
+
+
+class StubTMDBServer:
+    """
+    A threaded HTTP server that imitates the TMDB endpoints used by movie_model.
+
+    Every movie it returns has a new ID and title, so movies found through it
+    never collide in the catalog.
+
+    Attributes:
+        latency (float): Seconds each request is delayed.
+        jitter (float): Extra random delay of up to this many seconds per request.
+        results_per_page (int): Movies returned by search and discover.
+        requests (int): Requests served so far.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, results_per_page: int = 20, port: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.results_per_page = results_per_page
+        self.requests = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """The URL to use as TMDB_BASE_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/3"
+
+    def start(self) -> 'StubTMDBServer':
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-tmdb", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _movie(self, **overrides) -> dict:
+        movie_id = next(self._ids)
+        movie = {
+            'id': movie_id,
+            'title': f"Stub Movie {movie_id}",
+            'release_date': f"{1950 + movie_id % 70}-01-01",
+            'original_language': LANGUAGES[movie_id % len(LANGUAGES)],
+            'genre_ids': [GENRES[movie_id % len(GENRES)]['id']],
+        }
+        movie.update(overrides)
+        return movie
+
+    def respond(self, path: str, params: dict) -> tuple:
+        """
+        Build the response for a request.
+
+        Args:
+            path (str): The request path without the /3 prefix.
+            params (dict): Query parameters, one value per name.
+
+        Returns:
+            tuple: (status code, JSON-serializable body).
+        """
+        if path == '/genre/movie/list':
+            return 200, {'genres': GENRES}
+        if path in ('/search/movie', '/discover/movie'):
+            overrides = {}
+            if 'primary_release_year' in params:
+                overrides['release_date'] = f"{params['primary_release_year']}-01-01"
+            if 'with_genres' in params:
+                overrides['genre_ids'] = [int(params['with_genres'])]
+            results = [self._movie(**overrides) for _ in range(self.results_per_page)]
+            return 200, {'page': int(params.get('page', 1)), 'results': results, 'total_pages': 1}
+        if path == '/search/person':
+            return 200, {'results': [{'id': zlib.crc32(params.get('query', '').encode()) % 100000 + 1, 'name': params.get('query')}]}
+        match = re.fullmatch(r'/movie/(\d+)/credits', path)
+        if match:
+            return 200, {'id': int(match.group(1)), 'crew': [
+                {'job': 'Producer', 'name': 'Stub Producer'},
+                {'job': 'Director', 'name': f"Stub Director {int(match.group(1)) % 50}"},
+            ]}
+        match = re.fullmatch(r'/person/(\d+)/movie_credits', path)
+        if match:
+            return 200, {'id': int(match.group(1)), 'crew': [
+                self._movie(job='Director') for _ in range(self.results_per_page)
+            ]}
+        return 404, {'success': False, 'status_message': 'The resource you requested could not be found.'}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; without this, Nagle's
+            # algorithm and delayed ACKs add ~40ms to every keep-alive response.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                path = url.path[2:] if url.path.startswith('/3/') else url.path
+                params = {name: values[0] for name, values in parse_qs(url.query).items()}
+                delay = stub.latency + (random.uniform(0, stub.jitter) if stub.jitter else 0)
+                if delay > 0:
+                    time.sleep(delay)
+                status, body = stub.respond(path, params)
+                with stub._lock:
+                    stub.requests += 1
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -13,5 +13,10 @@ else
     echo "Skipping database creation."
 fi
 
-# Start the Python application
-exec python app.py
+# Start the application. SERVER_MODE=development runs Flask's built-in server
+# (set FLASK_DEBUG=1 for the debugger); anything else runs gunicorn.
+if [ "$SERVER_MODE" = "development" ]; then
+    exec python app.py
+else
+    exec gunicorn -c gunicorn.conf.py app:app
+fi
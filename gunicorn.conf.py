@@ -0,0 +1,42 @@
+"""
+Gunicorn settings for serving the app in production.
+
+    gunicorn -c gunicorn.conf.py app:app
+
+WEB_WORKERS sets the number of worker processes and WEB_THREADS the threads
+per worker. The app is loaded once in the master and each worker then sets up
+its own TMDB session, caches and background jobs after fork. Session
+revocations and credential changes are shared through the database.
+"""
+import multiprocessing
+import os
+
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+workers = int(os.getenv("WEB_WORKERS", str(min(multiprocessing.cpu_count() * 2 + 1, 8))))
+threads = int(os.getenv("WEB_THREADS", "4"))
+worker_class = "gthread"
+timeout = int(os.getenv("WEB_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("WEB_KEEPALIVE", "5"))
+# Restart workers now and then so slow leaks cannot build up; the jitter keeps
+# them from all restarting at once.
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("WEB_MAX_REQUESTS_JITTER", "1000"))
+preload_app = True
+accesslog = os.getenv("WEB_ACCESS_LOG") or None
+errorlog = "-"
+
+
+def on_starting(server):
+    from app import app, create_tables
+    from movie_collection.utils.session_utils import init_session_key
+    create_tables(app)
+    # Without SESSION_SECRET_KEY the key is random; create it before fork so
+    # a token issued by one worker is accepted by every other.
+    init_session_key()
+
+
+def post_fork(server, worker):
+    from app import init_worker
+    init_worker()
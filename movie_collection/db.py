@@ -1,3 +1,22 @@
+from contextlib import contextmanager
+
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
\ No newline at end of file
+db = SQLAlchemy()
+
+
+@contextmanager
+def get_users_db_connection():
+    """
+    Borrow a raw sqlite3 connection to the users database from SQLAlchemy's pool.
+
+    Must be used inside an application context.
+
+    Yields:
+        The DB-API connection; it is returned to the pool on exit.
+    """
+    conn = db.engine.raw_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,348 @@
+"""
+Mirror TMDB discover results into the local database.
+
+Each slice (a year, genre or language discover query) is fetched page by
+page together with the director of every movie, and written to the
+tmdb_mirror tables so find_movie_by_year/_genre/_language can answer
+without calling TMDB.
+
+Run once from the command line:
+
+    python -m movie_collection.mirror_sync --years 2000-2010 --genres 28,35 --languages en,fr
+
+or on a schedule inside the app with start_mirror_scheduler(), configured
+through TMDB_MIRROR_YEARS, TMDB_MIRROR_GENRES and TMDB_MIRROR_LANGUAGES.
+Every worker runs a scheduler, but a lock file next to the database lets
+only one sync at a time, and slices synced within TMDB_MIRROR_INTERVAL are
+skipped, so each slice is synced once per interval however many workers
+there are.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import argparse
+import fcntl
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from movie_collection.models.movie_model import _tmdb_get, mirror_slice_key
+from movie_collection.utils.logger import configure_logger
+from movie_collection.utils.sql_utils import DB_PATH, get_db_connection
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Discover parameter used for each kind of slice; these match find_movie_by_*.
+SLICE_PARAMS = {
+    'year': 'primary_release_year',
+    'genre': 'with_genres',
+    'language': 'language',
+}
+MIRROR_PAGES = int(os.getenv("TMDB_MIRROR_PAGES", "5"))
+MIRROR_SYNC_WORKERS = int(os.getenv("TMDB_MIRROR_SYNC_WORKERS", "4"))
+MIRROR_SYNC_INTERVAL = int(os.getenv("TMDB_MIRROR_INTERVAL", "86400"))
+# How often each worker's scheduler looks for slices that are due.
+MIRROR_CHECK_INTERVAL = int(os.getenv("TMDB_MIRROR_CHECK_INTERVAL", "600"))
+MIRROR_LOCK_PATH = os.getenv("TMDB_MIRROR_LOCK_PATH", f"{DB_PATH}.mirror.lock")
+
+_scheduler = None
+_scheduler_stop = threading.Event()
+
+
+def ensure_mirror_schema() -> None:
+    """
+    Create the mirror tables if the database predates them.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    with open(os.getenv("SQL_MIGRATE_MIRROR_PATH", "/app/sql/migrate_tmdb_mirror.sql"), "r") as fh:
+        migration_script = fh.read()
+    with get_db_connection() as conn:
+        conn.executescript(migration_script)
+        conn.commit()
+
+
+def _director_of(tmdb_id: int) -> str:
+    credits_data = _tmdb_get(f"/movie/{tmdb_id}/credits")
+    if 'crew' not in credits_data:
+        raise RuntimeError(f"TMDB credits for movie {tmdb_id} failed: "
+                           f"{credits_data.get('status_message', 'no crew in response')}")
+    for crew_member in credits_data['crew']:
+        if crew_member['job'] == 'Director':
+            return crew_member['name']
+    return "Unknown"
+
+
+def sync_slice(kind: str, value, pages: int = MIRROR_PAGES) -> int:
+    """
+    Fetch one discover slice from TMDB and replace its mirrored copy.
+
+    The copy is only replaced by a complete fetch: if TMDB answers any request
+    with an error payload, or the first page has no results, the slice keeps
+    the movies it had and the sync fails.
+
+    Args:
+        kind (str): 'year', 'genre' or 'language'.
+        value: The discover filter value.
+        pages (int): The maximum number of discover pages to mirror.
+
+    Returns:
+        int: The number of movies now mirrored for the slice.
+
+    Raises:
+        ValueError: If the slice kind is unknown.
+        RuntimeError: If TMDB fails or returns nothing, leaving the mirrored copy as it was.
+        sqlite3.Error: If any database error occurs.
+    """
+    if kind not in SLICE_PARAMS:
+        raise ValueError(f"Unknown mirror slice kind: '{kind}'")
+
+    key = mirror_slice_key(kind, value)
+    results = []
+    seen = set()
+    page = 1
+    while page <= pages:
+        data = _tmdb_get('/discover/movie', {SLICE_PARAMS[kind]: value, 'page': page})
+        if 'results' not in data:
+            raise RuntimeError(f"TMDB discover page {page} for {key} failed: "
+                               f"{data.get('status_message', 'no results in response')}")
+        if page == 1 and not data['results']:
+            raise RuntimeError(f"TMDB returned no movies for {key}; keeping the mirrored copy")
+        for result in data['results']:
+            if result['id'] not in seen:
+                seen.add(result['id'])
+                results.append(result)
+        if page >= data.get('total_pages', 0):
+            break
+        page += 1
+
+    with ThreadPoolExecutor(max_workers=MIRROR_SYNC_WORKERS) as executor:
+        directors = list(executor.map(_director_of, [result['id'] for result in results]))
+
+    synced_at = time.time()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO tmdb_mirror (tmdb_id, title, release_date, original_language, genre_ids, director, synced_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (tmdb_id) DO UPDATE SET
+                title = excluded.title,
+                release_date = excluded.release_date,
+                original_language = excluded.original_language,
+                genre_ids = excluded.genre_ids,
+                director = excluded.director,
+                synced_at = excluded.synced_at
+        """, [
+            (result['id'], result['title'], result.get('release_date'), result['original_language'],
+             ','.join(str(genre_id) for genre_id in result.get('genre_ids', [])), director, synced_at)
+            for result, director in zip(results, directors)
+        ])
+        cursor.execute("DELETE FROM tmdb_mirror_members WHERE slice = ?", (key,))
+        cursor.executemany(
+            "INSERT INTO tmdb_mirror_members (slice, position, tmdb_id) VALUES (?, ?, ?)",
+            [(key, position, result['id']) for position, result in enumerate(results)]
+        )
+        cursor.execute("""
+            INSERT INTO tmdb_mirror_slices (slice, movie_count, synced_at) VALUES (?, ?, ?)
+            ON CONFLICT (slice) DO UPDATE SET movie_count = excluded.movie_count, synced_at = excluded.synced_at
+        """, (key, len(results), synced_at))
+        conn.commit()
+
+    logger.info("Mirrored %d movies for %s", len(results), key)
+    return len(results)
+
+
+def sync_mirror(slices: list, pages: int = MIRROR_PAGES) -> dict:
+    """
+    Mirror several slices, continuing past slices that fail.
+
+    Args:
+        slices (list): (kind, value) pairs.
+        pages (int): The maximum number of discover pages per slice.
+
+    Returns:
+        dict: Movie counts keyed by slice key; failed slices map to None.
+    """
+    ensure_mirror_schema()
+    counts = {}
+    for kind, value in slices:
+        key = mirror_slice_key(kind, value)
+        try:
+            counts[key] = sync_slice(kind, value, pages)
+        except (RuntimeError, sqlite3.Error, ValueError) as e:
+            logger.error("Mirror sync failed for %s: %s", key, str(e))
+            counts[key] = None
+    return counts
+
+
+@contextmanager
+def _sync_lock(path: str):
+    """Try to take the lock shared by every process syncing this database; yield whether it was taken."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+    finally:
+        os.close(fd)
+
+
+def due_slices(slices: list, max_age: float) -> list:
+    """
+    Pick the slices that were never synced or were last synced more than max_age seconds ago.
+
+    Args:
+        slices (list): (kind, value) pairs.
+        max_age (float): Seconds a synced slice stays fresh.
+
+    Returns:
+        list: The (kind, value) pairs that are due.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT slice, synced_at FROM tmdb_mirror_slices")
+        synced = dict(cursor.fetchall())
+    cutoff = time.time() - max_age
+    return [(kind, value) for kind, value in slices if synced.get(mirror_slice_key(kind, value), 0) <= cutoff]
+
+
+def sync_due_slices(slices: list, max_age: float, lock_path: str = None) -> dict:
+    """
+    Mirror the slices that are due, unless another process is already syncing.
+
+    Args:
+        slices (list): (kind, value) pairs.
+        max_age (float): Seconds a synced slice stays fresh.
+        lock_path (str, optional): The lock file. Defaults to TMDB_MIRROR_LOCK_PATH.
+
+    Returns:
+        dict: As sync_mirror, for the slices that were due; None if another
+            process held the lock.
+
+    Raises:
+        sqlite3.Error: If the mirror tables cannot be read.
+    """
+    with _sync_lock(MIRROR_LOCK_PATH if lock_path is None else lock_path) as acquired:
+        if not acquired:
+            logger.debug("Mirror sync already running in another process.")
+            return None
+        ensure_mirror_schema()
+        due = due_slices(slices, max_age)
+        return sync_mirror(due) if due else {}
+
+
+def parse_slices(years: str = None, genres: str = None, languages: str = None) -> list:
+    """
+    Turn comma-separated slice specs into (kind, value) pairs.
+
+    Args:
+        years (str, optional): e.g. '1999,2001-2003'.
+        genres (str, optional): e.g. '28,35'.
+        languages (str, optional): e.g. 'en,fr'.
+
+    Returns:
+        list: (kind, value) pairs.
+
+    Raises:
+        ValueError: If a year or genre is not an integer.
+    """
+    slices = []
+    for part in filter(None, (years or '').split(',')):
+        if '-' in part:
+            start, end = (int(bound) for bound in part.split('-', 1))
+            slices.extend(('year', year) for year in range(start, end + 1))
+        else:
+            slices.append(('year', int(part)))
+    slices.extend(('genre', int(genre)) for genre in filter(None, (genres or '').split(',')))
+    slices.extend(('language', language.strip()) for language in filter(None, (languages or '').split(',')))
+    return slices
+
+
+def configured_slices() -> list:
+    """Slices configured through TMDB_MIRROR_YEARS, TMDB_MIRROR_GENRES and TMDB_MIRROR_LANGUAGES."""
+    return parse_slices(
+        os.getenv("TMDB_MIRROR_YEARS"),
+        os.getenv("TMDB_MIRROR_GENRES"),
+        os.getenv("TMDB_MIRROR_LANGUAGES"),
+    )
+
+
+def _sync_loop(slices: list, interval: float, check_interval: float) -> None:
+    while True:
+        try:
+            sync_due_slices(slices, interval)
+        except Exception as e:
+            logger.error("Scheduled mirror sync failed: %s", str(e))
+        if _scheduler_stop.wait(check_interval):
+            return
+
+
+def start_mirror_scheduler(slices: list = None, interval: float = None) -> bool:
+    """
+    Start a daemon thread that syncs each slice every interval seconds.
+
+    The thread checks for due slices now and then every TMDB_MIRROR_CHECK_INTERVAL
+    seconds (at most interval). Slices that failed are retried at the next check.
+
+    Args:
+        slices (list, optional): (kind, value) pairs. Defaults to configured_slices().
+        interval (float, optional): Seconds between syncs of a slice. Defaults to TMDB_MIRROR_INTERVAL.
+
+    Returns:
+        bool: True if a scheduler is running, False if there is nothing to mirror.
+    """
+    global _scheduler
+    if _scheduler is not None and _scheduler.is_alive():
+        return True
+    slices = configured_slices() if slices is None else slices
+    if not slices:
+        return False
+    interval = MIRROR_SYNC_INTERVAL if interval is None else interval
+    check_interval = min(interval, MIRROR_CHECK_INTERVAL)
+    _scheduler_stop.clear()
+    _scheduler = threading.Thread(target=_sync_loop, args=(slices, interval, check_interval),
+                                  name="mirror-sync", daemon=True)
+    _scheduler.start()
+    logger.info("Mirror sync scheduled for %d slices every %s seconds.", len(slices), interval)
+    return True
+
+
+def stop_mirror_scheduler() -> None:
+    """Stop the background mirror sync if it is running."""
+    global _scheduler
+    _scheduler_stop.set()
+    if _scheduler is not None:
+        _scheduler.join(timeout=5)
+    _scheduler = None
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Mirror TMDB discover results into the local database.")
+    parser.add_argument("--years", help="Comma-separated years or ranges, e.g. 1999,2001-2003")
+    parser.add_argument("--genres", help="Comma-separated TMDB genre IDs")
+    parser.add_argument("--languages", help="Comma-separated language codes")
+    parser.add_argument("--pages", type=int, default=MIRROR_PAGES, help="Discover pages per slice")
+    args = parser.parse_args(argv)
+
+    slices = parse_slices(args.years, args.genres, args.languages) or configured_slices()
+    if not slices:
+        parser.error("Nothing to mirror: pass --years, --genres or --languages")
+    counts = sync_mirror(slices, args.pages)
+    for key, count in counts.items():
+        print(f"{key}: {'failed' if count is None else count}")
+    return 1 if any(count is None for count in counts.values()) else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
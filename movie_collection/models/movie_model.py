@@ -1,20 +1,67 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from contextlib import contextmanager
 import logging
 import os
 import sqlite3
+import time
 
-from movie_collection.utils.logger import configure_logger
+from movie_collection.utils.cache_utils import MISSING, SingleFlight, TTLCache, make_cache_key
+from movie_collection.utils.catalog_version import catalog_version
+from movie_collection.utils.logger import configure_logger, log_rate_limited
+from movie_collection.utils.metrics_utils import metrics, register_cache, register_single_flight
 from movie_collection.utils.sql_utils import get_db_connection
-import requests
+from movie_collection.utils.stream_utils import MalformedRecord
+from movie_collection.utils.tmdb_client import get_tmdb_client
+import re
 import random
-
-API_KEY = ''
-BASE_URL = 'https://api.themoviedb.org/3'
+import threading
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+# Seconds each TMDB endpoint's responses stay fresh in the response cache.
+# Numeric path segments are collapsed to '{id}' before the lookup.
+TMDB_CACHE_TTLS = {
+    '/search/movie': 300,
+    '/search/person': 3600,
+    '/discover/movie': 600,
+    '/genre/movie/list': 86400,
+    '/movie/{id}/credits': 86400,
+    '/person/{id}/movie_credits': 3600,
+}
+TMDB_DEFAULT_CACHE_TTL = 300
+
+tmdb_cache = TTLCache(
+    maxsize=int(os.getenv("TMDB_CACHE_SIZE", "2048")),
+    default_ttl=TMDB_DEFAULT_CACHE_TTL,
+    name="tmdb",
+)
+register_cache(tmdb_cache)
+
+# Empty search, discover and person-search results are kept apart from
+# tmdb_cache, briefly, so repeated misses (typos, scrapers) neither reach TMDB
+# nor push real results out of the response cache. A TTL of 0 disables it.
+TMDB_NEGATIVE_CACHE_ENDPOINTS = frozenset({'/search/movie', '/discover/movie', '/search/person'})
+TMDB_NEGATIVE_CACHE_TTL = float(os.getenv("TMDB_NEGATIVE_CACHE_TTL", "60"))
+
+tmdb_negative_cache = TTLCache(
+    maxsize=int(os.getenv("TMDB_NEGATIVE_CACHE_SIZE", "4096")),
+    default_ttl=TMDB_NEGATIVE_CACHE_TTL,
+    name="tmdb_negative",
+)
+register_cache(tmdb_negative_cache)
+
+# Identical TMDB requests made at the same time, e.g. by a burst of searches
+# for the same popular query, share one upstream call.
+tmdb_flight = SingleFlight(name="tmdb")
+register_single_flight(tmdb_flight)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=tmdb_flight.reset)
+
+metrics.describe('tmdb_empty_results_total', 'counter',
+                 'TMDB searches with no results, by endpoint and source: tmdb, cache, or skipped for a query known to be empty.')
+
 @dataclass
 class Movie:
     """
@@ -39,21 +86,245 @@ class Movie:
         if self.year <= 1900:
             raise ValueError(f"Year must be greater than 1900, got {self.year}")
 
-def get_genres():
+def _tmdb_cache_ttl(endpoint: str) -> float:
+    """
+    Look up the cache TTL for an endpoint, ignoring numeric path segments.
+
+    Args:
+        endpoint (str): The request path, e.g. '/movie/550/credits'.
+
+    Returns:
+        float: The TTL in seconds.
+    """
+    template = re.sub(r'/\d+', '/{id}', endpoint)
+    return TMDB_CACHE_TTLS.get(template, TMDB_DEFAULT_CACHE_TTL)
+
+def _tmdb_get(endpoint: str, params: dict = None) -> dict:
+    """
+    Fetch a TMDB endpoint as JSON through the shared TMDB client, serving repeated
+    requests from the response cache, or from the negative cache if they had no results.
+    Concurrent identical requests that miss both caches share one TMDB call.
+
+    Args:
+        endpoint (str): The request path relative to the TMDB base URL, e.g. '/search/movie'.
+        params (dict, optional): Query parameters, excluding the API key.
+
+    Returns:
+        dict: The decoded JSON response.
+    """
+    key = make_cache_key(endpoint, params)
+    negative = endpoint in TMDB_NEGATIVE_CACHE_ENDPOINTS
+    if negative:
+        data = tmdb_negative_cache.get(key)
+        if data is not MISSING:
+            logger.debug("TMDB negative cache hit: %s", endpoint)
+            metrics.inc('tmdb_empty_results_total', (('endpoint', endpoint), ('source', 'cache')))
+            return data
+    data = tmdb_cache.get(key)
+    if data is not MISSING:
+        logger.debug("TMDB cache hit: %s", endpoint)
+        return data
+
+    def fetch():
+        data = get_tmdb_client().get(endpoint, params)
+        # TMDB reports failures as {"success": false, ...}; never cache those.
+        # Cached before the flight ends, so later callers find the result there.
+        if isinstance(data, dict) and data.get('success') is not False:
+            if negative and not data.get('results'):
+                metrics.inc('tmdb_empty_results_total', (('endpoint', endpoint), ('source', 'tmdb')))
+                tmdb_negative_cache.set(key, data)
+            else:
+                tmdb_cache.set(key, data, ttl=_tmdb_cache_ttl(endpoint))
+        return data
+
+    return tmdb_flight.do(key, fetch)
+
+def _known_empty(endpoint: str) -> None:
+    """Count a search answered as empty without asking TMDB, because it cannot match anything."""
+    metrics.inc('tmdb_empty_results_total', (('endpoint', endpoint), ('source', 'skipped')))
+
+def clear_tmdb_cache() -> None:
+    """
+    Drop every cached TMDB response, empty ones included, and reset the hit/miss counters.
+    """
+    tmdb_cache.clear()
+    tmdb_negative_cache.clear()
+
+##############################################################
+#
+# Genres
+#
+##############################################################
+
+# Seconds between background refreshes of the genre map.
+GENRE_REFRESH_INTERVAL = int(os.getenv("GENRE_REFRESH_INTERVAL", "86400"))
+
+_genre_map = None
+_genre_lock = threading.Lock()
+_genre_refresher = None
+_genre_refresher_stop = threading.Event()
+
+def fetch_genres() -> dict:
     """
     Fetch the list of all movie genres from the TMDB API.
+
     Returns:
         dict: A dictionary mapping genre IDs to genre names.
     """
-    url = f"{BASE_URL}/genre/movie/list"
-    params = {'api_key': API_KEY}
-    response = requests.get(url, params=params)
-    data = response.json()
+    data = _tmdb_get('/genre/movie/list')
+    return {genre['id']: genre['name'] for genre in data.get('genres', [])}
+
+def load_persisted_genres() -> dict:
+    """
+    Load the genre map stored in the local genres table.
+
+    Returns:
+        dict: A dictionary mapping genre IDs to genre names, empty if nothing is stored
+        or the table cannot be read.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, name FROM genres")
+            return {row[0]: row[1] for row in cursor.fetchall()}
+    except sqlite3.Error as e:
+        logger.warning("Could not load stored genres: %s", str(e))
+        return {}
+
+def persist_genres(genres: dict) -> None:
+    """
+    Replace the contents of the local genres table with the given map.
+
+    Args:
+        genres (dict): A dictionary mapping genre IDs to genre names.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM genres")
+            cursor.executemany(
+                "INSERT INTO genres (id, name) VALUES (?, ?)",
+                sorted(genres.items())
+            )
+            conn.commit()
+            logger.info("Stored %d genres.", len(genres))
+    except sqlite3.Error as e:
+        logger.warning("Could not store genres: %s", str(e))
+
+def refresh_genres() -> dict:
+    """
+    Fetch the genre map from TMDB, store it locally and swap it into memory.
+
+    An empty response from TMDB leaves the current map untouched.
+
+    Returns:
+        dict: The genre map now in use.
+    """
+    global _genre_map
+    # Bypass the response cache so a scheduled refresh really hits TMDB.
+    tmdb_cache.invalidate(make_cache_key('/genre/movie/list'))
+    genres = fetch_genres()
+    if not genres:
+        logger.warning("TMDB returned no genres; keeping the current genre map.")
+        return _genre_map or {}
+    with _genre_lock:
+        _genre_map = genres
+    persist_genres(genres)
+    return genres
+
+def get_genres() -> dict:
+    """
+    Get the process-wide genre map.
+
+    The map is loaded once, from the local genres table if it has been stored
+    before and from TMDB otherwise. Treat the returned dict as read-only.
 
-    genres = {genre['id']: genre['name'] for genre in data.get('genres', [])}
+    Returns:
+        dict: A dictionary mapping genre IDs to genre names.
+    """
+    global _genre_map
+    genres = _genre_map
+    if genres is not None:
+        return genres
+    with _genre_lock:
+        if _genre_map is None:
+            stored = load_persisted_genres()
+            if stored:
+                _genre_map = stored
+        genres = _genre_map
+    if genres is None:
+        # Workers that start cold together wait for one refresh instead of each running their own.
+        genres = tmdb_flight.do('refresh_genres', refresh_genres)
     return genres
 
-def add_movie_to_list(name: str, year: int, director: str, genres: list, original_language: str, favorite: bool = False) -> None:
+def reset_genre_map() -> None:
+    """
+    Forget the in-memory genre map so the next lookup reloads it.
+    """
+    global _genre_map
+    with _genre_lock:
+        _genre_map = None
+
+def _genre_refresh_loop(interval: float) -> None:
+    while not _genre_refresher_stop.wait(interval):
+        try:
+            refresh_genres()
+            logger.info("Genre map refreshed.")
+        except Exception as e:
+            logger.error("Genre refresh failed: %s", str(e))
+
+def start_genre_refresher(interval: float = None) -> None:
+    """
+    Start a daemon thread that refreshes the genre map on a schedule.
+
+    Calling this more than once is a no-op while the thread is alive.
+
+    Args:
+        interval (float, optional): Seconds between refreshes. Defaults to GENRE_REFRESH_INTERVAL.
+    """
+    global _genre_refresher
+    if _genre_refresher is not None and _genre_refresher.is_alive():
+        return
+    interval = GENRE_REFRESH_INTERVAL if interval is None else interval
+    _genre_refresher_stop.clear()
+    _genre_refresher = threading.Thread(
+        target=_genre_refresh_loop, args=(interval,), name="genre-refresher", daemon=True
+    )
+    _genre_refresher.start()
+    logger.info("Genre refresher started (every %s seconds).", interval)
+
+def stop_genre_refresher() -> None:
+    """
+    Stop the background genre refresher if it is running.
+    """
+    global _genre_refresher
+    _genre_refresher_stop.set()
+    if _genre_refresher is not None:
+        _genre_refresher.join(timeout=5)
+    _genre_refresher = None
+
+##############################################################
+#
+# Catalog
+#
+##############################################################
+
+# Links a stored movie to a genre by name. Names not in the genres table are
+# skipped; they remain visible in the movies.genres text column.
+LINK_MOVIE_GENRES_SQL = """
+    INSERT OR IGNORE INTO movie_genres (movie_id, genre_id)
+    SELECT movies.id, genres.id
+    FROM movies JOIN genres ON genres.name = ? COLLATE NOCASE
+    WHERE movies.name = ?
+"""
+
+# Appended by add_movie_to_list(upsert=True) so a stored movie, deleted or not,
+# is kept as it is. DO NOTHING rather than DO UPDATE: the latter would make the
+# INSERT OR IGNORE statements in the sampling triggers abort.
+UPSERT_MOVIE_SQL = "ON CONFLICT (name) DO NOTHING"
+
+def add_movie_to_list(name: str, year: int, director: str, genres: list, original_language: str,
+                      favorite: bool = False, upsert: bool = False) -> bool:
     """
     Add a movie to the database.
 
@@ -64,10 +335,15 @@ def add_movie_to_list(name: str, year: int, director: str, genres: list, origina
         genres (list): A list of genres associated with the movie.
         original_language (str): The original language of the movie.
         favorite (bool, optional): Whether the movie is marked as a favorite. Defaults to False.
+        upsert (bool, optional): Keep a movie that is already stored, even a deleted
+            one, instead of raising. Defaults to False.
+
+    Returns:
+        bool: Whether the movie was added; only False for an upsert of a stored movie.
 
     Raises:
         ValueError: If the input data is invalid (e.g., empty genres list, invalid year).
-        ValueError: If a movie with the given name already exists in the database.
+        ValueError: If a movie with the given name already exists in the database and upsert is False.
         sqlite3.Error: If a database error occurs while adding the movie.
     """
     if not isinstance(year, int) or year < 1900:
@@ -83,9 +359,15 @@ def add_movie_to_list(name: str, year: int, director: str, genres: list, origina
             cursor.execute("""
                 INSERT INTO movies (name, year, director, genres, original_language, favorite)
                 VALUES (?, ?, ?, ?, ?, ?)
-            """, (name, year, director, ', '.join(genres), original_language, favorite))
+            """ + (UPSERT_MOVIE_SQL if upsert else ""), (name, year, director, ', '.join(genres), original_language, favorite))
+            if cursor.rowcount == 0:
+                logger.debug("Movie already in the database: %s", name)
+                return False
+            cursor.executemany(LINK_MOVIE_GENRES_SQL, [(genre, name) for genre in genres])
             conn.commit()
             logger.info("Movie successfully added to the database: %s", name)
+        catalog_version.bump()
+        return True
     except sqlite3.IntegrityError:
         raise ValueError(f"Movie with name '{name}' already exists")
     except sqlite3.Error as e:
@@ -93,6 +375,572 @@ def add_movie_to_list(name: str, year: int, director: str, genres: list, origina
         raise e
 
 
+# Rows validated and inserted per transaction by bulk_add_movies.
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+# Per-row duplicate/reject entries kept in a bulk summary; counts stay exact.
+BULK_MAX_REPORTED_ROWS = 1000
+
+def _validate_bulk_row(row) -> tuple:
+    """
+    Validate one bulk-import row and convert it to INSERT parameters.
+
+    Args:
+        row (dict): The movie fields, as accepted by /movies/add-to-list. Either
+            original_language or language_code may be used.
+
+    Returns:
+        tuple: (name, year, director, genres, original_language, favorite)
+
+    Raises:
+        ValueError: If the row is invalid.
+    """
+    if isinstance(row, MalformedRecord):
+        raise ValueError(row.error)
+    if not isinstance(row, dict):
+        raise ValueError("Row must be a JSON object")
+
+    name = row.get('name')
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("Movie name is required")
+    try:
+        year = int(row.get('year'))
+    except (TypeError, ValueError):
+        raise ValueError("Year must be a valid integer")
+    if year < 1900:
+        raise ValueError(f"Invalid release year: {year}. Must be a valid integer year greater than 1900.")
+    director = row.get('director')
+    if not isinstance(director, str) or not director:
+        raise ValueError("Director name is required")
+    genres = row.get('genres')
+    if not isinstance(genres, list) or not genres or not all(isinstance(genre, str) and genre for genre in genres):
+        raise ValueError("Genres list cannot be empty.")
+    original_language = row.get('original_language', row.get('language_code'))
+    if not isinstance(original_language, str) or not original_language:
+        raise ValueError(f"Invalid original language: '{original_language}'. Must be a non-empty string.")
+    favorite = row.get('favorite') in (True, 'True', 'true')
+
+    return (name, year, director, ', '.join(genres), original_language, favorite)
+
+def _insert_bulk_chunk(chunk: list, summary: dict) -> None:
+    """
+    Insert one chunk of validated rows in a single transaction, skipping names already stored.
+
+    Args:
+        chunk (list): (index, params) pairs from _validate_bulk_row.
+        summary (dict): The running bulk summary to update.
+    """
+    names = [params[0] for _, params in chunk]
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        # Take the write lock up front so no other writer can add one of these
+        # names between the duplicate check and the insert.
+        cursor.execute("BEGIN IMMEDIATE")
+        placeholders = ', '.join('?' for _ in names)
+        cursor.execute(f"SELECT name FROM movies WHERE name IN ({placeholders})", names)
+        existing = {row[0] for row in cursor.fetchall()}
+
+        to_insert = []
+        for index, params in chunk:
+            if params[0] in existing:
+                _report_bulk_row(summary, 'duplicates', index, params[0], "Movie already exists")
+                continue
+            existing.add(params[0])
+            to_insert.append(params)
+
+        cursor.executemany("""
+            INSERT INTO movies (name, year, director, genres, original_language, favorite)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, to_insert)
+        cursor.executemany(LINK_MOVIE_GENRES_SQL, [
+            (genre, params[0]) for params in to_insert for genre in params[3].split(', ')
+        ])
+        conn.commit()
+    summary['inserted'] += len(to_insert)
+    if to_insert:
+        catalog_version.bump()
+
+def _report_bulk_row(summary: dict, kind: str, index: int, name, error: str) -> None:
+    summary[f'{kind}_count'] += 1
+    if len(summary[kind]) < BULK_MAX_REPORTED_ROWS:
+        summary[kind].append({'index': index, 'name': name, 'error': error})
+    else:
+        summary['truncated'] = True
+
+def bulk_add_movies(rows, chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+    """
+    Add many movies to the database, validating and inserting them in chunks.
+
+    Rows are consumed lazily, so an iterator over a streamed request body is
+    never held in memory all at once. Each chunk is inserted with executemany
+    in its own transaction; chunks committed before a failure stay committed.
+
+    Args:
+        rows (Iterable[dict]): Movie rows with the fields accepted by add_movie_to_list.
+        chunk_size (int): Rows per transaction.
+
+    Returns:
+        dict: A summary with received, inserted, duplicates_count and rejected_count,
+        plus per-row duplicates and rejected entries (index, name, error), capped
+        at BULK_MAX_REPORTED_ROWS each. If the input stream itself is malformed,
+        an 'error' key describes it and processing stops.
+
+    Raises:
+        sqlite3.Error: If a database error occurs.
+    """
+    summary = {
+        'received': 0,
+        'inserted': 0,
+        'duplicates_count': 0,
+        'rejected_count': 0,
+        'duplicates': [],
+        'rejected': [],
+        'truncated': False,
+    }
+    chunk = []
+    index = -1
+    try:
+        try:
+            for index, row in enumerate(rows):
+                summary['received'] += 1
+                try:
+                    chunk.append((index, _validate_bulk_row(row)))
+                except ValueError as e:
+                    name = row.get('name') if isinstance(row, dict) else None
+                    _report_bulk_row(summary, 'rejected', index, name, str(e))
+                    continue
+                if len(chunk) >= chunk_size:
+                    _insert_bulk_chunk(chunk, summary)
+                    chunk = []
+        except ValueError as e:
+            # The input stream itself is malformed; keep what was read so far.
+            logger.error("Bulk import stopped after row %d: %s", index, str(e))
+            summary['error'] = str(e)
+        if chunk:
+            _insert_bulk_chunk(chunk, summary)
+    except sqlite3.Error as e:
+        logger.error("Database error during bulk import: %s", str(e))
+        raise e
+
+    logger.info("Bulk import: %d received, %d inserted, %d duplicates, %d rejected",
+                summary['received'], summary['inserted'], summary['duplicates_count'], summary['rejected_count'])
+    return summary
+
+
+def get_movie_genres(movie_id: int) -> list:
+    """
+    Fetch the genres of a stored movie through the movie_genres table.
+
+    Args:
+        movie_id (int): The ID of the movie.
+
+    Returns:
+        list: (genre_id, genre_name) tuples ordered by genre ID.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT genres.id, genres.name
+                FROM movie_genres JOIN genres ON genres.id = movie_genres.genre_id
+                WHERE movie_genres.movie_id = ?
+                ORDER BY genres.id
+            """, (movie_id,))
+            return cursor.fetchall()
+    except sqlite3.Error as e:
+        logger.error("Database error while retrieving movie genres: %s", str(e))
+        raise e
+
+def list_movies_by_genre(genre_id: int) -> list:
+    """
+    Fetch the names of all stored, non-deleted movies in a genre.
+
+    Args:
+        genre_id (int): The TMDB ID of the genre.
+
+    Returns:
+        list: Movie names ordered by movie ID.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT movies.name
+                FROM movie_genres JOIN movies ON movies.id = movie_genres.movie_id
+                WHERE movie_genres.genre_id = ? AND movies.deleted = FALSE
+                ORDER BY movies.id
+            """, (genre_id,))
+            return [row[0] for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        logger.error("Database error while retrieving movies by genre: %s", str(e))
+        raise e
+
+def migrate_movie_genres() -> None:
+    """
+    Create the movie_genres table in an existing database and backfill it from movies.genres.
+
+    The genre map is loaded first so genre names can be resolved to IDs.
+    Running the migration again only links rows that are still missing.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    get_genres()
+    try:
+        with open(os.getenv("SQL_MIGRATE_GENRES_PATH", "/app/sql/migrate_movie_genres.sql"), "r") as fh:
+            migration_script = fh.read()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executescript(migration_script)
+            conn.commit()
+            logger.info("movie_genres migration complete.")
+        catalog_version.bump()
+    except sqlite3.Error as e:
+        logger.error("Database error while migrating genres: %s", str(e))
+        raise e
+
+def migrate_movies_fts() -> None:
+    """
+    Create the movies_fts full-text index in an existing database and index the stored movies.
+
+    Running the migration again only indexes rows that are still missing.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with open(os.getenv("SQL_MIGRATE_FTS_PATH", "/app/sql/migrate_movies_fts.sql"), "r") as fh:
+            migration_script = fh.read()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executescript(migration_script)
+            conn.commit()
+            logger.info("movies_fts migration complete.")
+        catalog_version.bump()
+    except sqlite3.Error as e:
+        logger.error("Database error while migrating full-text index: %s", str(e))
+        raise e
+
+def migrate_favorites_index() -> None:
+    """
+    Create the partial index of live favorites in an existing database.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with open(os.getenv("SQL_MIGRATE_FAVORITES_PATH", "/app/sql/migrate_favorites_index.sql"), "r") as fh:
+            migration_script = fh.read()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executescript(migration_script)
+            conn.commit()
+            logger.info("Favorites index migration complete.")
+        catalog_version.bump()
+    except sqlite3.Error as e:
+        logger.error("Database error while migrating favorites index: %s", str(e))
+        raise e
+
+def migrate_director_index() -> None:
+    """
+    Create the director lookup tables in an existing database.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with open(os.getenv("SQL_MIGRATE_DIRECTORS_PATH", "/app/sql/migrate_director_index.sql"), "r") as fh:
+            migration_script = fh.read()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executescript(migration_script)
+            conn.commit()
+            logger.info("Director index migration complete.")
+        catalog_version.bump()
+    except sqlite3.Error as e:
+        logger.error("Database error while migrating director index: %s", str(e))
+        raise e
+
+def _fts_query(text: str, column: str = None) -> str:
+    """
+    Build an FTS5 MATCH expression requiring every word of text, optionally in one column.
+
+    Each word is quoted so user input cannot inject FTS5 operators.
+    """
+    tokens = re.findall(r'\w+', text)
+    if not tokens:
+        return None
+    terms = ' '.join(f'"{token}"' for token in tokens)
+    return f"{column} : ({terms})" if column else terms
+
+def search_local_movies(text: str, column: str = 'name', limit: int = 20) -> list:
+    """
+    Search stored, non-deleted movies through the movies_fts full-text index.
+
+    Args:
+        text (str): The words to look for; all of them must match.
+        column (str, optional): 'name' or 'director' to search one column, None for both.
+        limit (int): The maximum number of matches to return.
+
+    Returns:
+        list: Movie dicts (as returned by list_movies), best matches first.
+
+    Raises:
+        ValueError: If the column is not searchable.
+        sqlite3.Error: If any database error occurs.
+    """
+    if column not in ('name', 'director', None):
+        raise ValueError(f"Cannot search column '{column}'")
+    match = _fts_query(text, column)
+    if match is None:
+        return []
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT movies.id, movies.name, movies.year, movies.director, movies.genres,
+                       movies.original_language, movies.favorite, movies.deleted
+                FROM movies_fts JOIN movies ON movies.id = movies_fts.rowid
+                WHERE movies_fts MATCH ?
+                ORDER BY movies_fts.rank
+                LIMIT ?
+            """, (match, limit))
+            return [_movie_row_to_dict(row) for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        logger.error("Database error while searching stored movies: %s", str(e))
+        raise e
+
+LIST_DEFAULT_LIMIT = 50
+LIST_MAX_LIMIT = 500
+
+def _movie_row_to_dict(row) -> dict:
+    movie_id, name, year, director, genres, original_language, favorite, deleted = row
+    return {
+        'id': movie_id,
+        'name': name,
+        'year': year,
+        'director': director,
+        'genres': genres.split(', ') if genres else [],
+        'original_language': original_language,
+        'favorite': bool(favorite),
+        'deleted': bool(deleted),
+    }
+
+def list_movies(
+    year_from: int = None,
+    year_to: int = None,
+    director: str = None,
+    original_language: str = None,
+    genre_id: int = None,
+    favorite: bool = None,
+    deleted: bool = False,
+    after_id: int = None,
+    limit: int = LIST_DEFAULT_LIMIT,
+) -> dict:
+    """
+    List stored movies matching the given filters, one page at a time.
+
+    Pages are ordered by movie ID and use keyset pagination: pass the
+    next_cursor of one page as after_id to get the next, so every page costs
+    the same however deep into the catalog it is.
+
+    Args:
+        year_from (int, optional): Earliest release year, inclusive.
+        year_to (int, optional): Latest release year, inclusive.
+        director (str, optional): Exact director name.
+        original_language (str, optional): Exact original language code.
+        genre_id (int, optional): TMDB genre ID, matched through movie_genres.
+        favorite (bool, optional): Only favorites (True) or non-favorites (False).
+        deleted (bool, optional): Only deleted (True) or live (False, the default) movies; None for both.
+        after_id (int, optional): Return movies with an ID greater than this cursor.
+        limit (int): Page size, at most LIST_MAX_LIMIT.
+
+    Returns:
+        dict: {'movies': [movie dicts], 'next_cursor': int or None}
+
+    Raises:
+        ValueError: If the limit is out of range.
+        sqlite3.Error: If any database error occurs.
+    """
+    if not isinstance(limit, int) or not 1 <= limit <= LIST_MAX_LIMIT:
+        raise ValueError(f"Limit must be between 1 and {LIST_MAX_LIMIT}, got {limit}")
+
+    columns = """
+        SELECT movies.id, movies.name, movies.year, movies.director, movies.genres,
+               movies.original_language, movies.favorite, movies.deleted
+    """
+    conditions = []
+    args = []
+    if genre_id is not None:
+        # CROSS JOIN keeps movie_genres as the outer loop, so the page is read
+        # straight off idx_movie_genres_genre in movie ID order.
+        query = columns + " FROM movie_genres CROSS JOIN movies ON movies.id = movie_genres.movie_id"
+        id_column = "movie_genres.movie_id"
+        conditions.append("movie_genres.genre_id = ?")
+        args.append(genre_id)
+    else:
+        query = columns + " FROM movies"
+        id_column = "movies.id"
+    if deleted is not None:
+        conditions.append("movies.deleted = ?")
+        args.append(bool(deleted))
+    if favorite is not None:
+        conditions.append("movies.favorite = ?")
+        args.append(bool(favorite))
+    if director is not None:
+        conditions.append("movies.director = ?")
+        args.append(director)
+    if original_language is not None:
+        conditions.append("movies.original_language = ?")
+        args.append(original_language)
+    if year_from is not None:
+        conditions.append("movies.year >= ?")
+        args.append(year_from)
+    if year_to is not None:
+        conditions.append("movies.year <= ?")
+        args.append(year_to)
+    if after_id is not None:
+        conditions.append(f"{id_column} > ?")
+        args.append(after_id)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    # Fetch one extra row to know whether another page exists.
+    query += f" ORDER BY {id_column} LIMIT ?"
+    args.append(limit + 1)
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, args)
+            rows = cursor.fetchall()
+    except sqlite3.Error as e:
+        logger.error("Database error while listing movies: %s", str(e))
+        raise e
+
+    movies = [_movie_row_to_dict(row) for row in rows[:limit]]
+    next_cursor = movies[-1]['id'] if len(rows) > limit else None
+    return {'movies': movies, 'next_cursor': next_cursor}
+
+# Random picks probe the smallest matching bucket this many times before
+# falling back to reading that bucket's candidates.
+RANDOM_MAX_PROBES = int(os.getenv("RANDOM_MAX_PROBES", "16"))
+
+RANDOM_MOVIE_COLUMNS = """
+    SELECT movies.id, movies.name, movies.year, movies.director, movies.genres,
+           movies.original_language, movies.favorite, movies.deleted
+    FROM movie_sample_slots JOIN movies ON movies.id = movie_sample_slots.movie_id
+"""
+
+def migrate_movie_sampling() -> None:
+    """
+    Create the movie_sample_* random-sampling index in an existing database and rebuild it.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with open(os.getenv("SQL_MIGRATE_SAMPLING_PATH", "/app/sql/migrate_movie_sampling.sql"), "r") as fh:
+            migration_script = fh.read()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executescript(migration_script)
+            conn.commit()
+            logger.info("movie_sample migration complete.")
+        catalog_version.bump()
+    except sqlite3.Error as e:
+        logger.error("Database error while migrating random-sampling index: %s", str(e))
+        raise e
+
+def _matches_random_filters(cursor, row, year: int, genre_id: int, original_language: str) -> bool:
+    movie_id, _, movie_year, _, _, movie_language, _, deleted = row
+    if deleted:
+        return False
+    if year is not None and movie_year != year:
+        return False
+    if original_language is not None and movie_language.strip().lower() != original_language:
+        return False
+    if genre_id is not None:
+        cursor.execute("SELECT 1 FROM movie_genres WHERE movie_id = ? AND genre_id = ?", (movie_id, genre_id))
+        if cursor.fetchone() is None:
+            return False
+    return True
+
+def pick_random_movie(year: int = None, genre_id: int = None, original_language: str = None) -> dict:
+    """
+    Pick a stored movie uniformly at random among live movies matching the filters.
+
+    Each filter maps to a bucket of the movie_sample_slots index. A slot of the
+    smallest bucket is drawn at random and kept if it also passes the other
+    filters, so with no filter or a single filter a pick is one index lookup
+    regardless of catalog size. If every probe is rejected, the smallest
+    bucket's candidates are filtered in SQL and one is chosen from those.
+
+    Args:
+        year (int, optional): Release year.
+        genre_id (int, optional): TMDB genre ID.
+        original_language (str, optional): Original language code.
+
+    Returns:
+        dict: The chosen movie, in the same shape as list_movies entries.
+
+    Raises:
+        ValueError: If no live movie matches the filters.
+        sqlite3.Error: If any database error occurs.
+    """
+    if original_language is not None:
+        original_language = original_language.strip().lower()
+    buckets = [
+        mirror_slice_key(kind, value)
+        for kind, value in (('year', year), ('genre', genre_id), ('language', original_language))
+        if value is not None
+    ] or ['all']
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ", ".join("?" * len(buckets))
+            cursor.execute(f"SELECT bucket, size FROM movie_sample_buckets WHERE bucket IN ({placeholders})", buckets)
+            sizes = dict(cursor.fetchall())
+            if len(sizes) < len(buckets) or not all(sizes.values()):
+                raise ValueError("No movies found matching the filters.")
+            bucket = min(sizes, key=sizes.get)
+
+            for _ in range(RANDOM_MAX_PROBES):
+                cursor.execute(
+                    RANDOM_MOVIE_COLUMNS + " WHERE movie_sample_slots.bucket = ? AND movie_sample_slots.slot = ?",
+                    (bucket, random.randrange(sizes[bucket]))
+                )
+                row = cursor.fetchone()
+                if row is not None and _matches_random_filters(cursor, row, year, genre_id, original_language):
+                    return _movie_row_to_dict(row)
+
+            # The filters rarely overlap; choose among the exact matches instead.
+            conditions = ["movie_sample_slots.bucket = ?", "movies.deleted = FALSE"]
+            args = [bucket]
+            if year is not None:
+                conditions.append("movies.year = ?")
+                args.append(year)
+            if original_language is not None:
+                conditions.append("lower(trim(movies.original_language)) = ?")
+                args.append(original_language)
+            if genre_id is not None:
+                conditions.append("EXISTS (SELECT 1 FROM movie_genres WHERE movie_id = movies.id AND genre_id = ?)")
+                args.append(genre_id)
+            cursor.execute(RANDOM_MOVIE_COLUMNS + " WHERE " + " AND ".join(conditions), args)
+            rows = cursor.fetchall()
+    except sqlite3.Error as e:
+        logger.error("Database error while picking a random movie: %s", str(e))
+        raise e
+
+    if not rows:
+        raise ValueError("No movies found matching the filters.")
+    return _movie_row_to_dict(random.choice(rows))
+
 def delete_movie_from_list(movie_id: int) -> None:
     """
     Soft deletes a movie from the catalog by marking it as deleted.
@@ -126,11 +974,140 @@ def delete_movie_from_list(movie_id: int) -> None:
             conn.commit()
 
             logger.info("Movie with ID %s marked as deleted.", movie_id)
+        catalog_version.bump()
 
     except sqlite3.Error as e:
         logger.error("Database error while deleting movie: %s", str(e))
         raise e
 
+# Operations accepted by bulk_update_movies: the column set and its new value.
+BULK_UPDATE_OPERATIONS = {
+    'favorite': ('favorite', True),
+    'unfavorite': ('favorite', False),
+    'delete': ('deleted', True),
+    'restore': ('deleted', False),
+}
+# Upper bound on ids plus names in one bulk update.
+BULK_UPDATE_MAX_ITEMS = int(os.getenv("BULK_UPDATE_MAX_ITEMS", "10000"))
+
+def _validate_bulk_keys(values, kind: str) -> list:
+    """
+    Check and de-duplicate the ids or names given to bulk_update_movies, keeping their order.
+
+    Raises:
+        ValueError: If values is not a list or holds an invalid id or name.
+    """
+    if values is None:
+        return []
+    if not isinstance(values, list):
+        raise ValueError(f"{kind} must be a list")
+    for value in values:
+        if kind == 'ids' and (isinstance(value, bool) or not isinstance(value, int)):
+            raise ValueError(f"Invalid movie ID: {value!r}. IDs must be integers.")
+        if kind == 'names' and (not isinstance(value, str) or not value):
+            raise ValueError(f"Invalid movie name: {value!r}. Names must be non-empty strings.")
+    return list(dict.fromkeys(values))
+
+def bulk_update_movies(operation: str, ids: list = None, names: list = None, chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+    """
+    Favorite, unfavorite, delete or restore many movies in one transaction.
+
+    Each chunk of keys is changed by one UPDATE ... RETURNING that skips rows
+    already in the target state, so the movies changed come back from the
+    UPDATE itself. Only keys the UPDATE did not return are looked up again, to
+    tell movies already in that state from movies that do not exist.
+
+    Args:
+        operation (str): 'favorite', 'unfavorite', 'delete' or 'restore'.
+        ids (list, optional): Movie IDs.
+        names (list, optional): Movie names.
+        chunk_size (int): Keys per statement.
+
+    Returns:
+        dict: operation, requested, updated_count, unchanged_count and missing_count,
+        plus updated and unchanged entries ({'id', 'name'}) and missing entries
+        ({'id'} or {'name'}), capped at BULK_MAX_REPORTED_ROWS each with
+        truncated set if any list was cut short.
+
+    Raises:
+        ValueError: If the operation is unknown, no ids or names are given, too many
+            are given, or any is invalid.
+        sqlite3.Error: If any database error occurs; no changes are kept.
+    """
+    if operation not in BULK_UPDATE_OPERATIONS:
+        raise ValueError(f"Unknown operation: '{operation}'. Expected one of {', '.join(BULK_UPDATE_OPERATIONS)}")
+    ids = _validate_bulk_keys(ids, 'ids')
+    names = _validate_bulk_keys(names, 'names')
+    if not ids and not names:
+        raise ValueError("At least one movie ID or name is required")
+    if len(ids) + len(names) > BULK_UPDATE_MAX_ITEMS:
+        raise ValueError(f"At most {BULK_UPDATE_MAX_ITEMS} movies can be updated at once")
+
+    column, value = BULK_UPDATE_OPERATIONS[operation]
+    summary = {
+        'operation': operation,
+        'requested': len(ids) + len(names),
+        'updated_count': 0,
+        'unchanged_count': 0,
+        'missing_count': 0,
+        'updated': [],
+        'unchanged': [],
+        'missing': [],
+        'truncated': False,
+    }
+
+    def report(kind: str, entry: dict) -> None:
+        summary[f'{kind}_count'] += 1
+        if len(summary[kind]) < BULK_MAX_REPORTED_ROWS:
+            summary[kind].append(entry)
+        else:
+            summary['truncated'] = True
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # One write transaction for the whole request, taken up front so the
+            # unchanged/missing split cannot race another writer.
+            cursor.execute("BEGIN IMMEDIATE")
+            for key_column, keys in (('id', ids), ('name', names)):
+                for start in range(0, len(keys), chunk_size):
+                    chunk = keys[start:start + chunk_size]
+                    placeholders = ', '.join('?' for _ in chunk)
+                    cursor.execute(f"""
+                        UPDATE movies SET {column} = ?
+                        WHERE {key_column} IN ({placeholders}) AND {column} IS NOT ?
+                        RETURNING id, name
+                    """, [value, *chunk, value])
+                    changed = {}
+                    for movie_id, name in cursor.fetchall():
+                        changed[movie_id if key_column == 'id' else name] = (movie_id, name)
+
+                    remaining = [key for key in chunk if key not in changed]
+                    existing = {}
+                    if remaining:
+                        placeholders = ', '.join('?' for _ in remaining)
+                        cursor.execute(f"SELECT id, name FROM movies WHERE {key_column} IN ({placeholders})", remaining)
+                        for movie_id, name in cursor.fetchall():
+                            existing[movie_id if key_column == 'id' else name] = (movie_id, name)
+
+                    for key in chunk:
+                        if key in changed:
+                            report('updated', {'id': changed[key][0], 'name': changed[key][1]})
+                        elif key in existing:
+                            report('unchanged', {'id': existing[key][0], 'name': existing[key][1]})
+                        else:
+                            report('missing', {key_column: key})
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.error("Database error during bulk update: %s", str(e))
+        raise e
+    if summary['updated_count']:
+        catalog_version.bump()
+
+    logger.info("Bulk %s: %d requested, %d updated, %d unchanged, %d missing", operation,
+                summary['requested'], summary['updated_count'], summary['unchanged_count'], summary['missing_count'])
+    return summary
+
 def clear_movie_list() -> None:
     """
     Recreates the movie table, effectively deleting all movies.
@@ -147,65 +1124,369 @@ def clear_movie_list() -> None:
             conn.commit()
 
             logger.info("Catalog cleared successfully.")
+        catalog_version.bump()
 
     except sqlite3.Error as e:
         logger.error("Database error while clearing catalog: %s", str(e))
         raise e
         
 
-def find_movie_by_name(name: str) -> Movie:
+##############################################################
+#
+# find_movie helpers
+#
+##############################################################
+
+# TMDB lists no movies released before this year.
+TMDB_FIRST_YEAR = 1874
+
+# Threads used to overlap independent TMDB fetches within one search.
+TMDB_FANOUT_WORKERS = int(os.getenv("TMDB_FANOUT_WORKERS", "8"))
+
+_fanout_executor = None
+_fanout_pid = None
+_fanout_lock = threading.Lock()
+
+def _get_fanout_executor() -> ThreadPoolExecutor:
     """
-    Search for a movie by name using the TMDB API.
+    Get the process-wide thread pool for concurrent TMDB fetches.
+
+    A forked child gets a new pool, since the parent's worker threads do not exist in it.
+    """
+    global _fanout_executor, _fanout_pid
+    pid = os.getpid()
+    if _fanout_executor is None or _fanout_pid != pid:
+        with _fanout_lock:
+            if _fanout_executor is None or _fanout_pid != pid:
+                _fanout_executor = ThreadPoolExecutor(max_workers=TMDB_FANOUT_WORKERS, thread_name_prefix="tmdb-fanout")
+                _fanout_pid = pid
+    return _fanout_executor
+
+def _fetch_genres_async() -> Future:
+    """
+    Start loading the genre map so it overlaps with the search request.
+
+    Returns:
+        Future: Resolves to the genre map; already resolved when the map is in memory.
+    """
+    genres = _genre_map
+    if genres is not None:
+        future = Future()
+        future.set_result(genres)
+        return future
+    return _get_fanout_executor().submit(get_genres)
+
+# Serve year/genre/language searches from the local discover mirror once a
+# slice has been synced (see movie_collection.mirror_sync).
+TMDB_MIRROR_READS = os.getenv("TMDB_MIRROR_READS", "true").lower() == "true"
+
+def mirror_slice_key(kind: str, value) -> str:
+    """
+    Build the key of a mirrored discover slice.
 
     Args:
-        name (str): The name of the movie to search for.
+        kind (str): 'year', 'genre' or 'language'.
+        value: The discover filter value.
 
     Returns:
-        Movie: A Movie object containing the movie information, including favorite status.
+        str: e.g. 'year:2001'.
+    """
+    return f"{kind}:{str(value).strip().lower()}"
+
+def pick_from_mirror(kind: str, value) -> dict:
+    """
+    Pick a random movie from a synced discover slice without calling TMDB.
+
+    Args:
+        kind (str): 'year', 'genre' or 'language'.
+        value: The discover filter value.
+
+    Returns:
+        dict: A TMDB-style result with id, title, release_date, original_language,
+        genre_ids and director, or None if the slice is not mirrored.
+    """
+    if not TMDB_MIRROR_READS:
+        return None
+    key = mirror_slice_key(kind, value)
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT movie_count FROM tmdb_mirror_slices WHERE slice = ?", (key,))
+            row = cursor.fetchone()
+            if not row or not row[0]:
+                return None
+            # Members are numbered 0..movie_count-1, so a random pick is one primary key lookup.
+            cursor.execute("""
+                SELECT tmdb_mirror.tmdb_id, tmdb_mirror.title, tmdb_mirror.release_date,
+                       tmdb_mirror.original_language, tmdb_mirror.genre_ids, tmdb_mirror.director
+                FROM tmdb_mirror_members JOIN tmdb_mirror ON tmdb_mirror.tmdb_id = tmdb_mirror_members.tmdb_id
+                WHERE tmdb_mirror_members.slice = ? AND tmdb_mirror_members.position = ?
+            """, (key, random.randrange(row[0])))
+            row = cursor.fetchone()
+    except sqlite3.Error as e:
+        log_rate_limited(logger, logging.WARNING, 60, "Could not read the TMDB mirror: %s", str(e))
+        return None
+    if row is None:
+        return None
+    tmdb_id, title, release_date, original_language, genre_ids, director = row
+    logger.debug("Serving %s from the TMDB mirror", key)
+    return {
+        'id': tmdb_id,
+        'title': title,
+        'release_date': release_date,
+        'original_language': original_language,
+        'genre_ids': [int(genre_id) for genre_id in genre_ids.split(',') if genre_id],
+        'director': director,
+    }
+
+# Seconds a director's stored TMDB person and filmography are used before
+# find_movie_by_director fetches them again.
+TMDB_DIRECTOR_TTL = float(os.getenv("TMDB_DIRECTOR_TTL", "604800"))
+
+metrics.describe('director_index_lookups_total', 'counter',
+                 'find_movie_by_director lookups in the stored director index, by result: hit, miss, expired or stale.')
+
+def _director_key(director_name: str) -> str:
+    return " ".join(director_name.split()).lower()
+
+def _stored_filmography(key: str) -> tuple:
+    """
+    Read a director's stored filmography with one indexed query.
+
+    Returns:
+        tuple: (synced_at, [TMDB-style results]), or None if the director is not
+            stored or the index cannot be read.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT d.synced_at, m.tmdb_id, m.title, m.release_date, m.original_language, m.genre_ids
+                FROM tmdb_directors AS d LEFT JOIN tmdb_director_movies AS m ON m.person_id = d.person_id
+                WHERE d.name = ?
+            """, (key,))
+            rows = cursor.fetchall()
+    except sqlite3.Error as e:
+        log_rate_limited(logger, logging.WARNING, 60, "Could not read the director index: %s", str(e))
+        return None
+    if not rows:
+        return None
+    movies = [{
+        'id': tmdb_id,
+        'title': title,
+        'release_date': release_date,
+        'original_language': original_language,
+        'genre_ids': [int(genre_id) for genre_id in genre_ids.split(',') if genre_id],
+    } for _, tmdb_id, title, release_date, original_language, genre_ids in rows if tmdb_id is not None]
+    return rows[0][0], movies
+
+def _store_filmography(key: str, person_id: int, movies: list) -> None:
+    """
+    Replace a director's stored person and filmography. Failures are logged, not raised.
+
+    If the name used to map to another person, that person's movies are deleted
+    too unless another stored name still maps to them.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT person_id FROM tmdb_directors WHERE name = ?", (key,))
+            previous = cursor.fetchone()
+            cursor.execute("DELETE FROM tmdb_director_movies WHERE person_id = ?", (person_id,))
+            cursor.executemany("""
+                INSERT OR IGNORE INTO tmdb_director_movies
+                    (person_id, tmdb_id, title, release_date, original_language, genre_ids)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [(person_id, movie['id'], movie['title'], movie.get('release_date'), movie.get('original_language') or '',
+                   ','.join(str(genre_id) for genre_id in movie.get('genre_ids', []))) for movie in movies])
+            cursor.execute("""
+                INSERT INTO tmdb_directors (name, person_id, synced_at) VALUES (?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET person_id = excluded.person_id, synced_at = excluded.synced_at
+            """, (key, person_id, time.time()))
+            if previous is not None and previous[0] != person_id:
+                cursor.execute("""
+                    DELETE FROM tmdb_director_movies WHERE person_id = ?
+                    AND NOT EXISTS (SELECT 1 FROM tmdb_directors WHERE person_id = ?)
+                """, (previous[0], previous[0]))
+            conn.commit()
+    except sqlite3.Error as e:
+        log_rate_limited(logger, logging.WARNING, 60, "Could not update the director index: %s", str(e))
+
+def _director_filmography(director_name: str) -> list:
+    """
+    Get the movies a director directed, from the director index while it is fresh.
+
+    Otherwise the person is resolved with /search/person, the filmography fetched
+    from /person/{id}/movie_credits and both are stored for TMDB_DIRECTOR_TTL
+    seconds. If TMDB fails, including answering with an error payload instead of
+    results, nothing is stored and an expired entry is served rather than failing.
+
+    Args:
+        director_name (str): The director's name as searched.
+
+    Returns:
+        list: TMDB-style results with id, title, release_date, original_language
+            and genre_ids; empty if the person directed nothing.
 
     Raises:
-        ValueError: If no movies are found with the given name.
+        ValueError: If TMDB knows no person by that name.
+        RuntimeError: If TMDB fails and nothing is stored for the director.
     """
-    url = f"{BASE_URL}/search/movie"
-    params = {'api_key': API_KEY, 'query': name}
-    
-    response = requests.get(url, params=params)
-    data = response.json()
+    key = _director_key(director_name)
+    stored = _stored_filmography(key)
+    if stored is not None and time.time() - stored[0] < TMDB_DIRECTOR_TTL:
+        metrics.inc('director_index_lookups_total', (('result', 'hit'),))
+        return stored[1]
 
-    if 'results' in data and data['results']:
-        random_movie = random.choice(data['results'])
-        movie_name = random_movie['title']
-        release_date = random_movie['release_date']
-        release_date = random_movie['release_date']
-        if release_date:
-            release_year = int(release_date[:4])
-        else:
-            release_year = "Unknown"
+    try:
+        data = _tmdb_get('/search/person', {'query': director_name})
+        if 'results' not in data:
+            raise RuntimeError(f"TMDB person search failed: {data.get('status_message', 'no results in response')}")
+        if not data['results']:
+            raise ValueError("Director not found.")
+        person_id = data['results'][0]['id']
+        credits = _tmdb_get(f"/person/{person_id}/movie_credits")
+        # An error payload has no crew; storing it would hide the director for TMDB_DIRECTOR_TTL.
+        if 'crew' not in credits:
+            raise RuntimeError(f"TMDB movie credits failed: {credits.get('status_message', 'no crew in response')}")
+    except RuntimeError:
+        if stored is None:
+            raise
+        metrics.inc('director_index_lookups_total', (('result', 'stale'),))
+        log_rate_limited(logger, logging.WARNING, 60, "TMDB unavailable; serving a stored filmography past its TTL")
+        return stored[1]
+
+    metrics.inc('director_index_lookups_total', (('result', 'miss' if stored is None else 'expired'),))
+    movies = [movie for movie in credits['crew'] if movie['job'] == 'Director']
+    _store_filmography(key, person_id, movies)
+    return movies
+
+metrics.describe('find_movie_catalog_lookups_total', 'counter',
+                 'TMDB picks checked against the local catalog before fetching credits, by result.')
+
+def _stored_movie(name: str) -> Movie:
+    """
+    Look up a movie in the catalog by name, deleted or not.
+
+    Returns:
+        Movie: The stored movie, or None if no movie with that name is stored
+            or the catalog cannot be read.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT name, year, director, genres, original_language, favorite
+                FROM movies WHERE name = ?
+            """, (name,))
+            row = cursor.fetchone()
+    except sqlite3.Error as e:
+        log_rate_limited(logger, logging.WARNING, 60, "Could not check the catalog for a TMDB pick: %s", str(e))
+        return None
+    if row is None:
+        return None
+    name, year, director, genres, original_language, favorite = row
+    return Movie(name=name, year=year, director=director, genres=genres.split(', ') if genres else [],
+                 original_language=original_language, favorite=bool(favorite))
+
+def _movie_from_result(result: dict, genres_future: Future, director: str = None) -> Movie:
+    """
+    Build a Movie from a TMDB movie result and add it to the catalog.
 
-        genre_ids = random_movie['genre_ids']
-        genres_map = get_genres()
-        original_language = random_movie['original_language']
-        genres = [genres_map.get(genre_id, "Unknown") for genre_id in genre_ids]
+    A movie that is already stored is returned as stored, without the credits
+    call. A movie the user deleted is returned but stays deleted. Otherwise the genre map is awaited
+    only after the credits call, so a genre fetch still in flight overlaps
+    with both the search and the credits request.
 
-        
-        credits_url = f"{BASE_URL}/movie/{random_movie['id']}/credits"
-        credits_response = requests.get(credits_url, params={'api_key': API_KEY})
-        credits_data = credits_response.json()
+    Args:
+        result (dict): A movie entry from a TMDB search, discover or credits response.
+        genres_future (Future): From _fetch_genres_async().
+        director (str, optional): The director, if already known. Otherwise it is
+            looked up in the movie's credits.
+
+    Returns:
+        Movie: The movie that was added or found in the catalog.
+    """
+    movie_name = result['title']
+    stored = _stored_movie(movie_name)
+    if stored is not None:
+        metrics.inc('find_movie_catalog_lookups_total', (('result', 'hit'),))
+        return stored
+    metrics.inc('find_movie_catalog_lookups_total', (('result', 'miss'),))
+
+    release_date = result['release_date']
+    if release_date:
+        release_year = int(release_date[:4])
+    else:
+        release_year = "Unknown"
+    original_language = result['original_language']
 
+    if director is None:
+        credits_data = _tmdb_get(f"/movie/{result['id']}/credits")
         director = "Unknown"
         for crew_member in credits_data.get('crew', []):
             if crew_member['job'] == 'Director':
                 director = crew_member['name']
                 break
-        add_movie_to_list(movie_name, release_year, director, genres, original_language)
-
-        return Movie(
-            name=movie_name,
-            year=release_year,
-            director=director, 
-            genres=genres,
-            original_language=original_language,
-        )
+
+    genres_map = genres_future.result()
+    genres = [genres_map.get(genre_id, "Unknown") for genre_id in result['genre_ids']]
+
+    if not add_movie_to_list(movie_name, release_year, director, genres, original_language, upsert=True):
+        # Stored by a concurrent request since the lookup above.
+        stored = _stored_movie(movie_name)
+        if stored is not None:
+            return stored
+
+    return Movie(
+        name=movie_name,
+        year=release_year,
+        director=director,
+        genres=genres,
+        original_language=original_language,
+    )
+
+def find_movie_by_name(name: str, local_first: bool = False) -> Movie:
+    """
+    Search for a movie by name using the TMDB API.
+
+    Args:
+        name (str): The name of the movie to search for.
+        local_first (bool, optional): Answer from the local full-text index when any
+            stored movie matches, and only call TMDB on a miss. Defaults to False.
+
+    Returns:
+        Movie: A Movie object containing the movie information, including favorite status.
+
+    Raises:
+        ValueError: If no movies are found with the given name.
+    """
+    if not name or not name.strip():
+        _known_empty('/search/movie')
+        raise ValueError("No movies found.")
+
+    if local_first:
+        try:
+            matches = search_local_movies(name)
+        except sqlite3.Error:
+            matches = []
+        if matches:
+            stored = random.choice(matches)
+            logger.debug("Local full-text hit for '%s'", name)
+            return Movie(
+                name=stored['name'],
+                year=stored['year'],
+                director=stored['director'],
+                genres=stored['genres'],
+                original_language=stored['original_language'],
+                favorite=stored['favorite'],
+            )
+
+    genres_future = _fetch_genres_async()
+    data = _tmdb_get('/search/movie', {'query': name})
+
+    if 'results' in data and data['results']:
+        return _movie_from_result(random.choice(data['results']), genres_future)
     else:
         raise ValueError("No movies found.")
     
@@ -237,6 +1518,7 @@ def mark_movie_as_favorite(name: str) -> None:
             conn.commit()
 
             logger.info("Movie '%s' marked as favorite.", name)
+        catalog_version.bump()
 
     except sqlite3.Error as e:
         logger.error("Database error while marking movie as favorite: %s", str(e))
@@ -261,13 +1543,65 @@ def list_favorite_movies() -> list:
             # Extract movie names from query results
             favorite_movies = [row[0] for row in results]
 
-            logger.info("Favorite movies retrieved: %s", favorite_movies)
+            logger.debug("Retrieved %d favorite movies.", len(favorite_movies))
             return favorite_movies
 
     except sqlite3.Error as e:
         logger.error("Database error while retrieving favorite movies: %s", str(e))
         raise e
 
+FAVORITES_DEFAULT_LIMIT = 100
+
+# The planner prefers idx_movies_favorite, which has statistics, over the
+# partial index, which reads ~30% faster per page; name it explicitly.
+FAVORITES_PAGE_SQL = """
+    SELECT id, name FROM movies {hint}
+    WHERE favorite = TRUE AND deleted = FALSE AND id > ?
+    ORDER BY id LIMIT ?
+"""
+
+def list_favorite_movies_page(after_id: int = None, limit: int = FAVORITES_DEFAULT_LIMIT) -> dict:
+    """
+    Fetch one page of the names of live (non-deleted) favorite movies.
+
+    Pages come from the idx_movies_favorite_live partial index in movie ID
+    order; pass the next_cursor of one page as after_id to get the next.
+
+    Args:
+        after_id (int, optional): Return favorites with an ID greater than this cursor.
+        limit (int): Page size, at most LIST_MAX_LIMIT.
+
+    Returns:
+        dict: {'favorite_movies': [names], 'next_cursor': int or None}
+
+    Raises:
+        ValueError: If the limit is out of range.
+        sqlite3.Error: If any database error occurs.
+    """
+    if not isinstance(limit, int) or not 1 <= limit <= LIST_MAX_LIMIT:
+        raise ValueError(f"Limit must be between 1 and {LIST_MAX_LIMIT}, got {limit}")
+    # Fetch one extra row to know whether another page exists.
+    args = (after_id if after_id is not None else 0, limit + 1)
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(FAVORITES_PAGE_SQL.format(hint="INDEXED BY idx_movies_favorite_live"), args)
+            except sqlite3.OperationalError as e:
+                if "no such index" not in str(e):
+                    raise
+                log_rate_limited(logger, logging.WARNING, 3600,
+                                 "idx_movies_favorite_live is missing; run migrate_favorites_index()")
+                cursor.execute(FAVORITES_PAGE_SQL.format(hint=""), args)
+            rows = cursor.fetchall()
+    except sqlite3.Error as e:
+        logger.error("Database error while retrieving favorite movies: %s", str(e))
+        raise e
+
+    next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+    return {'favorite_movies': [name for _, name in rows[:limit]], 'next_cursor': next_cursor}
+
 
 ##############################################################
 #
@@ -288,48 +1622,21 @@ def find_movie_by_year(year: int) -> Movie:
     Raises:
         ValueError: If no movies are found for the given year or if the year is invalid.
     """
-    url = f"{BASE_URL}/discover/movie"
-    params = {'api_key': API_KEY, 'primary_release_year': year}
-    
-    response = requests.get(url, params=params)
-    data = response.json()
-
     if not isinstance(year, int):
         raise ValueError("Year must be an integer")
+    if year < TMDB_FIRST_YEAR:
+        _known_empty('/discover/movie')
+        raise ValueError(f"No movies found for the year: '{year}'.")
 
-    if 'results' in data and data['results']:
-        random_movie = random.choice(data['results'])
-        movie_name = random_movie['title']
-        release_date = random_movie['release_date']
-        release_date = random_movie['release_date']
-        if release_date:
-            release_year = int(release_date[:4])
-        else:
-            release_year = "Unknown"
-
-        genre_ids = random_movie['genre_ids']
-        genres_map = get_genres()
-        original_language = random_movie['original_language']
-        genres = [genres_map.get(genre_id, "Unknown") for genre_id in genre_ids]
+    genres_future = _fetch_genres_async()
+    mirrored = pick_from_mirror('year', year)
+    if mirrored is not None:
+        return _movie_from_result(mirrored, genres_future, director=mirrored['director'])
 
-        
-        credits_url = f"{BASE_URL}/movie/{random_movie['id']}/credits"
-        credits_response = requests.get(credits_url, params={'api_key': API_KEY})
-        credits_data = credits_response.json()
+    data = _tmdb_get('/discover/movie', {'primary_release_year': year})
 
-        director = "Unknown"
-        for crew_member in credits_data.get('crew', []):
-            if crew_member['job'] == 'Director':
-                director = crew_member['name']
-                break
-        add_movie_to_list(movie_name, release_year, director, genres, original_language)
-        return Movie(
-            movie_name,
-            release_year,
-            director,
-            genres,
-            original_language
-        )
+    if 'results' in data and data['results']:
+        return _movie_from_result(random.choice(data['results']), genres_future)
     else:
         raise ValueError(f"No movies found for the year: '{year}'.")
 
@@ -346,52 +1653,20 @@ def find_movie_by_language(language_code: str) -> Movie:
     Raises:
         ValueError: If no movies are found for the given language or if the language code is invalid.
     """
-    url = f"{BASE_URL}/discover/movie"
-    params = {'api_key': API_KEY, 'language': language_code}
-    
-    response = requests.get(url, params=params)
-    data = response.json()
-
     if not language_code:
         raise ValueError("Language code cannot be empty")
 
-    if 'results' in data and data['results']:
-        random_movie = random.choice(data['results'])
-        movie_name = random_movie['title']
-        release_date = random_movie['release_date']
-        release_date = random_movie['release_date']
-        if release_date:
-            release_year = int(release_date[:4])
-        else:
-            release_year = "Unknown"
-
-        genre_ids = random_movie['genre_ids']
-        genres_map = get_genres()
-        original_language = random_movie['original_language']
-        genres = [genres_map.get(genre_id, "Unknown") for genre_id in genre_ids]
-
-        
-        credits_url = f"{BASE_URL}/movie/{random_movie['id']}/credits"
-        credits_response = requests.get(credits_url, params={'api_key': API_KEY})
-        credits_data = credits_response.json()
-
-        director = "Unknown"
-        for crew_member in credits_data.get('crew', []):
-            if crew_member['job'] == 'Director':
-                director = crew_member['name']
-                break
+    genres_future = _fetch_genres_async()
+    mirrored = pick_from_mirror('language', language_code)
+    if mirrored is not None:
+        return _movie_from_result(mirrored, genres_future, director=mirrored['director'])
 
-        add_movie_to_list(movie_name, release_year, director, genres, original_language)
+    data = _tmdb_get('/discover/movie', {'language': language_code})
 
-        return Movie(
-            movie_name,
-            release_year,
-            director,
-            genres,
-            original_language
-        )
+    if 'results' in data and data['results']:
+        return _movie_from_result(random.choice(data['results']), genres_future)
     else:
-        raise ValueError(f"Invalid original language: '{original_language}'. Must be a non-empty string.")
+        raise ValueError(f"No movies found for the language: '{language_code}'.")
     
 def find_movie_by_director(director_name: str) -> Movie:
     """
@@ -406,49 +1681,17 @@ def find_movie_by_director(director_name: str) -> Movie:
     Raises:
         ValueError: If the director is not found or if no movies are found for the director.
     """
-    url = f"{BASE_URL}/search/person"
-    params = {'api_key': API_KEY, 'query': director_name}
-    
-    response = requests.get(url, params=params)
-    data = response.json()
+    if not director_name or not director_name.strip():
+        _known_empty('/search/person')
+        raise ValueError("Director not found.")
 
-    if 'results' in data and data['results']:
-        person_id = data['results'][0]['id']
-
-        url = f"{BASE_URL}/person/{person_id}/movie_credits"
-        response = requests.get(url, params={'api_key': API_KEY})
-        credits = response.json()
+    genres_future = _fetch_genres_async()
+    directed_movies = _director_filmography(director_name)
 
-        directed_movies = [movie for movie in credits['crew'] if movie['job'] == 'Director']
-        
-        if directed_movies:
-            random_movie = random.choice(directed_movies)
-            movie_name = random_movie['title']
-            release_date = random_movie['release_date']
-            release_date = random_movie['release_date']
-            if release_date:
-                release_year = int(release_date[:4])
-            else:
-                release_year = "Unknown"
-
-            genre_ids = random_movie['genre_ids']
-            genres_map = get_genres()
-            original_language = random_movie['original_language']
-            genres = [genres_map.get(genre_id, "Unknown") for genre_id in genre_ids]
-                
-            add_movie_to_list(movie_name, release_year, director_name, genres, original_language)
-            
-            return Movie(
-                movie_name,
-                release_year,
-                director_name,
-                genres,
-                original_language
-            )
-        else:
-            raise ValueError(f"No movies found with the director '{director_name}'.")
-    else: 
-        raise ValueError(f"Director not found.")
+    if directed_movies:
+        return _movie_from_result(random.choice(directed_movies), genres_future, director=director_name)
+    else:
+        raise ValueError(f"No movies found with the director '{director_name}'.")
 
 
 def find_movie_by_genre(genre_id: int) -> Movie:
@@ -464,45 +1707,20 @@ def find_movie_by_genre(genre_id: int) -> Movie:
     Raises:
         ValueError: If no movies are found for the given genre or if the genre ID is invalid.
     """
-    url = f"{BASE_URL}/discover/movie"
-    params = {'api_key': API_KEY, 'with_genres': genre_id}
-    
-    response = requests.get(url, params=params)
-    data = response.json()
-
-    if 'results' in data and data['results']:
-        random_movie = random.choice(data['results'])
-        movie_name = random_movie['title']
-        release_date = random_movie['release_date']
-        if release_date:
-            release_year = int(release_date[:4])
-        else:
-            release_year = "Unknown"
+    # Only a genre map that is already loaded is consulted; it lists every TMDB movie genre.
+    known_genres = _genre_map
+    if isinstance(genre_id, int) and (genre_id <= 0 or (known_genres and genre_id not in known_genres)):
+        _known_empty('/discover/movie')
+        raise ValueError(f"No movies found with the genre with ID '{genre_id}'.")
 
-        genre_ids = random_movie['genre_ids']
-        genres_map = get_genres()
-        original_language = random_movie['original_language']
-        genres = [genres_map.get(genre_id, "Unknown") for genre_id in genre_ids]
+    genres_future = _fetch_genres_async()
+    mirrored = pick_from_mirror('genre', genre_id)
+    if mirrored is not None:
+        return _movie_from_result(mirrored, genres_future, director=mirrored['director'])
 
-        
-        credits_url = f"{BASE_URL}/movie/{random_movie['id']}/credits"
-        credits_response = requests.get(credits_url, params={'api_key': API_KEY})
-        credits_data = credits_response.json()
+    data = _tmdb_get('/discover/movie', {'with_genres': genre_id})
 
-        director = "Unknown"
-        for crew_member in credits_data.get('crew', []):
-            if crew_member['job'] == 'Director':
-                director = crew_member['name']
-                break
-        
-        add_movie_to_list(movie_name, release_year, director, genres, original_language)
-
-        return Movie(
-            movie_name,
-            release_year,
-            director,
-            genres,
-            original_language,
-        )
+    if 'results' in data and data['results']:
+        return _movie_from_result(random.choice(data['results']), genres_future)
     else:
         raise ValueError(f"No movies found with the genre with ID '{genre_id}'.")
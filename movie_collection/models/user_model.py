@@ -5,13 +5,41 @@ import os
 from sqlalchemy.exc import IntegrityError
 
 from movie_collection.db import db
-from music_collection.utils.logger import configure_logger
+from movie_collection.utils.cache_utils import MISSING, TTLCache
+from movie_collection.utils.catalog_version import CatalogVersion
+from movie_collection.utils.logger import configure_logger, log_rate_limited
+from movie_collection.utils.metrics_utils import metrics, register_cache
+from movie_collection.utils.sql_utils import DB_PATH
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+# Credential rows are cached per process. Each entry records the credentials
+# version it was read at, so a password changed through any process invalidates
+# it. Only password changes bump the version; new accounts leave other entries alone.
+CREDENTIALS_VERSION_PATH = os.getenv("CREDENTIALS_VERSION_PATH", f"{DB_PATH}.credentials")
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+USER_NEGATIVE_CACHE_TTL = float(os.getenv("USER_NEGATIVE_CACHE_TTL", "5"))
+
+# Cached in place of credentials for usernames that do not exist.
+_UNKNOWN_USER = object()
+
+metrics.describe('credentials_version_bumps_total', 'counter', 'Password changes recorded in the credentials version file.')
+
+credentials_version = CatalogVersion(CREDENTIALS_VERSION_PATH, metric='credentials_version_bumps_total')
+
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, default_ttl=USER_CACHE_TTL, name="users")
+register_cache(user_cache)
+
+
+def clear_user_cache() -> None:
+    """Empty the credential cache, e.g. in a child process after fork."""
+    user_cache.clear()
+
+
 class Users(db.Model):
     __tablename__ = 'users'
 
@@ -52,6 +80,7 @@ class Users(db.Model):
         try:
             db.session.add(new_user)
             db.session.commit()
+            user_cache.invalidate(username)
             logger.info("User successfully added to the database: %s", username)
         except IntegrityError:
             db.session.rollback()
@@ -62,6 +91,35 @@ class Users(db.Model):
             logger.error("Database error: %s", str(e))
             raise
 
+    @classmethod
+    def _get_credentials(cls, username: str) -> tuple:
+        """
+        Look up a user's salt and password hash, reading through the credential cache.
+
+        Args:
+            username (str): The username of the user.
+
+        Returns:
+            tuple: (salt, hashed_password), or None if the user does not exist.
+        """
+        # Read the version before the row, so a change committed in between
+        # bumps it again and the entry is not used next time.
+        version = credentials_version.current()
+        if version is None:
+            log_rate_limited(logger, logging.WARNING, 3600,
+                             "Cannot read credentials version file %s; cached credentials expire after %ss instead.",
+                             credentials_version.path, USER_CACHE_TTL)
+        entry = user_cache.get(username)
+        if entry is MISSING or entry[0] != version:
+            user = cls.query.filter_by(username=username).first()
+            if user is None:
+                user_cache.set(username, (version, _UNKNOWN_USER), ttl=USER_NEGATIVE_CACHE_TTL)
+                return None
+            entry = (version, (user.salt, user.password))
+            user_cache.set(username, entry)
+        credentials = entry[1]
+        return None if credentials is _UNKNOWN_USER else credentials
+
     @classmethod
     def check_password(cls, username: str, password: str) -> bool:
         """
@@ -77,12 +135,13 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
+        credentials = cls._get_credentials(username)
+        if credentials is None:
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        hashed_password = hashlib.sha256((password + user.salt).encode()).hexdigest()
-        return hashed_password == user.password
+        salt, stored_password = credentials
+        hashed_password = hashlib.sha256((password + salt).encode()).hexdigest()
+        return hashed_password == stored_password
 
     @classmethod
     def update_password(cls, username: str, new_password: str) -> None:
@@ -96,13 +155,13 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
-            logger.info("User %s not found", username)
-            raise ValueError(f"User {username} not found")
-
         salt, hashed_password = cls._generate_hashed_password(new_password)
-        user.salt = salt
-        user.password = hashed_password
+        # A single UPDATE both changes the row and tells us whether it exists.
+        updated = cls.query.filter_by(username=username).update({'salt': salt, 'password': hashed_password})
         db.session.commit()
+        user_cache.invalidate(username)
+        if not updated:
+            logger.info("User %s not found", username)
+            raise ValueError(f"User {username} not found")
+        credentials_version.bump()
         logger.info("Password updated successfully for user: %s", username)
\ No newline at end of file
@@ -0,0 +1,246 @@
+from collections import OrderedDict
+import threading
+import time
+
+
+# Sentinel returned by TTLCache.get when a key is absent or expired, so that
+# falsy values (empty dicts, None) can still be cached.
+MISSING = object()
+
+
+class TTLCache:
+    """
+    A thread-safe, size-bounded cache with per-entry expiry and LRU eviction.
+
+    Attributes:
+        name (str): A label used when reporting statistics.
+        maxsize (int): The maximum number of entries kept in memory.
+        default_ttl (float): Seconds an entry lives when no TTL is given to set().
+    """
+
+    def __init__(self, maxsize: int = 1024, default_ttl: float = 300.0, name: str = "cache"):
+        if maxsize <= 0:
+            raise ValueError(f"Cache size must be a positive integer, got {maxsize}")
+        self.name = name
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=MISSING):
+        """
+        Look up a key, refreshing its LRU position on a hit.
+
+        Args:
+            key: The cache key.
+            default: The value returned when the key is absent or expired.
+
+        Returns:
+            The cached value, or default.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+            ttl (float, optional): Seconds until the entry expires. Defaults to default_ttl.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key) -> None:
+        """Remove a single key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """
+        Report the cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, expirations, size, maxsize and hit_ratio.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hit_ratio': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+class _Flight:
+    """One call in progress and what it produced."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.duration = 0.0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is running,
+    other callers with the same key wait for it and share its result (or its
+    exception) instead of making their own.
+
+    Only calls that overlap are shared; nothing is kept once a call returns.
+
+    Attributes:
+        name (str): A label used when reporting statistics.
+        calls (int): Calls actually made.
+        waiters (int): Callers that shared another caller's call.
+        saved_seconds (float): For each waiter, the duration of the call it
+            did not have to make.
+    """
+
+    def __init__(self, name: str = "flight"):
+        self.name = name
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.waiters = 0
+        self.saved_seconds = 0.0
+
+    def do(self, key, func):
+        """
+        Call func(), unless a call for key is already running; then wait for that one.
+
+        Args:
+            key: A hashable key identifying the call.
+            func: A function taking no arguments.
+
+        Returns:
+            What func() returned, for the caller that ran it and every waiter.
+
+        Raises:
+            Exception: Whatever func() raised, for the caller that ran it and every waiter.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+                leader = True
+            else:
+                self.waiters += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            with self._lock:
+                self.saved_seconds += flight.duration
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        start = time.monotonic()
+        try:
+            flight.result = func()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            flight.duration = time.monotonic() - start
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def reset(self) -> None:
+        """Forget calls in progress, e.g. in a forked child where their threads do not exist."""
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        """
+        Report the coalescing counters.
+
+        Returns:
+            dict: name, calls, waiters, saved_seconds and in_flight.
+        """
+        with self._lock:
+            return {
+                'name': self.name,
+                'calls': self.calls,
+                'waiters': self.waiters,
+                'saved_seconds': self.saved_seconds,
+                'in_flight': len(self._flights),
+            }
+
+
+def _normalize_value(value):
+    if isinstance(value, str):
+        return " ".join(value.split()).lower()
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_value(item) for item in value)
+    return value
+
+
+def make_cache_key(endpoint: str, params: dict = None, ignore: tuple = ('api_key',)) -> tuple:
+    """
+    Build a hashable cache key from an endpoint and its query parameters.
+
+    String values are stripped, whitespace-collapsed and lowercased, parameters
+    are sorted by name, and credentials are left out of the key.
+
+    Args:
+        endpoint (str): The request path, e.g. '/search/movie'.
+        params (dict, optional): The query parameters.
+        ignore (tuple): Parameter names to leave out of the key.
+
+    Returns:
+        tuple: A key suitable for TTLCache.
+    """
+    params = params or {}
+    normalized = tuple(sorted(
+        (name, _normalize_value(value))
+        for name, value in params.items()
+        if name not in ignore and value is not None
+    ))
+    return (endpoint, normalized)
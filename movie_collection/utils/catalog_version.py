@@ -0,0 +1,135 @@
+from contextlib import contextmanager
+import fcntl
+import logging
+import os
+import secrets
+import threading
+import time
+
+from movie_collection.utils.logger import configure_logger, log_rate_limited
+from movie_collection.utils.metrics_utils import metrics
+from movie_collection.utils.sql_utils import DB_PATH
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Shared by every process serving the same database, so it lives next to it.
+CATALOG_VERSION_PATH = os.getenv("CATALOG_VERSION_PATH", f"{DB_PATH}.version")
+
+metrics.describe('catalog_version_bumps_total', 'counter', 'Catalog mutations recorded in the catalog version file.')
+
+
+class CatalogVersion:
+    """
+    A counter that goes up every time the movie catalog changes.
+
+    The counter is a small file holding an epoch, the version and the time of
+    the last change. Every process serving the database shares it, so a
+    version read in one worker reflects writes made in any other. Reads only
+    stat the file and re-read it when it was replaced, so checking the
+    version costs no database query.
+
+    The epoch is random and chosen when the file is created; if the file is
+    removed the count starts again under a new epoch, so validators issued
+    before can never match.
+
+    Attributes:
+        path (str): The version file.
+        metric (str): The counter incremented on every bump.
+    """
+
+    def __init__(self, path: str = CATALOG_VERSION_PATH, metric: str = 'catalog_version_bumps_total'):
+        self.path = path
+        self.metric = metric
+        self._lock = threading.Lock()
+        self._stat_key = None
+        self._state = None
+
+    def _read(self):
+        with open(self.path, 'r') as fh:
+            epoch, version, modified_at = fh.read().split()
+        return epoch, int(version), float(modified_at)
+
+    def _write(self, state: tuple) -> None:
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w') as fh:
+            fh.write("%s %d %.6f\n" % state)
+        os.replace(temp_path, self.path)
+
+    def current(self) -> tuple:
+        """
+        Read the current version, creating the file if there is none yet.
+
+        Returns:
+            tuple: (epoch, version, modified_at), with modified_at a Unix time,
+                or None if the file cannot be read or created.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self._create()
+        except OSError as e:
+            log_rate_limited(logger, logging.ERROR, 60, "Cannot read catalog version %s: %s", self.path, str(e))
+            return None
+        stat_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if stat_key == self._stat_key:
+                return self._state
+        try:
+            state = self._read()
+        except (OSError, ValueError) as e:
+            log_rate_limited(logger, logging.ERROR, 60, "Cannot read catalog version %s: %s", self.path, str(e))
+            return None
+        with self._lock:
+            self._stat_key, self._state = stat_key, state
+        return state
+
+    def _create(self) -> tuple:
+        try:
+            with self._locked():
+                if not os.path.exists(self.path):
+                    self._write((secrets.token_hex(4), 0, time.time()))
+        except OSError as e:
+            log_rate_limited(logger, logging.ERROR, 60, "Cannot create catalog version %s: %s", self.path, str(e))
+            return None
+        return self.current()
+
+    def _locked(self):
+        return _file_lock(f"{self.path}.lock")
+
+    def bump(self) -> None:
+        """
+        Record a catalog change. Call it after the change is committed.
+
+        Readers take the version before they query, so a request that reads
+        between the commit and the bump is labelled with the old version and
+        simply fails revalidation next time. Errors are logged, not raised:
+        the change itself has already been committed.
+        """
+        try:
+            with self._locked():
+                try:
+                    epoch, version, _ = self._read()
+                except (FileNotFoundError, ValueError):
+                    epoch, version = secrets.token_hex(4), 0
+                self._write((epoch, version + 1, time.time()))
+        except OSError as e:
+            log_rate_limited(logger, logging.ERROR, 60, "Cannot update catalog version %s: %s", self.path, str(e))
+            return
+        metrics.inc(self.metric)
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Hold an exclusive lock on path, which is created if needed, across processes."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+catalog_version = CatalogVersion()
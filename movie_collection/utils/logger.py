@@ -1,35 +1,268 @@
+import atexit
+import fcntl
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
+import queue
+import sys
+import threading
+import time
 
-def configure_logger(logger, log_level=logging.INFO):
+from movie_collection.utils.metrics_utils import metrics
+
+# Process-wide settings, read once when the pipeline is first set up.
+LOG_FILE = os.getenv("LOG_FILE", "logs/auth.log")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(1024 * 1024)))  # 1MB
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Per-logger overrides, e.g. "movie_collection.utils.sql_utils=WARNING,app=DEBUG".
+# A setting applies to the named logger and its children.
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+
+
+def parse_log_levels(spec: str) -> dict:
+    """
+    Parse a "name=LEVEL,name=LEVEL" string into a dict of logger name to level.
+
+    Args:
+        spec (str): The override string, usually LOG_LEVELS.
+
+    Returns:
+        dict: Logger names mapped to numeric levels.
+
+    Raises:
+        ValueError: If an entry is malformed or names an unknown level.
+    """
+    levels = {}
+    for entry in filter(None, (part.strip() for part in spec.split(','))):
+        name, sep, level = entry.partition('=')
+        numeric = logging.getLevelName(level.strip().upper())
+        if not sep or not name.strip() or not isinstance(numeric, int):
+            raise ValueError(f"Invalid log level setting: '{entry}'")
+        levels[name.strip()] = numeric
+    return levels
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    A QueueHandler that never blocks the calling thread.
+
+    When the queue is full the record is dropped and counted rather than
+    waiting for the listener to catch up.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class SharedRotatingFileHandler(RotatingFileHandler):
+    """
+    A RotatingFileHandler that several processes, such as gunicorn workers, can share.
+
+    Rotation runs under an exclusive lock on a '.lock' file next to the log, and
+    before each write the handler reopens the log if another process has
+    rotated it, as WatchedFileHandler does. So only one process renames the
+    files per rotation and nobody keeps writing to a file that was moved away.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount)
+        self._file_id = self._open_file_id()
+
+    def _open_file_id(self):
+        if self.stream is None:
+            return None
+        stat = os.fstat(self.stream.fileno())
+        return (stat.st_dev, stat.st_ino)
+
+    def _reopen_if_moved(self) -> bool:
+        try:
+            stat = os.stat(self.baseFilename)
+            file_id = (stat.st_dev, stat.st_ino)
+        except FileNotFoundError:
+            file_id = None
+        if file_id is not None and file_id == self._file_id:
+            return False
+        if self.stream is not None:
+            self.stream.close()
+        self.stream = self._open()
+        self._file_id = self._open_file_id()
+        return True
+
+    def shouldRollover(self, record):
+        self._reopen_if_moved()
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        fd = os.open(f"{self.baseFilename}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # Another process may have rotated while we waited for the lock.
+            if not self._reopen_if_moved():
+                super().doRollover()
+                self._file_id = self._open_file_id()
+        finally:
+            os.close(fd)
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Writes to the current sys.stderr, which may be replaced after start-up."""
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+
+class _Pipeline:
+    """The shared queue handler and the listener thread that writes its records."""
+
+    def __init__(self):
+        self.handler = None
+        self.listener = None
+        self.levels = {}
+        self.lock = threading.Lock()
+
+    def _start_listener(self) -> None:
+        os.makedirs(os.path.dirname(LOG_FILE) or '.', exist_ok=True)
+        # File Handler - rotates log files when they reach LOG_MAX_BYTES; safe
+        # when every gunicorn worker writes the same file.
+        file_handler = SharedRotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
+        file_handler.setFormatter(
+            logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        )
+        # Console Handler
+        console_handler = _ConsoleHandler()
+        console_handler.setFormatter(
+            logging.Formatter('%(levelname)s - %(message)s')
+        )
+        self.listener = QueueListener(self.handler.queue, file_handler, console_handler, respect_handler_level=True)
+        self.listener.start()
+
+    def setup(self) -> DroppingQueueHandler:
+        if self.handler is None:
+            with self.lock:
+                if self.handler is None:
+                    self.levels = parse_log_levels(LOG_LEVELS)
+                    self.handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+                    self._start_listener()
+        return self.handler
+
+    def level_for(self, name: str, default: int) -> int:
+        while name:
+            if name in self.levels:
+                return self.levels[name]
+            name = name.rpartition('.')[0]
+        return default
+
+    def stop(self) -> None:
+        """Flush queued records and stop the listener thread."""
+        with self.lock:
+            if self.listener is not None:
+                self.listener.stop()
+                for handler in self.listener.handlers:
+                    handler.close()
+                self.listener = None
+
+    def after_fork(self) -> None:
+        # The listener thread does not survive fork; give the child its own
+        # queue and listener so records are not left in a queue nobody drains.
+        self.lock = threading.Lock()
+        if self.handler is not None:
+            self.handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+            self.listener = None
+            self._start_listener()
+
+
+_pipeline = _Pipeline()
+atexit.register(_pipeline.stop)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_pipeline.after_fork)
+
+
+def configure_logger(logger, log_level=None):
     """
-    Configure logger with file and console handlers.
+    Route a logger through the shared, non-blocking logging pipeline.
+
+    Records are put on a bounded queue and written to the rotating log file and
+    the console by a single listener thread, so file I/O and rotation never run
+    on the calling thread. Calling this more than once for the same logger is
+    harmless.
 
     Args:
         logger: Logger instance to configure
-        log_level: Logging level (default: INFO)
-    """
-    logger.setLevel(log_level)
-    
-    # Create logs directory if it doesn't exist
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-    
-    # File Handler - rotates log files when they reach 1MB
-    file_handler = RotatingFileHandler(
-        'logs/auth.log', 
-        maxBytes=1024 * 1024,  # 1MB
-        backupCount=5
-    )
-    file_handler.setFormatter(
-        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    )
-    logger.addHandler(file_handler)
-
-    # Console Handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(
-        logging.Formatter('%(levelname)s - %(message)s')
-    )
-    logger.addHandler(console_handler)
\ No newline at end of file
+        log_level: Level used when LOG_LEVELS has no entry for this logger
+            (default: LOG_LEVEL, which defaults to INFO)
+    """
+    handler = _pipeline.setup()
+    default = logging.getLevelName(LOG_LEVEL.upper()) if log_level is None else log_level
+    logger.setLevel(_pipeline.level_for(logger.name, default))
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+    # The pipeline already writes to the console, so do not pass records on to
+    # the root logger's handlers as well.
+    logger.propagate = False
+
+
+def get_dropped_count() -> int:
+    """Number of records dropped because the log queue was full."""
+    return _pipeline.handler.dropped if _pipeline.handler is not None else 0
+
+
+metrics.register_collector(lambda: [(
+    'log_records_dropped_total', 'counter', 'Log records dropped because the log queue was full.',
+    [((), get_dropped_count())]
+)])
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener. Also runs at interpreter exit."""
+    _pipeline.stop()
+
+
+_rate_limits = {}
+_rate_limits_lock = threading.Lock()
+
+
+def log_rate_limited(logger, level: int, interval: float, msg: str, *args) -> bool:
+    """
+    Log a message at most once per interval for a given logger and message format.
+
+    Use this for messages that can repeat on every request, such as warnings
+    during an upstream outage. The next message that gets through reports how
+    many were suppressed in the meantime.
+
+    Args:
+        logger: The logger to write to.
+        level (int): The logging level, e.g. logging.WARNING.
+        interval (float): Minimum seconds between logged messages.
+        msg (str): The message format string; it is also the rate-limit key.
+        *args: Arguments for the format string.
+
+    Returns:
+        bool: True if the message was logged, False if it was suppressed.
+    """
+    if not logger.isEnabledFor(level):
+        return False
+    key = (logger.name, msg)
+    now = time.monotonic()
+    with _rate_limits_lock:
+        next_allowed, suppressed = _rate_limits.get(key, (0.0, 0))
+        if now < next_allowed:
+            _rate_limits[key] = (next_allowed, suppressed + 1)
+            return False
+        _rate_limits[key] = (now + interval, 0)
+    if suppressed:
+        msg = f"{msg} ({suppressed} similar messages suppressed)"
+    logger.log(level, msg, *args)
+    return True
@@ -0,0 +1,254 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+import threading
+import time
+import weakref
+
+
+# Latency bucket upper bounds, in seconds.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard:
+    """One thread's counters and histograms. Only the owning thread writes to it."""
+
+    def __init__(self, thread: threading.Thread):
+        self.thread = weakref.ref(thread)
+        self.counters = {}
+        self.histograms = {}
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms kept per thread and merged when scraped.
+
+    Recording touches only the calling thread's shard, so the request path takes
+    no lock; the registry lock is taken once per thread (to register its shard)
+    and on each scrape. Shards of threads that have exited are folded into a
+    retired shard at scrape time so short-lived threads do not accumulate.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+        self._retired = _Shard(threading.current_thread())
+        self._descriptions = {}
+        self._collectors = []
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard(threading.current_thread())
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def describe(self, name: str, metric_type: str, help_text: str) -> None:
+        """
+        Set the TYPE and HELP lines reported for a metric.
+
+        Args:
+            name (str): The metric name.
+            metric_type (str): 'counter', 'gauge' or 'histogram'.
+            help_text (str): A one-line description.
+        """
+        self._descriptions[name] = (metric_type, help_text)
+
+    def inc(self, name: str, labels: tuple = (), value: float = 1) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name (str): The metric name.
+            labels (tuple): (label, value) pairs.
+            value (float): The amount to add.
+        """
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: tuple = ()) -> None:
+        """
+        Record one observation in a histogram.
+
+        Args:
+            name (str): The metric name.
+            value (float): The observed value, e.g. a duration in seconds.
+            labels (tuple): (label, value) pairs.
+        """
+        histograms = self._shard().histograms
+        key = (name, labels)
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        histogram[0][bisect_left(self.buckets, value)] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+    @contextmanager
+    def timer(self, name: str, labels: tuple = ()):
+        """Observe the time spent in a with block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def register_collector(self, collector) -> None:
+        """
+        Add a callable run at scrape time for values read from elsewhere, such as pool sizes.
+
+        Args:
+            collector: A callable returning an iterable of
+                (name, metric_type, help_text, [(labels, value), ...]) tuples.
+        """
+        self._collectors.append(collector)
+
+    def reset(self) -> None:
+        """Drop every recorded value. Collectors stay registered."""
+        with self._lock:
+            for shard in self._shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+            self._retired = _Shard(threading.current_thread())
+
+    def _merge_into(self, target_counters: dict, target_histograms: dict, shard: _Shard) -> None:
+        for key, value in list(shard.counters.items()):
+            target_counters[key] = target_counters.get(key, 0) + value
+        for key, (counts, total, count) in list(shard.histograms.items()):
+            merged = target_histograms.get(key)
+            if merged is None:
+                merged = target_histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+            merged[2] += count
+
+    def snapshot(self) -> tuple:
+        """
+        Merge all shards.
+
+        Returns:
+            tuple: (counters, histograms) where counters maps (name, labels) to a value
+            and histograms maps (name, labels) to [bucket_counts, sum, count].
+        """
+        with self._lock:
+            live = []
+            for shard in self._shards:
+                thread = shard.thread()
+                if thread is None or not thread.is_alive():
+                    self._merge_into(self._retired.counters, self._retired.histograms, shard)
+                else:
+                    live.append(shard)
+            self._shards = live
+            counters = {}
+            histograms = {}
+            self._merge_into(counters, histograms, self._retired)
+            for shard in live:
+                self._merge_into(counters, histograms, shard)
+        return counters, histograms
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics page.
+        """
+        counters, histograms = self.snapshot()
+        families = {}
+        for (name, labels), value in counters.items():
+            families.setdefault(name, []).append((labels, value))
+        for (name, labels), histogram in histograms.items():
+            families.setdefault(name, []).append((labels, histogram))
+        descriptions = dict(self._descriptions)
+        for collector in self._collectors:
+            for name, metric_type, help_text, samples in collector():
+                descriptions.setdefault(name, (metric_type, help_text))
+                families.setdefault(name, []).extend(samples)
+
+        lines = []
+        for name in sorted(families):
+            default_type = 'histogram' if any(key[0] == name for key in histograms) else 'counter'
+            metric_type, help_text = descriptions.get(name, (default_type, ''))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in sorted(families[name], key=lambda sample: sample[0]):
+                if metric_type == 'histogram':
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                        cumulative += bucket_count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics = MetricsRegistry()
+
+metrics.describe('http_requests_total', 'counter', 'HTTP requests by route, method and status code.')
+metrics.describe('http_request_duration_seconds', 'histogram', 'HTTP request latency by route and method.')
+metrics.describe('tmdb_requests_total', 'counter', 'TMDB HTTP attempts by endpoint and outcome.')
+metrics.describe('tmdb_request_duration_seconds', 'histogram', 'Time spent in TMDB HTTP attempts by endpoint.')
+metrics.describe('sqlite_query_duration_seconds', 'histogram', 'Time spent executing SQLite statements.')
+metrics.describe('sqlite_connection_hold_seconds', 'histogram', 'Time a pooled SQLite connection is held per checkout.')
+
+
+def register_cache(cache) -> None:
+    """
+    Report a TTLCache's counters, size and hit ratio on the metrics page.
+
+    Args:
+        cache: A cache with a stats() method, such as cache_utils.TTLCache.
+    """
+    def collect():
+        stats = cache.stats()
+        labels = (('cache', stats['name']),)
+        return [
+            ('cache_hits_total', 'counter', 'Cache lookups that found a fresh entry.', [(labels, stats['hits'])]),
+            ('cache_misses_total', 'counter', 'Cache lookups that missed or found an expired entry.', [(labels, stats['misses'])]),
+            ('cache_evictions_total', 'counter', 'Entries evicted to stay within the size limit.', [(labels, stats['evictions'])]),
+            ('cache_entries', 'gauge', 'Entries currently cached.', [(labels, stats['size'])]),
+            ('cache_hit_ratio', 'gauge', 'Hits divided by lookups since the cache was last cleared.', [(labels, stats['hit_ratio'])]),
+        ]
+    metrics.register_collector(collect)
+
+
+def register_single_flight(flight) -> None:
+    """
+    Report a SingleFlight's calls, waiters and time saved on the metrics page.
+
+    Args:
+        flight: An object with a stats() method, such as cache_utils.SingleFlight.
+    """
+    def collect():
+        stats = flight.stats()
+        labels = (('flight', stats['name']),)
+        return [
+            ('singleflight_calls_total', 'counter', 'Calls made on behalf of every concurrent caller with the same key.', [(labels, stats['calls'])]),
+            ('singleflight_waiters_total', 'counter', 'Callers that waited for and shared a call already in progress.', [(labels, stats['waiters'])]),
+            ('singleflight_saved_seconds_total', 'counter', 'Sum, over waiters, of the duration of the call each did not make.', [(labels, stats['saved_seconds'])]),
+            ('singleflight_in_flight', 'gauge', 'Calls currently in progress.', [(labels, stats['in_flight'])]),
+        ]
+    metrics.register_collector(collect)
@@ -0,0 +1,296 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+from movie_collection.db import get_users_db_connection
+from movie_collection.utils.catalog_version import CatalogVersion
+from movie_collection.utils.logger import configure_logger, log_rate_limited
+from movie_collection.utils.metrics_utils import metrics
+from movie_collection.utils.sql_utils import DB_PATH
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Every process that verifies tokens must share this key. Without it the key
+# is random: gunicorn creates it in the master so the workers share it, but
+# tokens do not survive a restart.
+SESSION_SECRET_KEY = os.getenv("SESSION_SECRET_KEY", "")
+SESSION_TTL = int(os.getenv("SESSION_TTL", "3600"))
+SESSION_SALT = "movie-collection-session"
+# Bumped whenever a session is revoked, so every worker knows when to reload
+# revocations.
+SESSION_VERSION_PATH = os.getenv("SESSION_VERSION_PATH", f"{DB_PATH}.sessions")
+# Seconds between revocation reloads while the version file cannot be read.
+SESSION_REVOCATION_RELOAD = float(os.getenv("SESSION_REVOCATION_RELOAD", "5"))
+
+metrics.describe('session_version_bumps_total', 'counter', 'Revocations recorded in the session version file.')
+
+session_version = CatalogVersion(SESSION_VERSION_PATH, metric='session_version_bumps_total')
+
+
+class RevocationStore:
+    """
+    A thread-safe, in-memory record of revoked sessions.
+
+    This is each process's copy of the revocation tables; verify_session_token
+    reloads it when session_version changes. Entries only need to outlive the
+    tokens they revoke, so anything older than max_age is pruned as new
+    entries are added.
+
+    Attributes:
+        max_age (float): Seconds an entry is kept, normally the session TTL.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._tokens = {}
+        self._users = {}
+        self._lock = threading.Lock()
+        self._next_prune = time.time() + max_age
+
+    def _prune(self, now: float) -> None:
+        if now < self._next_prune:
+            return
+        cutoff = now - self.max_age
+        self._tokens = {jti: at for jti, at in self._tokens.items() if at > cutoff}
+        self._users = {user: at for user, at in self._users.items() if at > cutoff}
+        self._next_prune = now + self.max_age
+
+    def revoke_token(self, jti: str) -> None:
+        """Revoke a single session by its token ID."""
+        now = time.time()
+        with self._lock:
+            self._tokens[jti] = now
+            self._prune(now)
+
+    def revoke_user(self, username: str) -> None:
+        """Revoke every session issued to a user up to now."""
+        now = time.time()
+        with self._lock:
+            self._users[username] = now
+            self._prune(now)
+
+    def is_revoked(self, jti: str, username: str, issued_at: float) -> bool:
+        """
+        Check whether a session has been revoked.
+
+        Args:
+            jti (str): The token ID.
+            username (str): The user the token was issued to.
+            issued_at (float): When the token was issued, as a Unix timestamp.
+
+        Returns:
+            bool: True if the token or all of the user's earlier sessions were revoked.
+        """
+        with self._lock:
+            if jti in self._tokens:
+                return True
+            revoked_at = self._users.get(username)
+        return revoked_at is not None and issued_at <= revoked_at
+
+    def load(self, tokens: dict, users: dict) -> None:
+        """
+        Replace every entry, e.g. with the rows read from the database.
+
+        Args:
+            tokens (dict): Revoked token IDs mapped to when they were revoked.
+            users (dict): Usernames mapped to when all their sessions were revoked.
+        """
+        with self._lock:
+            self._tokens = dict(tokens)
+            self._users = dict(users)
+
+    def clear(self) -> None:
+        """Forget all revocations."""
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+
+
+revocations = RevocationStore(SESSION_TTL)
+# The session_version the in-memory revocations were loaded at, and when; a
+# version miss forces a reload.
+_loaded_version = object()
+_loaded_at = 0.0
+
+
+def migrate_session_revocations() -> None:
+    """
+    Create the session revocation tables in the users database.
+
+    Must be called inside an application context.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with open(os.getenv("SQL_MIGRATE_SESSIONS_PATH", "/app/sql/migrate_session_revocations.sql"), "r") as fh:
+            migration_script = fh.read()
+        with get_users_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executescript(migration_script)
+            conn.commit()
+            logger.info("Session revocation migration complete.")
+    except sqlite3.Error as e:
+        logger.error("Database error while migrating session revocations: %s", str(e))
+        raise e
+
+
+def _sync_revocations() -> None:
+    """
+    Reload revocations from the database if any process recorded one since the last load.
+
+    Without a readable version file there is no way to tell, so revocations
+    are reloaded every SESSION_REVOCATION_RELOAD seconds instead.
+    """
+    global _loaded_version, _loaded_at
+    # Read the version before the rows: a revocation committed after this read
+    # bumps the version again, so the next call reloads.
+    version = session_version.current()
+    now = time.time()
+    if version is None:
+        log_rate_limited(logger, logging.WARNING, 3600,
+                         "Cannot read session version file %s; reloading revocations every %ss.",
+                         session_version.path, SESSION_REVOCATION_RELOAD)
+        if _loaded_version is None and now - _loaded_at < SESSION_REVOCATION_RELOAD:
+            return
+    elif version == _loaded_version:
+        return
+    cutoff = now - SESSION_TTL
+    with get_users_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT jti, revoked_at FROM session_revocations WHERE revoked_at > ?", (cutoff,))
+        tokens = dict(cursor.fetchall())
+        cursor.execute("SELECT username, revoked_at FROM user_revocations WHERE revoked_at > ?", (cutoff,))
+        users = dict(cursor.fetchall())
+    revocations.load(tokens, users)
+    _loaded_version = version
+    _loaded_at = now
+
+
+def _store_revocation(sql: str, key: str, revoked_at: float) -> None:
+    with get_users_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, (key, revoked_at))
+        cutoff = revoked_at - SESSION_TTL
+        cursor.execute("DELETE FROM session_revocations WHERE revoked_at <= ?", (cutoff,))
+        cursor.execute("DELETE FROM user_revocations WHERE revoked_at <= ?", (cutoff,))
+        conn.commit()
+    session_version.bump()
+
+_serializer = None
+_serializer_lock = threading.Lock()
+
+
+def _get_serializer() -> URLSafeTimedSerializer:
+    global _serializer
+    if _serializer is None:
+        with _serializer_lock:
+            if _serializer is None:
+                secret_key = SESSION_SECRET_KEY
+                if not secret_key:
+                    logger.warning("SESSION_SECRET_KEY is not set; using a random key that lasts until restart.")
+                    secret_key = os.urandom(32).hex()
+                _serializer = URLSafeTimedSerializer(secret_key, salt=SESSION_SALT)
+    return _serializer
+
+
+def init_session_key() -> None:
+    """Create the signing key now, so processes forked afterwards all use the same one."""
+    _get_serializer()
+
+
+def issue_session_token(username: str) -> str:
+    """
+    Issue a signed session token for a user who has just authenticated.
+
+    Args:
+        username (str): The authenticated user.
+
+    Returns:
+        str: The token, valid for SESSION_TTL seconds.
+    """
+    return _get_serializer().dumps({'sub': username, 'jti': uuid.uuid4().hex, 'iat': time.time()})
+
+
+def _load(token: str) -> dict:
+    try:
+        return _get_serializer().loads(token, max_age=SESSION_TTL)
+    except SignatureExpired:
+        raise ValueError("Session token expired")
+    except BadSignature:
+        raise ValueError("Invalid session token")
+
+
+def verify_session_token(token: str) -> str:
+    """
+    Check a session token's signature, expiry and revocation.
+
+    Revocations are checked in memory. The database is only read after some
+    process has revoked a session, which changes session_version.
+
+    Args:
+        token (str): The token from issue_session_token.
+
+    Returns:
+        str: The username the token was issued to.
+
+    Raises:
+        ValueError: If the token is malformed, tampered with, expired or revoked.
+        sqlite3.Error: If revocations cannot be read.
+    """
+    if not token:
+        raise ValueError("Invalid session token")
+    payload = _load(token)
+    _sync_revocations()
+    if revocations.is_revoked(payload['jti'], payload['sub'], payload['iat']):
+        raise ValueError("Session token revoked")
+    return payload['sub']
+
+
+def revoke_session_token(token: str) -> None:
+    """
+    Revoke one session, e.g. on logout.
+
+    Args:
+        token (str): The token to revoke.
+
+    Raises:
+        ValueError: If the token is malformed, tampered with or expired.
+        sqlite3.Error: If the revocation cannot be stored.
+    """
+    jti = _load(token)['jti']
+    _store_revocation("INSERT OR REPLACE INTO session_revocations (jti, revoked_at) VALUES (?, ?)", jti, time.time())
+    revocations.revoke_token(jti)
+
+
+def revoke_user_sessions(username: str) -> None:
+    """
+    Revoke every session issued to a user so far, e.g. after a password change.
+
+    Args:
+        username (str): The user whose sessions are revoked.
+
+    Raises:
+        sqlite3.Error: If the revocation cannot be stored.
+    """
+    _store_revocation("INSERT OR REPLACE INTO user_revocations (username, revoked_at) VALUES (?, ?)", username, time.time())
+    revocations.revoke_user(username)
+    logger.info("Revoked existing sessions for user: %s", username)
+
+
+def reset_sessions() -> None:
+    """Forget revocations and drop the serializer so the next token uses the current SESSION_SECRET_KEY."""
+    global _serializer, _loaded_version, _loaded_at
+    revocations.clear()
+    _loaded_version = object()
+    _loaded_at = 0.0
+    with _serializer_lock:
+        _serializer = None
@@ -2,8 +2,12 @@ from contextlib import contextmanager
 import logging
 import os
 import sqlite3
+import threading
+import time
+import weakref
 
 from movie_collection.utils.logger import configure_logger
+from movie_collection.utils.metrics_utils import metrics
 
 
 logger = logging.getLogger(__name__)
@@ -13,14 +17,228 @@ configure_logger(logger)
 # load the db path from the environment with a default value
 DB_PATH = os.getenv("DB_PATH", "/app/sql/movies.db")
 
+# PRAGMAs applied once when a pooled connection is opened.
+# A negative cache_size is in KiB; mmap_size is in bytes; busy_timeout in ms.
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", int(os.getenv("SQLITE_CACHE_SIZE", "-16000"))),
+    ("mmap_size", int(os.getenv("SQLITE_MMAP_SIZE", str(64 * 1024 * 1024)))),
+    ("busy_timeout", int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))),
+    ("temp_store", "MEMORY"),
+)
+# Number of compiled statements each connection keeps for reuse.
+SQLITE_STATEMENT_CACHE_SIZE = int(os.getenv("SQLITE_STATEMENT_CACHE_SIZE", "256"))
+
+
+class TimedCursor(sqlite3.Cursor):
+    """A cursor that records how long each statement takes in sqlite_query_duration_seconds."""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            metrics.observe('sqlite_query_duration_seconds', time.perf_counter() - start, (('op', 'execute'),))
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            metrics.observe('sqlite_query_duration_seconds', time.perf_counter() - start, (('op', 'executemany'),))
+
+    def executescript(self, sql_script):
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            metrics.observe('sqlite_query_duration_seconds', time.perf_counter() - start, (('op', 'executescript'),))
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    A sqlite3 connection owned by the ConnectionPool (subclassed so it can be
+    weakly referenced). Its cursors are TimedCursors.
+    """
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # The built-in shortcuts bypass cursor(), so route them through it.
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+class ConnectionPool:
+    """
+    A pool of long-lived SQLite connections, one per thread and database path.
+
+    Connections are opened once with SQLITE_PRAGMAS applied and are reused by
+    every later get_db_connection() call on the same thread. A connection whose
+    thread has exited is closed when it is garbage collected. After a fork the
+    child drops the connections inherited from its parent and opens its own.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = weakref.WeakSet()
+        self._checked_out = 0
+        self._opened = 0
+        self._pid = os.getpid()
+
+    def _open(self, db_path: str) -> PooledConnection:
+        conn = sqlite3.connect(
+            db_path,
+            factory=PooledConnection,
+            cached_statements=SQLITE_STATEMENT_CACHE_SIZE,
+            check_same_thread=False,
+        )
+        cursor = conn.cursor()
+        for name, value in SQLITE_PRAGMAS:
+            try:
+                cursor.execute(f"PRAGMA {name} = {value};")
+                cursor.fetchall()
+            except sqlite3.Error as e:
+                logger.warning("Could not apply PRAGMA %s=%s: %s", name, value, str(e))
+        cursor.close()
+        with self._lock:
+            self._connections.add(conn)
+            self._opened += 1
+        logger.debug("Opened pooled database connection to %s", db_path)
+        return conn
+
+    def _check_fork(self) -> None:
+        if os.getpid() != self._pid:
+            self.reset()
+
+    def acquire(self, db_path: str) -> sqlite3.Connection:
+        """
+        Check out the calling thread's connection to db_path, opening it if needed.
+
+        Args:
+            db_path (str): The path of the SQLite database.
+
+        Returns:
+            sqlite3.Connection: The pooled connection.
+        """
+        self._check_fork()
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+            self._local.depth = {}
+        conn = connections.get(db_path)
+        if conn is None:
+            conn = connections[db_path] = self._open(db_path)
+        self._local.depth[db_path] = self._local.depth.get(db_path, 0) + 1
+        with self._lock:
+            self._checked_out += 1
+        return conn
+
+    def release(self, db_path: str, conn: sqlite3.Connection, failed: bool = False) -> None:
+        """
+        Return a connection to the pool.
+
+        Work left uncommitted by the outermost user, or by any user that failed,
+        is rolled back so the next caller starts from a clean state.
+
+        Args:
+            db_path (str): The path the connection was acquired for.
+            conn (sqlite3.Connection): The connection returned by acquire().
+            failed (bool): Whether the caller raised while using the connection.
+        """
+        depth = self._local.depth.get(db_path, 1) - 1
+        self._local.depth[db_path] = depth
+        with self._lock:
+            self._checked_out -= 1
+        if conn.in_transaction and (failed or depth == 0):
+            try:
+                conn.rollback()
+            except sqlite3.Error as e:
+                logger.error("Rollback failed, discarding connection: %s", str(e))
+                self._local.connections.pop(db_path, None)
+
+    def reset(self) -> None:
+        """
+        Forget every pooled connection without closing it.
+
+        Used in a forked child, where the inherited connections belong to the
+        parent and must not be touched.
+        """
+        self._local = threading.local()
+        with self._lock:
+            self._connections = weakref.WeakSet()
+            self._checked_out = 0
+            self._opened = 0
+        self._pid = os.getpid()
+
+    def close_all(self) -> None:
+        """Close every connection opened by this process and empty the pool."""
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self.reset()
+
+    def stats(self) -> dict:
+        """
+        Report pool usage.
+
+        Returns:
+            dict: open connections, connections checked out right now, and connections opened in total.
+        """
+        with self._lock:
+            return {
+                'open': len(self._connections),
+                'checked_out': self._checked_out,
+                'opened_total': self._opened,
+            }
+
+
+pool = ConnectionPool()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=pool.reset)
+
+
+def get_pool_stats() -> dict:
+    """
+    Report how the SQLite connection pool is being used.
+
+    Returns:
+        dict: See ConnectionPool.stats().
+    """
+    return pool.stats()
+
+
+def _collect_pool_metrics():
+    stats = pool.stats()
+    return [
+        ('sqlite_pool_connections_open', 'gauge', 'Pooled SQLite connections open in this process.', [((), stats['open'])]),
+        ('sqlite_pool_connections_checked_out', 'gauge', 'Pooled SQLite connections in use right now.', [((), stats['checked_out'])]),
+        ('sqlite_pool_connections_opened_total', 'counter', 'SQLite connections opened by the pool.', [((), stats['opened_total'])]),
+    ]
+
+
+metrics.register_collector(_collect_pool_metrics)
+
 
 def check_database_connection():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        # This ensures the connection is actually active
-        cursor.execute("SELECT 1;")
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # This ensures the connection is actually active
+            cursor.execute("SELECT 1;")
     except sqlite3.Error as e:
         error_message = f"Database connection error: {e}"
         logger.error(error_message)
@@ -28,10 +246,9 @@ def check_database_connection():
 
 def check_table_exists(tablename: str):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
     except sqlite3.Error as e:
         error_message = f"Table check error: {e}"
         logger.error(error_message)
@@ -45,14 +262,23 @@ def check_table_exists(tablename: str):
 ###################################################
 @contextmanager
 def get_db_connection():
-    conn = None
+    db_path = DB_PATH
+    try:
+        conn = pool.acquire(db_path)
+    except sqlite3.Error as e:
+        logger.error("Database connection error: %s", str(e))
+        raise e
+    failed = False
+    start = time.perf_counter()
     try:
-        conn = sqlite3.connect(DB_PATH)
         yield conn
     except sqlite3.Error as e:
+        failed = True
         logger.error("Database connection error: %s", str(e))
         raise e
+    except BaseException:
+        failed = True
+        raise
     finally:
-        if conn:
-            conn.close()
-            logger.info("Database connection closed.")
\ No newline at end of file
+        pool.release(db_path, conn, failed)
+        metrics.observe('sqlite_connection_hold_seconds', time.perf_counter() - start)
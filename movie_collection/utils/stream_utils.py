@@ -0,0 +1,169 @@
+import codecs
+import itertools
+import json
+
+
+READ_SIZE = 64 * 1024
+# The longest single record, in characters, that iter_json_records will buffer.
+MAX_RECORD_SIZE = 1024 * 1024
+# A token cut off by the end of a chunk ('-Infinity', a '\uXXXX' escape, a
+# number's exponent) makes the decoder fail at most this far from the end.
+_MAX_SPLIT_TOKEN = len('-Infinity')
+_NUMBER_CHARS = '0123456789+-.eE'
+
+_decoder = json.JSONDecoder()
+
+
+class MalformedRecord:
+    """
+    Stands in for an NDJSON line that is not valid JSON, so one bad line
+    does not abort the rest of the stream.
+
+    Attributes:
+        error (str): Why the line could not be parsed.
+    """
+
+    def __init__(self, error: str):
+        self.error = error
+
+
+def _read_text(stream, read_size: int):
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    while True:
+        chunk = stream.read(read_size)
+        if not chunk:
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+            return
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if text:
+            yield text
+
+
+def _iter_ndjson(first: str, chunks, max_size: int):
+    buffer = ''
+    line_number = 0
+    # Set while discarding the rest of a line that was too long.
+    skipping = False
+    # The first read often holds the whole body, so split it like any other chunk.
+    for text in itertools.chain((first,), chunks):
+        buffer += text
+        *lines, buffer = buffer.split('\n')
+        for line in lines:
+            line_number += 1
+            if skipping:
+                skipping = False
+                continue
+            yield from _parse_line(line, line_number)
+        if len(buffer) > max_size:
+            if not skipping:
+                yield MalformedRecord(f"Line {line_number + 1} is longer than {max_size} characters")
+            skipping = True
+            buffer = ''
+    if buffer and not skipping:
+        yield from _parse_line(buffer, line_number + 1)
+
+
+def _parse_line(line: str, line_number: int):
+    line = line.strip()
+    if not line:
+        return
+    try:
+        yield json.loads(line)
+    except json.JSONDecodeError as e:
+        yield MalformedRecord(f"Invalid JSON on line {line_number}: {e.msg}")
+
+
+def _may_be_truncated(buffer: str, error: json.JSONDecodeError) -> bool:
+    # Input that simply stops fails at, or just before, the end of the buffer,
+    # or inside a string. An error earlier on is a syntax error that more
+    # input cannot fix.
+    return error.msg.startswith('Unterminated string') or len(buffer) - error.pos <= _MAX_SPLIT_TOKEN
+
+
+def _iter_array(first: str, chunks, max_size: int):
+    # Skip the opening bracket, then decode one element at a time so only the
+    # element currently being parsed is held in memory.
+    buffer = first[first.index('[') + 1:]
+    exhausted = False
+    expect_value = True
+    while True:
+        buffer = buffer.lstrip()
+        if not buffer:
+            if exhausted:
+                raise ValueError("Unexpected end of JSON array")
+            try:
+                buffer = next(chunks)
+            except StopIteration:
+                exhausted = True
+            continue
+        if buffer[0] == ']':
+            return
+        if not expect_value:
+            if buffer[0] != ',':
+                raise ValueError("Expected ',' or ']' between array elements")
+            buffer = buffer[1:]
+            expect_value = True
+            continue
+        try:
+            value, end = _decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            if exhausted or not _may_be_truncated(buffer, e):
+                raise ValueError(f"Invalid JSON array element: {e.msg}")
+            # Everything buffered belongs to the element being decoded.
+            if len(buffer) > max_size:
+                raise ValueError(f"JSON array element longer than {max_size} characters")
+            try:
+                buffer += next(chunks)
+            except StopIteration:
+                exhausted = True
+            continue
+        # A number at the end of the buffer, or followed only by what may be
+        # the start of its fraction or exponent, may continue in the next chunk.
+        if not exhausted and not isinstance(value, (dict, list, str)) and not buffer[end:].strip(_NUMBER_CHARS):
+            try:
+                buffer += next(chunks)
+                continue
+            except StopIteration:
+                exhausted = True
+        yield value
+        buffer = buffer[end:]
+        expect_value = False
+
+
+def iter_json_records(stream, read_size: int = READ_SIZE, max_record_size: int = MAX_RECORD_SIZE):
+    """
+    Lazily parse records from a JSON array or NDJSON body.
+
+    The format is detected from the first non-whitespace character: '[' means a
+    JSON array, anything else is treated as one JSON value per line. Memory use
+    is bounded by max_record_size, not the whole body, and a syntax error in an
+    array stops the parse without reading the rest of the body.
+
+    Args:
+        stream: A file-like object with a read(size) method returning bytes or str.
+        read_size (int): How much to read from the stream at a time.
+        max_record_size (int): The longest record accepted, in characters.
+
+    Yields:
+        The decoded records, or a MalformedRecord for each unparseable or
+        overlong NDJSON line.
+
+    Raises:
+        ValueError: If a JSON array body is malformed or has an element longer
+            than max_record_size.
+    """
+    chunks = _read_text(stream, read_size)
+    first = ''
+    for text in chunks:
+        first += text
+        if first.strip():
+            break
+    if not first.strip():
+        return
+    if first.lstrip().startswith('['):
+        yield from _iter_array(first, chunks, max_record_size)
+    else:
+        yield from _iter_ndjson(first, chunks, max_record_size)
+
@@ -0,0 +1,249 @@
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+import requests
+
+from movie_collection.utils.logger import configure_logger, log_rate_limited
+from movie_collection.utils.metrics_utils import metrics
+from movie_collection.utils.tmdb_transport import TMDB_CASSETTE_DIR, TMDB_TRANSPORT, CassetteMiss, make_adapter
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+API_KEY = os.getenv("TMDB_API_KEY", "")
+BASE_URL = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
+
+# Pool size should match the number of threads that can call TMDB at once.
+TMDB_POOL_SIZE = int(os.getenv("TMDB_POOL_SIZE", "10"))
+TMDB_CONNECT_TIMEOUT = float(os.getenv("TMDB_CONNECT_TIMEOUT", "3.05"))
+TMDB_READ_TIMEOUT = float(os.getenv("TMDB_READ_TIMEOUT", "10"))
+TMDB_MAX_RETRIES = int(os.getenv("TMDB_MAX_RETRIES", "3"))
+TMDB_BACKOFF_BASE = float(os.getenv("TMDB_BACKOFF_BASE", "0.25"))
+TMDB_BACKOFF_MAX = float(os.getenv("TMDB_BACKOFF_MAX", "4"))
+# TMDB allows roughly 40-50 requests per second per IP.
+TMDB_RATE_LIMIT = float(os.getenv("TMDB_RATE_LIMIT", "40"))
+TMDB_RATE_BURST = int(os.getenv("TMDB_RATE_BURST", "40"))
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket used to stay under an upstream rate limit.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (int): The maximum number of tokens, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError(f"Rate and capacity must be positive, got {rate} and {capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Take one token, waiting for the bucket to refill if it is empty.
+
+        Args:
+            timeout (float, optional): The longest time to wait, in seconds. Waits forever if None.
+
+        Returns:
+            bool: True if a token was taken, False if the timeout elapsed first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - now
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class TMDBClient:
+    """
+    A pooled HTTP client for the TMDB API with timeouts, retries and rate limiting.
+
+    A single requests.Session keeps connections alive across calls so each
+    request does not pay for a new TCP and TLS handshake.
+
+    The transport decides where responses come from: 'live' calls TMDB,
+    'record' calls TMDB and saves the responses to cassette_dir, and 'replay'
+    answers from cassette_dir without touching the network. Replayed requests
+    are not rate limited.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        api_key: str = API_KEY,
+        pool_size: int = TMDB_POOL_SIZE,
+        connect_timeout: float = TMDB_CONNECT_TIMEOUT,
+        read_timeout: float = TMDB_READ_TIMEOUT,
+        max_retries: int = TMDB_MAX_RETRIES,
+        backoff_base: float = TMDB_BACKOFF_BASE,
+        backoff_max: float = TMDB_BACKOFF_MAX,
+        rate_limit: float = TMDB_RATE_LIMIT,
+        rate_burst: int = TMDB_RATE_BURST,
+        transport: str = TMDB_TRANSPORT,
+        cassette_dir: str = TMDB_CASSETTE_DIR,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.transport = transport
+        self.limiter = None if transport == 'replay' else TokenBucket(rate_limit, rate_burst)
+
+        self.session = requests.Session()
+        adapter = make_adapter(transport, pool_size, cassette_dir)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _backoff(self, attempt: int, response=None) -> float:
+        """
+        Compute the delay before the next attempt using full jitter.
+
+        A numeric Retry-After header from TMDB takes precedence, capped at backoff_max.
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(self.backoff_max, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _send(self, url: str, params: dict, endpoint_label: tuple):
+        """Send one HTTP attempt, recording its duration and outcome in the metrics."""
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            outcome = str(response.status_code)
+            return response
+        except requests.exceptions.Timeout:
+            outcome = 'timeout'
+            raise
+        finally:
+            metrics.observe('tmdb_request_duration_seconds', time.perf_counter() - start, endpoint_label)
+            metrics.inc('tmdb_requests_total', endpoint_label + (('outcome', outcome),))
+
+    def get(self, endpoint: str, params: dict = None) -> dict:
+        """
+        Send a GET request to a TMDB endpoint and decode the JSON response.
+
+        Args:
+            endpoint (str): The request path relative to the base URL, e.g. '/search/movie'.
+            params (dict, optional): Query parameters, excluding the API key.
+
+        Returns:
+            dict: The decoded JSON response.
+
+        Raises:
+            RuntimeError: If the request times out, fails, returns a body that is not JSON,
+                or keeps returning a retryable status after all retries, or in replay mode
+                if nothing was recorded for it.
+        """
+        url = f"{self.base_url}{endpoint}"
+        params = dict(params or {})
+        params['api_key'] = self.api_key
+        # Collapse IDs so metrics have one series per endpoint, not per movie.
+        endpoint_label = (('endpoint', re.sub(r'/\d+', '/{id}', endpoint)),)
+
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                response = self._send(url, params, endpoint_label)
+            except CassetteMiss as e:
+                logger.error("%s", str(e))
+                raise RuntimeError(f"Request to TMDB failed: {e}")
+            except requests.exceptions.Timeout:
+                if attempt >= self.max_retries:
+                    logger.error("Request to TMDB timed out: %s", endpoint)
+                    raise RuntimeError("Request to TMDB timed out.")
+                response = None
+            except requests.exceptions.RequestException as e:
+                if attempt >= self.max_retries:
+                    logger.error("Request to TMDB failed: %s", str(e))
+                    raise RuntimeError(f"Request to TMDB failed: {e}")
+                response = None
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    try:
+                        return response.json()
+                    except ValueError:
+                        logger.error("TMDB returned a non-JSON response with status %s for %s", response.status_code, endpoint)
+                        raise RuntimeError(f"Request to TMDB failed with status {response.status_code}: response is not JSON")
+                if attempt >= self.max_retries:
+                    logger.error("TMDB returned %s for %s after %d retries", response.status_code, endpoint, attempt)
+                    raise RuntimeError(f"Request to TMDB failed with status {response.status_code}")
+
+            delay = self._backoff(attempt, response)
+            attempt += 1
+            log_rate_limited(logger, logging.WARNING, 5, "Retrying TMDB request %s in %.2fs (attempt %d)", endpoint, delay, attempt)
+            time.sleep(delay)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_tmdb_client() -> TMDBClient:
+    """
+    Get the process-wide TMDB client, creating it on first use.
+
+    Returns:
+        TMDBClient: The shared client.
+    """
+    global _client
+    client = _client
+    if client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TMDBClient()
+            client = _client
+    return client
+
+
+def reset_tmdb_client() -> None:
+    """
+    Discard the shared client so the next call builds a fresh one.
+
+    Call this in a child process after fork so it does not reuse the parent's
+    sockets. The old session is dropped rather than closed, since its sockets
+    still belong to the parent.
+    """
+    global _client
+    with _client_lock:
+        _client = None
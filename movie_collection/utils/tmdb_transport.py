@@ -0,0 +1,226 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from movie_collection.utils.logger import configure_logger
+from movie_collection.utils.metrics_utils import metrics
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# live: call TMDB. record: call TMDB and save each response to the cassette
+# directory. replay: answer only from the cassette directory, never the network.
+TMDB_TRANSPORT = os.getenv("TMDB_TRANSPORT", "live").lower()
+TMDB_CASSETTE_DIR = os.getenv("TMDB_CASSETTE_DIR", "tmdb_cassettes")
+# Delay added to each replayed response: seconds, or "recorded" to reuse the
+# time the original request took.
+TMDB_REPLAY_LATENCY = os.getenv("TMDB_REPLAY_LATENCY", "0")
+TMDB_REPLAY_JITTER = float(os.getenv("TMDB_REPLAY_JITTER", "0"))
+
+TRANSPORTS = ('live', 'record', 'replay')
+
+# Query parameters left out of cassette keys so recordings work with any API key.
+IGNORED_PARAMS = frozenset({'api_key'})
+
+metrics.describe('tmdb_cassette_requests_total', 'counter', 'TMDB requests answered or saved by the cassette store, by result.')
+
+
+class CassetteMiss(requests.exceptions.RequestException):
+    """Raised in replay mode when no response was recorded for a request."""
+
+
+def cassette_key(method: str, url: str) -> str:
+    """
+    Build the key a request is stored under.
+
+    Only the path and the sorted query parameters count, so the same request
+    made against another host or with another API key finds the same recording.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The full request URL.
+
+    Returns:
+        str: A hex digest.
+    """
+    parts = urlsplit(url)
+    params = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                    if name not in IGNORED_PARAMS)
+    return hashlib.sha256(json.dumps([method.upper(), parts.path, params]).encode()).hexdigest()
+
+
+class CassetteStore:
+    """
+    Recorded TMDB responses, one JSON file per request.
+
+    Files are written atomically, so a directory can be recorded into while
+    another process replays from it. Entries are cached in memory once read.
+
+    Attributes:
+        directory (str): Where the cassette files live.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> dict:
+        """
+        Look up a recording.
+
+        Args:
+            key (str): From cassette_key().
+
+        Returns:
+            dict: The entry written by put(), or None if there is none.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        try:
+            with open(self._path(key), 'r') as fh:
+                entry = json.load(fh)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """
+        Save a recording, replacing any earlier one for the same key.
+
+        Args:
+            key (str): From cassette_key().
+            entry (dict): method, path, params, status, body, elapsed and recorded_at.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w') as fh:
+            json.dump(entry, fh, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._entries[key] = entry
+
+
+def _entry_for(request, response) -> dict:
+    parts = urlsplit(request.url)
+    return {
+        'method': request.method,
+        'path': parts.path,
+        'params': sorted([name, value] for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                         if name not in IGNORED_PARAMS),
+        'status': response.status_code,
+        'body': response.text,
+        'elapsed': response.elapsed.total_seconds(),
+        'recorded_at': time.time(),
+    }
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Sends requests to TMDB as usual and saves every final response.
+
+    Throttling and server errors (429 and 5xx) are not saved, since the
+    client retries them and replaying them would only replay the outage.
+    """
+
+    def __init__(self, store: CassetteStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code != 429 and response.status_code < 500:
+            self.store.put(cassette_key(request.method, request.url), _entry_for(request, response))
+            metrics.inc('tmdb_cassette_requests_total', (('result', 'recorded'),))
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Answers requests from a CassetteStore without opening any connection.
+
+    Attributes:
+        latency: Seconds added to each response, or 'recorded' to reuse the
+            time the original request took.
+        jitter (float): Extra random delay of up to this many seconds.
+    """
+
+    def __init__(self, store: CassetteStore, latency='0', jitter: float = 0.0):
+        super().__init__()
+        self.store = store
+        self.latency = latency if latency == 'recorded' else float(latency)
+        self.jitter = jitter
+
+    def send(self, request, **kwargs):
+        key = cassette_key(request.method, request.url)
+        entry = self.store.get(key)
+        if entry is None:
+            metrics.inc('tmdb_cassette_requests_total', (('result', 'miss'),))
+            raise CassetteMiss(f"No recorded TMDB response for {request.method} {urlsplit(request.url).path}",
+                               request=request)
+        metrics.inc('tmdb_cassette_requests_total', (('result', 'hit'),))
+
+        delay = entry.get('elapsed', 0.0) if self.latency == 'recorded' else self.latency
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = 'Replayed'
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+        response._content = entry['body'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def make_adapter(transport: str, pool_size: int, cassette_dir: str = TMDB_CASSETTE_DIR) -> BaseAdapter:
+    """
+    Build the adapter the TMDB session sends requests through.
+
+    Args:
+        transport (str): 'live', 'record' or 'replay'.
+        pool_size (int): Connections kept per host by live and record adapters.
+        cassette_dir (str): Where recordings are read and written.
+
+    Returns:
+        BaseAdapter: The adapter to mount on the session.
+
+    Raises:
+        ValueError: If the transport is unknown.
+    """
+    pool_options = {'pool_connections': 1, 'pool_maxsize': pool_size, 'max_retries': 0, 'pool_block': True}
+    if transport == 'live':
+        return HTTPAdapter(**pool_options)
+    if transport == 'record':
+        logger.info("Recording TMDB responses to %s", cassette_dir)
+        return RecordingAdapter(CassetteStore(cassette_dir), **pool_options)
+    if transport == 'replay':
+        logger.info("Replaying TMDB responses from %s; TMDB will not be called", cassette_dir)
+        return ReplayAdapter(CassetteStore(cassette_dir), TMDB_REPLAY_LATENCY, TMDB_REPLAY_JITTER)
+    raise ValueError(f"Unknown TMDB transport: '{transport}'. Expected one of {', '.join(TRANSPORTS)}")
@@ -25,7 +25,7 @@ done
 # Function to check the health of the service
 check_health() {
   echo "Checking health status..."
-  curl -s -X GET "$BASE_URL/api/health" | grep -q '"status": "healthy"'
+  curl -s -X GET "$BASE_URL/api/health" | grep -q '"status": *"healthy"'
   if [ $? -eq 0 ]; then
     echo "Service is healthy."
   else
@@ -37,7 +37,7 @@ check_health() {
 # Function to check the database connection
 check_db() {
   echo "Checking database connection..."
-  curl -s -X GET "$BASE_URL/api/db-check" | grep -q '"database_status": "healthy"'
+  curl -s -X GET "$BASE_URL/api/db-check" | grep -q '"database_status": *"healthy"'
   if [ $? -eq 0 ]; then
     echo "Database connection is healthy."
   else
@@ -58,7 +58,7 @@ create_account() {
 
   echo "Creating New Account..."
   curl -s -X POST "$BASE_URL/create-account" -H "Content-Type: application/json" \
-    -d "{\"username\":\"$username\", \"password\":\"$password\"}" | grep -q '"status": "success"'
+    -d "{\"username\":\"$username\", \"password\":\"$password\"}" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Account created successfully."
   else
@@ -73,7 +73,7 @@ login() {
 
   echo "Logging in..."
   curl -s -X POST "$BASE_URL/login" -H "Content-Type: application/json" \
-    -d "{\"username\":\"$username\", \"password\":\"$password\"}" | grep -q '"status": "success"'
+    -d "{\"username\":\"$username\", \"password\":\"$password\"}" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Login successfully."
   else
@@ -89,7 +89,7 @@ update_password() {
 
   echo "Logging in..."
   curl -s -X POST "$BASE_URL/update-password" -H "Content-Type: application/json" \
-    -d "{\"username\":\"$username\", \"old_password\":\"$old_password\", \"new_password\":\"$new_password\"}" | grep -q '"status": "success"'
+    -d "{\"username\":\"$username\", \"old_password\":\"$old_password\", \"new_password\":\"$new_password\"}" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Password updated successfully."
   else
@@ -109,7 +109,7 @@ search_by_name(){
 
   echo "Searching by name..."
   curl -s -X POST "$BASE_URL/movies/search-by-name" -H "Content-Type: application/json" \
-    -d "{\"name\":\"$name\"}" | grep -q '"status": "success"'
+    -d "{\"name\":\"$name\"}" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Movie retrived successfully."
   else
@@ -123,7 +123,7 @@ search_by_year(){
 
   echo "Searching by year..."
   curl -s -X POST "$BASE_URL/movies/search-by-year" -H "Content-Type: application/json" \
-    -d "{\"year\":$year}" | grep -q '"status": "success"'
+    -d "{\"year\":$year}" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Movie retrived successfully."
   else
@@ -137,7 +137,7 @@ search_by_language(){
 
   echo "Searching by language..."
   curl -s -X POST "$BASE_URL/movies/search-by-language" -H "Content-Type: application/json" \
-    -d "{\"language_code\":\"$language_code\"}" | grep -q '"status": "success"'
+    -d "{\"language_code\":\"$language_code\"}" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Movie retrived successfully."
   else
@@ -151,7 +151,7 @@ search_by_director(){
 
   echo "Searching by director..."
   curl -s -X POST "$BASE_URL/movies/search-by-director" -H "Content-Type: application/json" \
-    -d "{\"director\":\"$director\"}" | grep -q '"status": "success"'
+    -d "{\"director\":\"$director\"}" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Movie retrived successfully."
   else
@@ -165,7 +165,7 @@ search_by_genre(){
 
   echo "Searching by genre..."
   curl -s -X POST "$BASE_URL/movies/search-by-genre" -H "Content-Type: application/json" \
-    -d "{\"genre_id\":\"$genre_id\"}" | grep -q '"status": "success"'
+    -d "{\"genre_id\":\"$genre_id\"}" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Movie retrived successfully."
   else
@@ -185,7 +185,7 @@ add_movie_to_list()
 
   echo "Adding Movie to the database..."
   curl -s -X POST "$BASE_URL/movies/add-to-list" -H "Content-Type: application/json" \
-    -d "{\"name\":\"$name\", \"year\":\"$year\", \"language_code\":\"$language_code\", \"director\":\"$director\", \"genres\":\"$genres\", \"favorite\":\"$favorite\"}" | grep -q '"status": "success"'
+    -d "{\"name\":\"$name\", \"year\":\"$year\", \"language_code\":\"$language_code\", \"director\":\"$director\", \"genres\":\"$genres\", \"favorite\":\"$favorite\"}" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Movie added successfully."
   else
@@ -200,7 +200,7 @@ delete_movie_from_list()
 
   echo "Deleting Movie from the database..."
   curl -s -X DELETE "$BASE_URL/movies/delete-from-list" -H "Content-Type: application/json" \
-    -d "{\"movie_id\":\"$movie_id\"}" | grep -q '"status": "success"'
+    -d "{\"movie_id\":\"$movie_id\"}" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Movie deleted successfully."
   else
@@ -212,7 +212,7 @@ delete_movie_from_list()
 clear_movie_list()
 {
   echo "Clearing movie database..."
-  curl -s -X DELETE "$BASE_URL/movies/clear-list" | grep -q '"status": "success"'
+  curl -s -X DELETE "$BASE_URL/movies/clear-list" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Database is now empty."
   else
@@ -226,7 +226,7 @@ mark_movie_as_favorite()
   name=$1
   echo "Clearing movie database..."
   curl -s -X POST "$BASE_URL/movies/mark-as-favorite" -H "Content-Type: application/json" \
-    -d "{\"name\":\"$name\"}" | grep -q '"status": "success"'
+    -d "{\"name\":\"$name\"}" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "This movie is marked as favorite."
   else
@@ -238,7 +238,7 @@ mark_movie_as_favorite()
 list_favorite_movies()
 {
   echo "Retrieving favorite movies..."
-  curl -s -X GET "$BASE_URL/movies/list-favorite" | grep -q '"status": "success"'
+  curl -s -X GET "$BASE_URL/movies/list-favorite" | grep -q '"status": *"success"'
   if [ $? -eq 0 ]; then
     echo "Favorite movie retrived successfully."
   else
@@ -11,4 +11,6 @@ else
     # Create the database for the first time
     sqlite3 "$DB_PATH" < /app/sql/create_movie_table.sql
     echo "Database created successfully."
-fi
\ No newline at end of file
+fi
+# The catalog changed outside the app: drop the version file so cached reads revalidate.
+rm -f "${CATALOG_VERSION_PATH:-$DB_PATH.version}"
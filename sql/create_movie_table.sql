@@ -1,3 +1,8 @@
+DROP TABLE IF EXISTS movie_sample_slots;
+DROP TABLE IF EXISTS movie_sample_buckets;
+DROP TABLE IF EXISTS movie_sample_removals;
+DROP TABLE IF EXISTS movie_genres;
+DROP TABLE IF EXISTS movies_fts;
 DROP TABLE IF EXISTS movies;
 CREATE TABLE movies (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -9,3 +14,201 @@ CREATE TABLE movies (
     favorite BOOLEAN DEFAULT FALSE,
     deleted BOOLEAN DEFAULT FALSE
 );
+
+-- Composite indexes for /movies/list: each equality filter is followed by id
+-- so keyset pagination (id > cursor ORDER BY id) is a single index seek.
+CREATE INDEX idx_movies_deleted ON movies (deleted, id);
+CREATE INDEX idx_movies_year ON movies (deleted, year, id);
+CREATE INDEX idx_movies_director ON movies (director, deleted, id);
+CREATE INDEX idx_movies_language ON movies (original_language, deleted, id);
+CREATE INDEX idx_movies_favorite ON movies (favorite, deleted, id);
+
+-- Partial index holding only live favorites, in ID order with their names,
+-- for /movies/list-favorite pages.
+CREATE INDEX idx_movies_favorite_live ON movies (id, name) WHERE favorite = TRUE AND deleted = FALSE;
+
+-- Full-text index over live (non-deleted) movies. External content: the text
+-- lives in movies and the triggers below keep the index in sync, including
+-- soft deletes and restores.
+CREATE VIRTUAL TABLE movies_fts USING fts5(
+    name,
+    director,
+    content='movies',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER movies_fts_insert AFTER INSERT ON movies WHEN NEW.deleted = FALSE BEGIN
+    INSERT INTO movies_fts (rowid, name, director) VALUES (NEW.id, NEW.name, NEW.director);
+END;
+
+CREATE TRIGGER movies_fts_update AFTER UPDATE OF name, director, deleted ON movies BEGIN
+    INSERT INTO movies_fts (movies_fts, rowid, name, director)
+    SELECT 'delete', OLD.id, OLD.name, OLD.director WHERE OLD.deleted = FALSE;
+    INSERT INTO movies_fts (rowid, name, director)
+    SELECT NEW.id, NEW.name, NEW.director WHERE NEW.deleted = FALSE;
+END;
+
+CREATE TRIGGER movies_fts_delete AFTER DELETE ON movies WHEN OLD.deleted = FALSE BEGIN
+    INSERT INTO movies_fts (movies_fts, rowid, name, director) VALUES ('delete', OLD.id, OLD.name, OLD.director);
+END;
+
+CREATE TABLE IF NOT EXISTS genres (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_genres_name ON genres (name COLLATE NOCASE);
+
+-- One row per (movie, genre); the primary key serves lookups by movie and
+-- idx_movie_genres_genre serves lookups by genre.
+CREATE TABLE movie_genres (
+    movie_id INTEGER NOT NULL REFERENCES movies(id),
+    genre_id INTEGER NOT NULL REFERENCES genres(id),
+    PRIMARY KEY (movie_id, genre_id)
+) WITHOUT ROWID;
+CREATE INDEX idx_movie_genres_genre ON movie_genres (genre_id, movie_id);
+
+-- Dense random-sampling index over live movies. Each bucket ('all',
+-- 'year:2001', 'language:en', 'genre:28') numbers its movies 0..size-1 in
+-- movie_sample_slots, so a uniform random pick is one primary key lookup.
+-- Removing a movie moves the bucket's last slot into the freed one, keeping
+-- the numbering dense; movie_sample_removals is scratch space for that.
+CREATE TABLE movie_sample_buckets (
+    bucket TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+);
+
+CREATE TABLE movie_sample_slots (
+    bucket TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    movie_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, slot)
+) WITHOUT ROWID;
+CREATE INDEX idx_movie_sample_slots_movie ON movie_sample_slots (movie_id);
+
+CREATE TABLE movie_sample_removals (
+    bucket TEXT PRIMARY KEY
+);
+
+CREATE TRIGGER movie_sample_insert AFTER INSERT ON movies WHEN NEW.deleted = FALSE BEGIN
+    INSERT OR IGNORE INTO movie_sample_buckets (bucket, size)
+    VALUES ('all', 0), ('year:' || NEW.year, 0), ('language:' || lower(trim(NEW.original_language)), 0);
+    INSERT INTO movie_sample_slots (bucket, slot, movie_id)
+    SELECT bucket, size, NEW.id FROM movie_sample_buckets
+    WHERE bucket IN ('all', 'year:' || NEW.year, 'language:' || lower(trim(NEW.original_language)));
+    UPDATE movie_sample_buckets SET size = size + 1
+    WHERE bucket IN ('all', 'year:' || NEW.year, 'language:' || lower(trim(NEW.original_language)));
+END;
+
+CREATE TRIGGER movie_sample_update AFTER UPDATE OF year, original_language, deleted ON movies BEGIN
+    INSERT INTO movie_sample_removals (bucket) SELECT bucket FROM movie_sample_slots WHERE movie_id = OLD.id;
+    UPDATE movie_sample_slots SET movie_id = (
+        SELECT last.movie_id FROM movie_sample_buckets AS b
+        JOIN movie_sample_slots AS last ON last.bucket = b.bucket AND last.slot = b.size - 1
+        WHERE b.bucket = movie_sample_slots.bucket
+    ) WHERE movie_id = OLD.id;
+    DELETE FROM movie_sample_slots WHERE (bucket, slot) IN (
+        SELECT b.bucket, b.size - 1 FROM movie_sample_removals AS r CROSS JOIN movie_sample_buckets AS b ON b.bucket = r.bucket
+    );
+    UPDATE movie_sample_buckets SET size = size - 1 WHERE bucket IN (SELECT bucket FROM movie_sample_removals);
+    DELETE FROM movie_sample_removals;
+
+    INSERT OR IGNORE INTO movie_sample_buckets (bucket, size)
+    SELECT bucket, 0 FROM (
+        SELECT 'all' AS bucket UNION SELECT 'year:' || NEW.year UNION SELECT 'language:' || lower(trim(NEW.original_language))
+        UNION SELECT 'genre:' || genre_id FROM movie_genres WHERE movie_id = NEW.id
+    ) WHERE NEW.deleted = FALSE;
+    INSERT INTO movie_sample_slots (bucket, slot, movie_id)
+    SELECT bucket, size, NEW.id FROM movie_sample_buckets
+    WHERE NEW.deleted = FALSE AND bucket IN (
+        SELECT 'all' UNION SELECT 'year:' || NEW.year UNION SELECT 'language:' || lower(trim(NEW.original_language))
+        UNION SELECT 'genre:' || genre_id FROM movie_genres WHERE movie_id = NEW.id
+    );
+    UPDATE movie_sample_buckets SET size = size + 1
+    WHERE NEW.deleted = FALSE AND bucket IN (
+        SELECT 'all' UNION SELECT 'year:' || NEW.year UNION SELECT 'language:' || lower(trim(NEW.original_language))
+        UNION SELECT 'genre:' || genre_id FROM movie_genres WHERE movie_id = NEW.id
+    );
+END;
+
+CREATE TRIGGER movie_sample_delete AFTER DELETE ON movies BEGIN
+    INSERT INTO movie_sample_removals (bucket) SELECT bucket FROM movie_sample_slots WHERE movie_id = OLD.id;
+    UPDATE movie_sample_slots SET movie_id = (
+        SELECT last.movie_id FROM movie_sample_buckets AS b
+        JOIN movie_sample_slots AS last ON last.bucket = b.bucket AND last.slot = b.size - 1
+        WHERE b.bucket = movie_sample_slots.bucket
+    ) WHERE movie_id = OLD.id;
+    DELETE FROM movie_sample_slots WHERE (bucket, slot) IN (
+        SELECT b.bucket, b.size - 1 FROM movie_sample_removals AS r CROSS JOIN movie_sample_buckets AS b ON b.bucket = r.bucket
+    );
+    UPDATE movie_sample_buckets SET size = size - 1 WHERE bucket IN (SELECT bucket FROM movie_sample_removals);
+    DELETE FROM movie_sample_removals;
+END;
+
+CREATE TRIGGER movie_sample_genre_insert AFTER INSERT ON movie_genres
+WHEN EXISTS (SELECT 1 FROM movies WHERE id = NEW.movie_id AND deleted = FALSE) BEGIN
+    INSERT OR IGNORE INTO movie_sample_buckets (bucket, size) VALUES ('genre:' || NEW.genre_id, 0);
+    INSERT INTO movie_sample_slots (bucket, slot, movie_id)
+    SELECT bucket, size, NEW.movie_id FROM movie_sample_buckets WHERE bucket = 'genre:' || NEW.genre_id;
+    UPDATE movie_sample_buckets SET size = size + 1 WHERE bucket = 'genre:' || NEW.genre_id;
+END;
+
+CREATE TRIGGER movie_sample_genre_delete AFTER DELETE ON movie_genres BEGIN
+    INSERT INTO movie_sample_removals (bucket)
+    SELECT bucket FROM movie_sample_slots WHERE movie_id = OLD.movie_id AND bucket = 'genre:' || OLD.genre_id;
+    UPDATE movie_sample_slots SET movie_id = (
+        SELECT last.movie_id FROM movie_sample_buckets AS b
+        JOIN movie_sample_slots AS last ON last.bucket = b.bucket AND last.slot = b.size - 1
+        WHERE b.bucket = movie_sample_slots.bucket
+    ) WHERE movie_id = OLD.movie_id AND bucket = 'genre:' || OLD.genre_id;
+    DELETE FROM movie_sample_slots WHERE (bucket, slot) IN (
+        SELECT b.bucket, b.size - 1 FROM movie_sample_removals AS r CROSS JOIN movie_sample_buckets AS b ON b.bucket = r.bucket
+    );
+    UPDATE movie_sample_buckets SET size = size - 1 WHERE bucket IN (SELECT bucket FROM movie_sample_removals);
+    DELETE FROM movie_sample_removals;
+END;
+
+-- Local mirror of TMDB discover results, kept across catalog clears.
+CREATE TABLE IF NOT EXISTS tmdb_mirror (
+    tmdb_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    release_date TEXT,
+    original_language TEXT NOT NULL,
+    genre_ids TEXT NOT NULL,
+    director TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+
+-- A slice is one mirrored discover query, e.g. 'year:2001', 'genre:28' or
+-- 'language:fr'; members lists the TMDB movies it returned.
+CREATE TABLE IF NOT EXISTS tmdb_mirror_slices (
+    slice TEXT PRIMARY KEY,
+    movie_count INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tmdb_mirror_members (
+    slice TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    tmdb_id INTEGER NOT NULL REFERENCES tmdb_mirror(tmdb_id),
+    PRIMARY KEY (slice, position)
+) WITHOUT ROWID;
+
+-- TMDB people that find_movie_by_director resolved, by normalized director
+-- name, and their filmographies; kept across catalog clears like the mirror.
+CREATE TABLE IF NOT EXISTS tmdb_directors (
+    name TEXT PRIMARY KEY,
+    person_id INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+
+-- The movies each of those people directed, from /person/{id}/movie_credits.
+CREATE TABLE IF NOT EXISTS tmdb_director_movies (
+    person_id INTEGER NOT NULL,
+    tmdb_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    release_date TEXT,
+    original_language TEXT NOT NULL,
+    genre_ids TEXT NOT NULL,
+    PRIMARY KEY (person_id, tmdb_id)
+) WITHOUT ROWID;
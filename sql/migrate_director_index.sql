@@ -0,0 +1,18 @@
+-- Adds the director lookup tables to an existing database. Safe to run more than once.
+-- TMDB people that find_movie_by_director resolved, by normalized director name.
+CREATE TABLE IF NOT EXISTS tmdb_directors (
+    name TEXT PRIMARY KEY,
+    person_id INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+
+-- The movies each of those people directed, from /person/{id}/movie_credits.
+CREATE TABLE IF NOT EXISTS tmdb_director_movies (
+    person_id INTEGER NOT NULL,
+    tmdb_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    release_date TEXT,
+    original_language TEXT NOT NULL,
+    genre_ids TEXT NOT NULL,
+    PRIMARY KEY (person_id, tmdb_id)
+) WITHOUT ROWID;
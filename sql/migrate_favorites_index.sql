@@ -0,0 +1,3 @@
+-- Adds the partial index of live favorites used by /movies/list-favorite to an
+-- existing database. Safe to run more than once.
+CREATE INDEX IF NOT EXISTS idx_movies_favorite_live ON movies (id, name) WHERE favorite = TRUE AND deleted = FALSE;
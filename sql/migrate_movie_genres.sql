@@ -0,0 +1,31 @@
+-- Adds the movie_genres join table to an existing database and backfills it
+-- from the comma-joined movies.genres column. Safe to run more than once.
+-- Genre names are resolved through the genres table, so store the genre map
+-- first (see migrate_movie_genres() in movie_model).
+CREATE TABLE IF NOT EXISTS genres (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_genres_name ON genres (name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS movie_genres (
+    movie_id INTEGER NOT NULL REFERENCES movies(id),
+    genre_id INTEGER NOT NULL REFERENCES genres(id),
+    PRIMARY KEY (movie_id, genre_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_movie_genres_genre ON movie_genres (genre_id, movie_id);
+
+WITH RECURSIVE split(movie_id, genre, rest) AS (
+    SELECT id, '', genres || ', ' FROM movies
+    UNION ALL
+    SELECT movie_id,
+           substr(rest, 1, instr(rest, ', ') - 1),
+           substr(rest, instr(rest, ', ') + 2)
+    FROM split
+    WHERE rest <> ''
+)
+INSERT OR IGNORE INTO movie_genres (movie_id, genre_id)
+SELECT split.movie_id, genres.id
+FROM split
+JOIN genres ON genres.name = split.genre COLLATE NOCASE
+WHERE split.genre <> '';
@@ -0,0 +1,114 @@
+-- Adds the movie_sample_* random-sampling index and its triggers to an
+-- existing database (after migrate_movie_genres.sql) and rebuilds the index
+-- from the live movies. Safe to run more than once.
+CREATE TABLE IF NOT EXISTS movie_sample_buckets (
+    bucket TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS movie_sample_slots (
+    bucket TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    movie_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, slot)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_movie_sample_slots_movie ON movie_sample_slots (movie_id);
+
+CREATE TABLE IF NOT EXISTS movie_sample_removals (
+    bucket TEXT PRIMARY KEY
+);
+
+CREATE TRIGGER IF NOT EXISTS movie_sample_insert AFTER INSERT ON movies WHEN NEW.deleted = FALSE BEGIN
+    INSERT OR IGNORE INTO movie_sample_buckets (bucket, size)
+    VALUES ('all', 0), ('year:' || NEW.year, 0), ('language:' || lower(trim(NEW.original_language)), 0);
+    INSERT INTO movie_sample_slots (bucket, slot, movie_id)
+    SELECT bucket, size, NEW.id FROM movie_sample_buckets
+    WHERE bucket IN ('all', 'year:' || NEW.year, 'language:' || lower(trim(NEW.original_language)));
+    UPDATE movie_sample_buckets SET size = size + 1
+    WHERE bucket IN ('all', 'year:' || NEW.year, 'language:' || lower(trim(NEW.original_language)));
+END;
+
+CREATE TRIGGER IF NOT EXISTS movie_sample_update AFTER UPDATE OF year, original_language, deleted ON movies BEGIN
+    INSERT INTO movie_sample_removals (bucket) SELECT bucket FROM movie_sample_slots WHERE movie_id = OLD.id;
+    UPDATE movie_sample_slots SET movie_id = (
+        SELECT last.movie_id FROM movie_sample_buckets AS b
+        JOIN movie_sample_slots AS last ON last.bucket = b.bucket AND last.slot = b.size - 1
+        WHERE b.bucket = movie_sample_slots.bucket
+    ) WHERE movie_id = OLD.id;
+    DELETE FROM movie_sample_slots WHERE (bucket, slot) IN (
+        SELECT b.bucket, b.size - 1 FROM movie_sample_removals AS r CROSS JOIN movie_sample_buckets AS b ON b.bucket = r.bucket
+    );
+    UPDATE movie_sample_buckets SET size = size - 1 WHERE bucket IN (SELECT bucket FROM movie_sample_removals);
+    DELETE FROM movie_sample_removals;
+
+    INSERT OR IGNORE INTO movie_sample_buckets (bucket, size)
+    SELECT bucket, 0 FROM (
+        SELECT 'all' AS bucket UNION SELECT 'year:' || NEW.year UNION SELECT 'language:' || lower(trim(NEW.original_language))
+        UNION SELECT 'genre:' || genre_id FROM movie_genres WHERE movie_id = NEW.id
+    ) WHERE NEW.deleted = FALSE;
+    INSERT INTO movie_sample_slots (bucket, slot, movie_id)
+    SELECT bucket, size, NEW.id FROM movie_sample_buckets
+    WHERE NEW.deleted = FALSE AND bucket IN (
+        SELECT 'all' UNION SELECT 'year:' || NEW.year UNION SELECT 'language:' || lower(trim(NEW.original_language))
+        UNION SELECT 'genre:' || genre_id FROM movie_genres WHERE movie_id = NEW.id
+    );
+    UPDATE movie_sample_buckets SET size = size + 1
+    WHERE NEW.deleted = FALSE AND bucket IN (
+        SELECT 'all' UNION SELECT 'year:' || NEW.year UNION SELECT 'language:' || lower(trim(NEW.original_language))
+        UNION SELECT 'genre:' || genre_id FROM movie_genres WHERE movie_id = NEW.id
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS movie_sample_delete AFTER DELETE ON movies BEGIN
+    INSERT INTO movie_sample_removals (bucket) SELECT bucket FROM movie_sample_slots WHERE movie_id = OLD.id;
+    UPDATE movie_sample_slots SET movie_id = (
+        SELECT last.movie_id FROM movie_sample_buckets AS b
+        JOIN movie_sample_slots AS last ON last.bucket = b.bucket AND last.slot = b.size - 1
+        WHERE b.bucket = movie_sample_slots.bucket
+    ) WHERE movie_id = OLD.id;
+    DELETE FROM movie_sample_slots WHERE (bucket, slot) IN (
+        SELECT b.bucket, b.size - 1 FROM movie_sample_removals AS r CROSS JOIN movie_sample_buckets AS b ON b.bucket = r.bucket
+    );
+    UPDATE movie_sample_buckets SET size = size - 1 WHERE bucket IN (SELECT bucket FROM movie_sample_removals);
+    DELETE FROM movie_sample_removals;
+END;
+
+CREATE TRIGGER IF NOT EXISTS movie_sample_genre_insert AFTER INSERT ON movie_genres
+WHEN EXISTS (SELECT 1 FROM movies WHERE id = NEW.movie_id AND deleted = FALSE) BEGIN
+    INSERT OR IGNORE INTO movie_sample_buckets (bucket, size) VALUES ('genre:' || NEW.genre_id, 0);
+    INSERT INTO movie_sample_slots (bucket, slot, movie_id)
+    SELECT bucket, size, NEW.movie_id FROM movie_sample_buckets WHERE bucket = 'genre:' || NEW.genre_id;
+    UPDATE movie_sample_buckets SET size = size + 1 WHERE bucket = 'genre:' || NEW.genre_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS movie_sample_genre_delete AFTER DELETE ON movie_genres BEGIN
+    INSERT INTO movie_sample_removals (bucket)
+    SELECT bucket FROM movie_sample_slots WHERE movie_id = OLD.movie_id AND bucket = 'genre:' || OLD.genre_id;
+    UPDATE movie_sample_slots SET movie_id = (
+        SELECT last.movie_id FROM movie_sample_buckets AS b
+        JOIN movie_sample_slots AS last ON last.bucket = b.bucket AND last.slot = b.size - 1
+        WHERE b.bucket = movie_sample_slots.bucket
+    ) WHERE movie_id = OLD.movie_id AND bucket = 'genre:' || OLD.genre_id;
+    DELETE FROM movie_sample_slots WHERE (bucket, slot) IN (
+        SELECT b.bucket, b.size - 1 FROM movie_sample_removals AS r CROSS JOIN movie_sample_buckets AS b ON b.bucket = r.bucket
+    );
+    UPDATE movie_sample_buckets SET size = size - 1 WHERE bucket IN (SELECT bucket FROM movie_sample_removals);
+    DELETE FROM movie_sample_removals;
+END;
+
+-- Rebuild every bucket from scratch so the slots are dense and match the catalog.
+DELETE FROM movie_sample_slots;
+DELETE FROM movie_sample_buckets;
+DELETE FROM movie_sample_removals;
+
+INSERT INTO movie_sample_slots (bucket, slot, movie_id)
+SELECT bucket, ROW_NUMBER() OVER (PARTITION BY bucket ORDER BY movie_id) - 1, movie_id FROM (
+    SELECT 'all' AS bucket, id AS movie_id FROM movies WHERE deleted = FALSE
+    UNION ALL SELECT 'year:' || year, id FROM movies WHERE deleted = FALSE
+    UNION ALL SELECT 'language:' || lower(trim(original_language)), id FROM movies WHERE deleted = FALSE
+    UNION ALL SELECT 'genre:' || movie_genres.genre_id, movie_genres.movie_id
+    FROM movie_genres JOIN movies ON movies.id = movie_genres.movie_id WHERE movies.deleted = FALSE
+);
+
+INSERT INTO movie_sample_buckets (bucket, size)
+SELECT bucket, COUNT(*) FROM movie_sample_slots GROUP BY bucket;
@@ -0,0 +1,30 @@
+-- Adds the movies_fts full-text index and its sync triggers to an existing
+-- database and indexes the live movies already stored. Safe to run more than once.
+CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+    name,
+    director,
+    content='movies',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies WHEN NEW.deleted = FALSE BEGIN
+    INSERT INTO movies_fts (rowid, name, director) VALUES (NEW.id, NEW.name, NEW.director);
+END;
+
+CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE OF name, director, deleted ON movies BEGIN
+    INSERT INTO movies_fts (movies_fts, rowid, name, director)
+    SELECT 'delete', OLD.id, OLD.name, OLD.director WHERE OLD.deleted = FALSE;
+    INSERT INTO movies_fts (rowid, name, director)
+    SELECT NEW.id, NEW.name, NEW.director WHERE NEW.deleted = FALSE;
+END;
+
+CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies WHEN OLD.deleted = FALSE BEGIN
+    INSERT INTO movies_fts (movies_fts, rowid, name, director) VALUES ('delete', OLD.id, OLD.name, OLD.director);
+END;
+
+-- Reading rowids from movies_fts itself would read the content table, so the
+-- rows already indexed are taken from the movies_fts_docsize shadow table.
+INSERT INTO movies_fts (rowid, name, director)
+SELECT id, name, director FROM movies
+WHERE deleted = FALSE AND id NOT IN (SELECT id FROM movies_fts_docsize);
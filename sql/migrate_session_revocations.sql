@@ -0,0 +1,12 @@
+-- Adds the session revocation tables to an existing database. Safe to run more than once.
+-- Revoked sessions, shared by every worker.
+CREATE TABLE IF NOT EXISTS session_revocations (
+    jti TEXT PRIMARY KEY,
+    revoked_at REAL NOT NULL
+);
+
+-- The last time all of a user's sessions were revoked, e.g. by a password change.
+CREATE TABLE IF NOT EXISTS user_revocations (
+    username TEXT PRIMARY KEY,
+    revoked_at REAL NOT NULL
+);
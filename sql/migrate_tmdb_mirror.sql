@@ -0,0 +1,25 @@
+-- Adds the TMDB discover mirror tables to an existing database. Safe to run more than once.
+CREATE TABLE IF NOT EXISTS tmdb_mirror (
+    tmdb_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    release_date TEXT,
+    original_language TEXT NOT NULL,
+    genre_ids TEXT NOT NULL,
+    director TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+
+-- A slice is one mirrored discover query, e.g. 'year:2001', 'genre:28' or
+-- 'language:fr'; members lists the TMDB movies it returned.
+CREATE TABLE IF NOT EXISTS tmdb_mirror_slices (
+    slice TEXT PRIMARY KEY,
+    movie_count INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tmdb_mirror_members (
+    slice TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    tmdb_id INTEGER NOT NULL REFERENCES tmdb_mirror(tmdb_id),
+    PRIMARY KEY (slice, position)
+) WITHOUT ROWID;
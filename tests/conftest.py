@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+
+# Modules read LOG_FILE when they are imported; keep test runs out of the
+# tracked logs/auth.log.
+os.environ["LOG_FILE"] = os.path.join(tempfile.mkdtemp(prefix="movie-collection-tests-"), "test.log")
@@ -0,0 +1,255 @@
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+
+import pytest
+from werkzeug.http import http_date
+
+import app as app_module
+from app import create_app, create_tables, init_worker
+from movie_collection.utils.catalog_version import CatalogVersion
+
+
+######################################################
+#
+#    create_app
+#
+######################################################
+
+
+def test_create_app_defaults():
+    """Test that the factory applies the default configuration."""
+    flask_app = create_app()
+
+    assert flask_app.config['SQLALCHEMY_DATABASE_URI'] == 'sqlite:///users.db'
+    assert flask_app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] is False
+
+
+def test_create_app_overrides(tmp_path):
+    """Test that passed settings override the defaults."""
+    uri = f"sqlite:///{tmp_path / 'users.db'}"
+    flask_app = create_app({'SQLALCHEMY_DATABASE_URI': uri, 'TESTING': True})
+
+    assert flask_app.config['SQLALCHEMY_DATABASE_URI'] == uri
+    assert flask_app.config['TESTING'] is True
+
+
+def test_create_app_registers_routes():
+    """Test that every app built by the factory serves the same routes."""
+    rules = {rule.rule for rule in create_app().url_map.iter_rules()}
+
+    assert {'/api/health', '/api/metrics', '/login', '/movies/random'} <= rules
+    assert rules == {rule.rule for rule in app_module.app.url_map.iter_rules()}
+
+
+def test_create_app_instances_are_independent(tmp_path):
+    """Test that two apps can be configured differently."""
+    first = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'a.db'}"})
+    second = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'b.db'}"})
+
+    assert first.config['SQLALCHEMY_DATABASE_URI'] != second.config['SQLALCHEMY_DATABASE_URI']
+
+
+def test_metrics_page_identifies_the_process():
+    """Test that a scrape says which worker process answered."""
+    body = create_app({'TESTING': True}).test_client().get('/api/metrics').get_data(as_text=True)
+
+    assert f'process_info{{pid="{os.getpid()}"}} 1' in body
+
+
+def test_create_app_health_check():
+    """Test that the factory app serves requests."""
+    response = create_app({'TESTING': True}).test_client().get('/api/health')
+
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'healthy'}
+
+
+######################################################
+#
+#    create_tables / init_worker
+#
+######################################################
+
+
+def test_create_tables(tmp_path, monkeypatch):
+    """Test that the users and session revocation tables are created in the configured users database."""
+    monkeypatch.setenv('SQL_MIGRATE_SESSIONS_PATH', 'sql/migrate_session_revocations.sql')
+    db_path = tmp_path / 'users.db'
+    flask_app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{db_path}"})
+
+    create_tables(flask_app)
+
+    with sqlite3.connect(db_path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {'users', 'session_revocations', 'user_revocations'} <= tables
+
+
+def test_init_worker(mocker):
+    """Test that a new worker drops inherited state and starts its background jobs."""
+    calls = []
+    for name in ('reset_tmdb_client', 'clear_tmdb_cache', 'clear_user_cache',
+                 'start_genre_refresher', 'start_mirror_scheduler'):
+        mocker.patch.object(app_module, name, side_effect=lambda name=name: calls.append(name))
+    mock_reset_metrics = mocker.patch.object(app_module.metrics, 'reset')
+
+    init_worker()
+
+    assert calls == ['reset_tmdb_client', 'clear_tmdb_cache', 'clear_user_cache',
+                     'start_genre_refresher', 'start_mirror_scheduler']
+    mock_reset_metrics.assert_called_once()
+
+
+######################################################
+#
+#    Routes
+#
+######################################################
+
+
+def test_session_check_failure_is_500(mocker):
+    """Test that a session that cannot be checked is a 500, not a 401 or an accepted request."""
+    mocker.patch.object(app_module, 'verify_session_token', side_effect=sqlite3.OperationalError("database is locked"))
+
+    response = create_app().test_client().get('/session', headers={'Authorization': 'Bearer token'})
+
+    assert response.status_code == 500
+    assert response.get_json() == {'error': 'An error occurred while checking the session'}
+
+
+def test_bulk_update_route(mocker):
+    """Test that the bulk update summary is returned with the parsed arguments."""
+    mock_update = mocker.patch.object(app_module, 'bulk_update_movies', return_value={'updated_count': 2})
+
+    response = create_app().test_client().post('/movies/bulk-update', json={'operation': 'delete', 'ids': [1, 2]})
+
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'success', 'updated_count': 2}
+    mock_update.assert_called_once_with('delete', ids=[1, 2], names=None)
+
+
+def test_bulk_update_route_bad_request(mocker):
+    """Test that invalid input is a 400."""
+    mocker.patch.object(app_module, 'bulk_update_movies', side_effect=ValueError("Unknown operation: 'x'"))
+    client = create_app().test_client()
+
+    assert client.post('/movies/bulk-update', json={'operation': 'x', 'ids': [1]}).status_code == 400
+    assert client.post('/movies/bulk-update', data='not json', content_type='application/json').status_code == 400
+
+
+def test_bulk_add_route_ndjson(tmp_path, mocker):
+    """Test that an NDJSON body read in one go is split into one movie per line."""
+    path = str(tmp_path / "movies.db")
+    with sqlite3.connect(path) as conn, open("sql/create_movie_table.sql") as fh:
+        conn.executescript(fh.read())
+
+    @contextmanager
+    def real_get_db_connection():
+        conn = sqlite3.connect(path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    mocker.patch("movie_collection.models.movie_model.get_db_connection", real_get_db_connection)
+    mocker.patch("movie_collection.models.movie_model.catalog_version", CatalogVersion(str(tmp_path / "movies.db.version")))
+    body = "\n".join(
+        json.dumps({'name': f"Movie {index}", 'year': 2000 + index, 'director': "Director",
+                    'genres': ["Action"], 'language_code': "en"})
+        for index in range(5)
+    )
+
+    response = create_app().test_client().post('/movies/bulk-add', data=body, content_type='application/x-ndjson')
+
+    assert response.status_code == 200
+    assert response.get_json()['received'] == 5
+    assert response.get_json()['inserted'] == 5
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM movies").fetchone() == (5,)
+
+
+@pytest.fixture
+def catalog_version(tmp_path, mocker):
+    """Point the app at a catalog version file of its own."""
+    version = CatalogVersion(str(tmp_path / "movies.db.version"))
+    mocker.patch.object(app_module, 'catalog_version', version)
+    return version
+
+
+def test_list_favorite_route_returns_page(mocker, catalog_version):
+    """Test that the page is returned as JSON with validators."""
+    mocker.patch('app.time.time', return_value=catalog_version.current()[2] + 1)
+    mock_page = mocker.patch.object(app_module, 'list_favorite_movies_page',
+                                    return_value={'favorite_movies': ['Alien', 'Heat'], 'next_cursor': 7})
+
+    response = create_app().test_client().get('/movies/list-favorite?cursor=3&limit=2')
+
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'success', 'favorite_movies': ['Alien', 'Heat'], 'next_cursor': 7}
+    assert response.headers['ETag'] == '"%s-0"' % catalog_version.current()[0]
+    assert response.headers['Last-Modified']
+    assert response.headers['Cache-Control'] == 'no-cache'
+    mock_page.assert_called_once_with(after_id=3, limit=2)
+
+
+@pytest.mark.parametrize("path, view", [
+    ('/movies/list', 'list_movies'),
+    ('/movies/list-favorite', 'list_favorite_movies_page'),
+])
+def test_catalog_reads_not_modified(mocker, catalog_version, path, view):
+    """Test that unchanged catalogs get a 304 without querying, and a bump invalidates it."""
+    mock_view = mocker.patch.object(app_module, view, return_value={'next_cursor': None})
+    mocker.patch('app.time.time', return_value=catalog_version.current()[2] + 1)
+    client = create_app().test_client()
+    first = client.get(path)
+
+    for headers in ({'If-None-Match': first.headers['ETag']},
+                    {'If-Modified-Since': first.headers['Last-Modified']}):
+        response = client.get(path, headers=headers)
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == first.headers['ETag']
+    assert mock_view.call_count == 1
+
+    catalog_version.bump()
+    assert client.get(path, headers={'If-None-Match': first.headers['ETag']}).status_code == 200
+    assert mock_view.call_count == 2
+
+
+def test_change_in_the_same_second_is_not_hidden_by_last_modified(mocker, catalog_version):
+    """Test that If-Modified-Since cannot return 304 for a change made in the second of a cached read."""
+    mock_view = mocker.patch.object(app_module, 'list_favorite_movies_page', return_value={'next_cursor': None})
+    modified_at = catalog_version.current()[2]
+    mocker.patch('app.time.time', return_value=modified_at)
+    client = create_app().test_client()
+
+    first = client.get('/movies/list-favorite')
+    assert 'Last-Modified' not in first.headers
+    catalog_version.bump()
+    response = client.get('/movies/list-favorite', headers={'If-Modified-Since': http_date(int(modified_at))})
+
+    assert response.status_code == 200
+    assert mock_view.call_count == 2
+
+
+def test_catalog_reads_without_version(mocker):
+    """Test that reads still work, without validators, when the version file is unusable."""
+    mocker.patch.object(app_module.catalog_version, 'current', return_value=None)
+    mocker.patch.object(app_module, 'list_movies', return_value={'movies': [], 'next_cursor': None})
+
+    response = create_app().test_client().get('/movies/list', headers={'If-None-Match': '"x-0"'})
+
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+
+
+def test_list_favorite_route_bad_request(mocker, catalog_version):
+    """Test that an invalid cursor or limit is a 400 without validators."""
+    mocker.patch.object(app_module, 'list_favorite_movies_page', side_effect=ValueError("Limit must be between 1 and 500"))
+    client = create_app().test_client()
+
+    response = client.get('/movies/list-favorite?limit=900')
+    assert response.status_code == 400
+    assert 'ETag' not in response.headers
+    assert client.get('/movies/list-favorite?cursor=abc').status_code == 400
@@ -0,0 +1,153 @@
+import time
+
+import pytest
+import requests
+
+from benchmarks.harness import compare, load_baseline, percentile, run_benchmark, save_baseline, summarize
+from benchmarks.stub_tmdb import StubTMDBServer
+
+
+######################################################
+#
+#    Harness
+#
+######################################################
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles."""
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize():
+    """Test that durations are reported in milliseconds with throughput."""
+    stats = summarize([0.001, 0.002, 0.003, 0.004], errors=1, wall_seconds=0.5)
+
+    assert stats['iterations'] == 4
+    assert stats['errors'] == 1
+    assert stats['ops_per_sec'] == 8.0
+    assert stats['mean_ms'] == 2.5
+    assert stats['p50_ms'] == 2.0
+    assert stats['max_ms'] == 4.0
+
+
+def test_run_benchmark_counts_errors_and_runs_setup():
+    """Test that every iteration runs once, setup runs before each, and exceptions count as errors."""
+    calls = []
+    setups = []
+
+    def func(index):
+        calls.append(index)
+        if index % 2:
+            raise ValueError("odd")
+
+    stats = run_benchmark(func, iterations=10, setup=setups.append, warmup=2)
+
+    assert stats['iterations'] == 10
+    assert stats['errors'] == 5
+    assert sorted(index for index in calls if index >= 0) == list(range(10))
+    assert setups == [-1, -2] + list(range(10))
+
+
+def test_run_benchmark_concurrency():
+    """Test that concurrent calls overlap."""
+    stats = run_benchmark(lambda index: time.sleep(0.02), iterations=8, concurrency=8)
+
+    assert stats['iterations'] == 8
+    assert stats['ops_per_sec'] > 100
+
+
+def test_save_and_load_baseline(tmp_path):
+    """Test that baselines round-trip through JSON."""
+    path = tmp_path / 'baselines' / 'main.json'
+    results = {'case': summarize([0.001], 0, 0.001)}
+
+    save_baseline(str(path), results, {'commit': 'abc123'})
+
+    assert load_baseline(str(path)) == {'meta': {'commit': 'abc123'}, 'results': results}
+
+
+def test_load_baseline_rejects_other_json(tmp_path):
+    """Test that a file without results is rejected."""
+    path = tmp_path / 'other.json'
+    path.write_text('[]')
+
+    with pytest.raises(ValueError, match="Not a benchmark baseline"):
+        load_baseline(str(path))
+
+
+def test_compare_flags_regressions():
+    """Test that slower latency and lower throughput beyond the threshold are regressions."""
+    baseline = {'case': {'ops_per_sec': 100.0, 'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': 30.0}}
+    results = {
+        'case': {'ops_per_sec': 95.0, 'p50_ms': 8.0, 'p95_ms': 25.0, 'p99_ms': 30.0},
+        'new_case': {'ops_per_sec': 1.0, 'p50_ms': 1.0, 'p95_ms': 1.0, 'p99_ms': 1.0},
+    }
+
+    rows = {row[1]: row for row in compare(results, baseline, threshold=0.1)}
+
+    assert set(rows) == {'ops_per_sec', 'p50_ms', 'p95_ms', 'p99_ms'}
+    assert rows['ops_per_sec'][4] == pytest.approx(-0.05)
+    assert not rows['ops_per_sec'][5]
+    assert rows['p50_ms'][4] == pytest.approx(0.2)
+    assert not rows['p50_ms'][5]
+    assert rows['p95_ms'][4] == pytest.approx(-0.25)
+    assert rows['p95_ms'][5]
+
+
+######################################################
+#
+#    Stub TMDB server
+#
+######################################################
+
+
+@pytest.fixture
+def stub():
+    with StubTMDBServer(latency=0.0, results_per_page=3) as server:
+        yield server
+
+
+def test_stub_discover_returns_new_movies(stub):
+    """Test that discover results match the filters and never repeat an ID."""
+    first = requests.get(f"{stub.base_url}/discover/movie", params={'primary_release_year': 1999, 'with_genres': 35}).json()
+    second = requests.get(f"{stub.base_url}/discover/movie", params={'primary_release_year': 1999}).json()
+
+    assert len(first['results']) == 3
+    assert all(movie['release_date'] == '1999-01-01' and movie['genre_ids'] == [35] for movie in first['results'])
+    ids = [movie['id'] for movie in first['results'] + second['results']]
+    assert len(set(ids)) == len(ids)
+    assert stub.requests == 2
+
+
+def test_stub_credits_and_person_endpoints(stub):
+    """Test the endpoints find_movie_by_director and the credits lookup use."""
+    credits = requests.get(f"{stub.base_url}/movie/42/credits").json()
+    person = requests.get(f"{stub.base_url}/search/person", params={'query': 'Someone'}).json()
+    movie_credits = requests.get(f"{stub.base_url}/person/{person['results'][0]['id']}/movie_credits").json()
+
+    assert {'job': 'Director', 'name': 'Stub Director 42'} in credits['crew']
+    assert all(movie['job'] == 'Director' for movie in movie_credits['crew'])
+
+
+def test_stub_unknown_endpoint(stub):
+    """Test that unknown endpoints return a TMDB-style 404."""
+    response = requests.get(f"{stub.base_url}/tv/1")
+
+    assert response.status_code == 404
+    assert response.json()['success'] is False
+
+
+def test_stub_latency():
+    """Test that the injected latency delays responses."""
+    with StubTMDBServer(latency=0.05) as server:
+        start = time.perf_counter()
+        requests.get(f"{server.base_url}/genre/movie/list")
+        assert time.perf_counter() - start >= 0.05
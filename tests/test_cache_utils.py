@@ -0,0 +1,126 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+
+from movie_collection.utils.cache_utils import MISSING, SingleFlight, TTLCache, make_cache_key
+
+
+@pytest.fixture
+def mock_clock(mocker):
+    """Control time.monotonic as seen by the cache."""
+    clock = mocker.Mock(return_value=1000.0)
+    mocker.patch("movie_collection.utils.cache_utils.time.monotonic", clock)
+    return clock
+
+##########################################################
+# TTL and LRU behaviour
+##########################################################
+
+def test_cache_hit_and_miss():
+    """Test that stored values are returned and counted as hits."""
+    cache = TTLCache(maxsize=4)
+    assert cache.get("a") is MISSING
+    cache.set("a", {"results": []})
+    assert cache.get("a") == {"results": []}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+def test_cache_entry_expires(mock_clock):
+    """Test that entries are dropped once their TTL has elapsed."""
+    cache = TTLCache(maxsize=4, default_ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+
+    mock_clock.return_value = 1011.0
+    assert cache.get("a") is MISSING
+    assert cache.get("b") == 2
+    assert cache.stats()["expirations"] == 1
+
+def test_cache_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted when full."""
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_invalid_size():
+    """Test error when creating a cache with a non-positive size."""
+    with pytest.raises(ValueError, match="Cache size must be a positive integer, got 0"):
+        TTLCache(maxsize=0)
+
+##########################################################
+# Cache keys
+##########################################################
+
+def test_make_cache_key_normalizes_params():
+    """Test that param order, case, whitespace and the API key do not affect the key."""
+    first = make_cache_key("/search/movie", {"query": "  The  Matrix", "api_key": "abc"})
+    second = make_cache_key("/search/movie", {"api_key": "xyz", "query": "the matrix"})
+    assert first == second
+    assert make_cache_key("/search/person", {"query": "the matrix"}) != first
+
+##########################################################
+# Single flight
+##########################################################
+
+def run_concurrently(flight, key, func, callers):
+    """Start callers threads on flight.do(key, func) and release func once all but one are waiting."""
+    release = threading.Event()
+
+    def blocked():
+        release.wait(timeout=5)
+        return func()
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(flight.do, key, blocked) for _ in range(callers)]
+        deadline = time.monotonic() + 5
+        while flight.stats()['waiters'] < callers - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        time.sleep(0.01)
+        release.set()
+    return futures
+
+def test_single_flight_shares_one_call():
+    """Test that concurrent callers with the same key get the result of a single call."""
+    flight = SingleFlight(name="test")
+    calls = []
+
+    futures = run_concurrently(flight, "key", lambda: calls.append(1) or {"results": [1]}, callers=5)
+
+    assert [future.result() for future in futures] == [{"results": [1]}] * 5
+    assert len(calls) == 1
+    stats = flight.stats()
+    assert (stats['calls'], stats['waiters'], stats['in_flight']) == (1, 4, 0)
+    assert stats['saved_seconds'] >= 4 * 0.01
+
+def test_single_flight_shares_exceptions():
+    """Test that every waiter sees the exception raised by the shared call."""
+    def fail():
+        raise RuntimeError("TMDB is down")
+
+    futures = run_concurrently(SingleFlight(), "key", fail, callers=3)
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="TMDB is down"):
+            future.result()
+
+def test_single_flight_does_not_share_sequential_calls():
+    """Test that a finished call is not reused and different keys do not wait on each other."""
+    flight = SingleFlight()
+
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("a", lambda: 2) == 2
+    assert flight.do("b", lambda: 3) == 3
+    assert flight.stats()['calls'] == 3
+    assert flight.stats()['waiters'] == 0
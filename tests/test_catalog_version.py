@@ -0,0 +1,48 @@
+from movie_collection.utils.catalog_version import CatalogVersion
+
+
+def test_current_creates_version_file(tmp_path):
+    """Test that the first read creates the file at version 0."""
+    version = CatalogVersion(str(tmp_path / "movies.db.version"))
+
+    epoch, number, modified_at = version.current()
+
+    assert number == 0
+    assert modified_at > 0
+    assert version.current() == (epoch, number, modified_at)
+
+def test_bump_is_seen_by_other_instances(tmp_path):
+    """Test that a bump made through one instance (another worker) is read by every other."""
+    path = str(tmp_path / "movies.db.version")
+    reader = CatalogVersion(path)
+    epoch = reader.current()[0]
+
+    CatalogVersion(path).bump()
+    CatalogVersion(path).bump()
+
+    assert reader.current()[:2] == (epoch, 2)
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_recreated_file_gets_new_epoch(tmp_path):
+    """Test that removing the file cannot bring back a version that was already issued."""
+    path = tmp_path / "movies.db.version"
+    version = CatalogVersion(str(path))
+    version.bump()
+    before = version.current()
+
+    path.unlink()
+    version.bump()
+
+    after = version.current()
+    assert after[1] == 1
+    assert after[0] != before[0]
+
+def test_unwritable_location(tmp_path, mocker):
+    """Test that an unusable path disables versions and bumps log instead of raising."""
+    mock_log = mocker.patch("movie_collection.utils.catalog_version.log_rate_limited")
+    version = CatalogVersion(str(tmp_path / "missing" / "movies.db.version"))
+
+    version.bump()
+    assert version.current() is None
+
+    assert "Cannot update catalog version" in mock_log.call_args_list[0][0][3]
@@ -0,0 +1,106 @@
+import logging
+import queue
+
+import pytest
+
+import movie_collection.utils.logger as logger_utils
+from movie_collection.utils.logger import (
+    DroppingQueueHandler,
+    SharedRotatingFileHandler,
+    configure_logger,
+    log_rate_limited,
+    parse_log_levels
+)
+
+
+@pytest.fixture
+def fresh_logger(request):
+    test_logger = logging.getLogger(f"tests.logger.{request.node.name}")
+    yield test_logger
+    test_logger.handlers.clear()
+
+
+def test_configure_logger_is_idempotent(fresh_logger):
+    """Test that configuring a logger twice does not attach a second handler."""
+    configure_logger(fresh_logger)
+    configure_logger(fresh_logger)
+    assert fresh_logger.handlers == [logger_utils._pipeline.handler]
+    assert isinstance(fresh_logger.handlers[0], DroppingQueueHandler)
+    assert fresh_logger.propagate is False
+
+
+def test_configure_logger_uses_per_logger_levels(fresh_logger, mocker):
+    """Test that a LOG_LEVELS entry for a parent logger overrides the default level."""
+    mocker.patch.object(logger_utils._pipeline, 'levels', {"tests.logger": logging.WARNING})
+    configure_logger(fresh_logger, logging.DEBUG)
+    assert fresh_logger.level == logging.WARNING
+
+
+def test_parse_log_levels():
+    assert parse_log_levels("app=debug, movie_collection.utils.sql_utils=WARNING") == {
+        "app": logging.DEBUG,
+        "movie_collection.utils.sql_utils": logging.WARNING,
+    }
+    assert parse_log_levels("") == {}
+    with pytest.raises(ValueError, match="Invalid log level setting: 'app=LOUD'"):
+        parse_log_levels("app=LOUD")
+
+
+def test_dropping_queue_handler_never_blocks():
+    """Test that records are dropped and counted once the queue is full."""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    record_logger = logging.getLogger("tests.logger.dropping")
+    record_logger.handlers = [handler]
+    record_logger.propagate = False
+    record_logger.setLevel(logging.INFO)
+    for i in range(5):
+        record_logger.info("message %d", i)
+    record_logger.handlers.clear()
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().getMessage() == "message 0"
+
+
+def test_log_rate_limited(fresh_logger, mocker):
+    """Test that repeats within the interval are suppressed and then reported."""
+    clock = mocker.patch('movie_collection.utils.logger.time.monotonic', return_value=100.0)
+    fresh_logger.setLevel(logging.INFO)
+    log = mocker.patch.object(fresh_logger, 'log')
+
+    assert log_rate_limited(fresh_logger, logging.WARNING, 10, "Retrying %s", "a") is True
+    assert log_rate_limited(fresh_logger, logging.WARNING, 10, "Retrying %s", "b") is False
+    assert log_rate_limited(fresh_logger, logging.WARNING, 10, "Retrying %s", "c") is False
+    clock.return_value = 111.0
+    assert log_rate_limited(fresh_logger, logging.WARNING, 10, "Retrying %s", "d") is True
+
+    assert log.call_args_list[-1] == mocker.call(logging.WARNING, "Retrying %s (2 similar messages suppressed)", "d")
+
+
+def test_log_rate_limited_skips_disabled_levels(fresh_logger, mocker):
+    fresh_logger.setLevel(logging.ERROR)
+    log = mocker.patch.object(fresh_logger, 'log')
+    assert log_rate_limited(fresh_logger, logging.INFO, 10, "Quiet") is False
+    log.assert_not_called()
+
+
+def test_shared_rotating_file_handler(tmp_path):
+    """Test that two processes sharing a log rotate it once and both keep writing to the current file."""
+    path = tmp_path / "auth.log"
+    first = SharedRotatingFileHandler(str(path), maxBytes=100, backupCount=2)
+    second = SharedRotatingFileHandler(str(path), maxBytes=100, backupCount=2)
+
+    def record(msg):
+        return logging.LogRecord("test", logging.INFO, __file__, 1, msg, None, None)
+
+    try:
+        first.emit(record("a" * 90))
+        second.emit(record("b" * 90))  # rotates: the file would pass maxBytes
+        first.emit(record("c" * 5))  # must follow the rotation instead of rotating again
+    finally:
+        first.close()
+        second.close()
+
+    assert path.read_text() == "b" * 90 + "\n" + "c" * 5 + "\n"
+    assert (tmp_path / "auth.log.1").read_text() == "a" * 90 + "\n"
+    assert not (tmp_path / "auth.log.2").exists()
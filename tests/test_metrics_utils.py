@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+
+from movie_collection.utils.cache_utils import SingleFlight, TTLCache
+from movie_collection.utils.metrics_utils import MetricsRegistry, metrics, register_cache, register_single_flight
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(buckets=(0.1, 1.0))
+
+
+def test_counters_merge_across_threads(registry):
+    """Test that each thread's shard is included in the merged totals."""
+    def work():
+        for _ in range(1000):
+            registry.inc('jobs_total', (('kind', 'a'),))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    registry.inc('jobs_total', (('kind', 'a'),))
+
+    counters, _ = registry.snapshot()
+    assert counters[('jobs_total', (('kind', 'a'),))] == 4001
+
+
+def test_dead_thread_shards_are_retired(registry):
+    """Test that shards of finished threads are folded in and not kept around."""
+    thread = threading.Thread(target=registry.inc, args=('jobs_total',))
+    thread.start()
+    thread.join()
+    registry.inc('jobs_total')
+
+    assert registry.snapshot()[0][('jobs_total', ())] == 2
+    assert len(registry._shards) == 1
+    assert registry.snapshot()[0][('jobs_total', ())] == 2
+
+
+def test_render_histogram(registry):
+    """Test the Prometheus text format for a histogram, with cumulative buckets."""
+    registry.describe('latency_seconds', 'histogram', 'Request latency.')
+    for value in (0.05, 0.1, 0.5, 3.0):
+        registry.observe('latency_seconds', value, (('route', '/a'),))
+
+    assert registry.render() == (
+        '# HELP latency_seconds Request latency.\n'
+        '# TYPE latency_seconds histogram\n'
+        'latency_seconds_bucket{route="/a",le="0.1"} 2\n'
+        'latency_seconds_bucket{route="/a",le="1.0"} 3\n'
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4\n'
+        'latency_seconds_sum{route="/a"} 3.65\n'
+        'latency_seconds_count{route="/a"} 4\n'
+    )
+
+
+def test_render_escapes_labels(registry):
+    registry.inc('errors_total', (('message', 'say "hi"\n'),))
+    assert 'errors_total{message="say \\"hi\\"\\n"} 1' in registry.render()
+
+
+def test_register_cache_reports_hit_ratio(mocker):
+    """Test that a registered cache's counters and hit ratio appear on the metrics page."""
+    mocker.patch.object(metrics, '_collectors', [])
+    cache = TTLCache(maxsize=10, name="example")
+    register_cache(cache)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('b')
+
+    page = metrics.render()
+    assert 'cache_hits_total{cache="example"} 1' in page
+    assert 'cache_hit_ratio{cache="example"} 0.5' in page
+    assert '# TYPE cache_hit_ratio gauge' in page
+
+
+def test_register_single_flight(mocker):
+    """Test that a single flight's calls, waiters and time saved appear on the metrics page."""
+    mocker.patch.object(metrics, '_collectors', [])
+    flight = SingleFlight(name="example")
+    register_single_flight(flight)
+    flight.do('a', lambda: 1)
+
+    page = metrics.render()
+    assert 'singleflight_calls_total{flight="example"} 1' in page
+    assert 'singleflight_waiters_total{flight="example"} 0' in page
+    assert '# TYPE singleflight_in_flight gauge' in page
+
+
+def test_metrics_endpoint_records_routes():
+    """Test that requests are counted per route and exposed at /api/metrics."""
+    from app import app
+
+    client = app.test_client()
+    client.get('/api/health')
+    client.get('/no-such-route')
+    response = client.get('/api/metrics')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    page = response.get_data(as_text=True)
+    assert 'http_requests_total{route="/api/health",method="GET",status="200"}' in page
+    assert 'http_requests_total{route="unmatched",method="GET",status="404"}' in page
+    assert 'http_request_duration_seconds_count{route="/api/health",method="GET"}' in page
+    assert '# TYPE sqlite_pool_connections_open gauge' in page
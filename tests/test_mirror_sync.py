@@ -0,0 +1,163 @@
+from contextlib import contextmanager
+import fcntl
+import sqlite3
+import time
+
+import pytest
+
+from movie_collection.models.movie_model import clear_tmdb_cache
+from movie_collection.mirror_sync import parse_slices, sync_due_slices, sync_mirror, sync_slice
+
+
+@pytest.fixture(autouse=True)
+def reset_tmdb_cache():
+    clear_tmdb_cache()
+    yield
+    clear_tmdb_cache()
+
+
+@pytest.fixture
+def mock_cursor(mocker):
+    mock_conn = mocker.Mock()
+    mock_cursor = mocker.Mock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    @contextmanager
+    def mock_get_db_connection():
+        yield mock_conn
+
+    mocker.patch("movie_collection.mirror_sync.get_db_connection", mock_get_db_connection)
+    return mock_cursor
+
+
+def test_parse_slices():
+    """Test that years, ranges, genres and languages are expanded into slices."""
+    assert parse_slices("1999,2001-2003", "28", " fr") == [
+        ('year', 1999), ('year', 2001), ('year', 2002), ('year', 2003),
+        ('genre', 28), ('language', 'fr'),
+    ]
+    assert parse_slices() == []
+
+
+def test_parse_slices_invalid_year():
+    with pytest.raises(ValueError):
+        parse_slices("nineteen")
+
+
+def test_sync_slice(mock_cursor, mocker):
+    """Test that a slice is fetched page by page and written in one transaction."""
+    pages = {
+        1: {'results': [{'id': 1, 'title': 'One', 'release_date': '2001-01-01', 'original_language': 'en', 'genre_ids': [28]}],
+            'total_pages': 2},
+        2: {'results': [{'id': 2, 'title': 'Two', 'release_date': '', 'original_language': 'fr', 'genre_ids': []}],
+            'total_pages': 2},
+    }
+
+    def fake_tmdb_get(endpoint, params=None):
+        if endpoint == '/discover/movie':
+            assert params['primary_release_year'] == 2001
+            return pages[params['page']]
+        return {'crew': [{'job': 'Director', 'name': f"Director {endpoint.split('/')[2]}"}]}
+
+    mocker.patch("movie_collection.mirror_sync._tmdb_get", side_effect=fake_tmdb_get)
+
+    assert sync_slice('year', 2001, pages=5) == 2
+
+    mirror_rows = mock_cursor.executemany.call_args_list[0][0][1]
+    assert [(row[0], row[4], row[5]) for row in mirror_rows] == [(1, '28', 'Director 1'), (2, '', 'Director 2')]
+    mock_cursor.execute.assert_any_call("DELETE FROM tmdb_mirror_members WHERE slice = ?", ('year:2001',))
+    assert mock_cursor.executemany.call_args_list[1][0][1] == [('year:2001', 0, 1), ('year:2001', 1, 2)]
+    assert mock_cursor.execute.call_args_list[-1][0][1][:2] == ('year:2001', 2)
+
+
+@pytest.mark.parametrize("pages", [
+    {1: {'success': False, 'status_code': 25, 'status_message': 'Rate limit exceeded.'}},
+    {1: {'results': [], 'total_pages': 0}},
+    {1: {'results': [{'id': 1, 'title': 'One', 'release_date': '2001-01-01', 'original_language': 'en', 'genre_ids': [28]}],
+         'total_pages': 2},
+     2: {'success': False, 'status_message': 'Internal error.'}},
+])
+def test_sync_slice_keeps_mirror_when_tmdb_fails(mock_cursor, mocker, pages):
+    """Test that an error payload or an empty first page leaves the mirrored slice untouched."""
+    def fake_tmdb_get(endpoint, params=None):
+        if endpoint == '/discover/movie':
+            return pages[params['page']]
+        return {'crew': []}
+
+    mocker.patch("movie_collection.mirror_sync._tmdb_get", side_effect=fake_tmdb_get)
+
+    with pytest.raises(RuntimeError, match="year:2001"):
+        sync_slice('year', 2001, pages=5)
+    mock_cursor.execute.assert_not_called()
+    mock_cursor.executemany.assert_not_called()
+
+
+def test_sync_slice_keeps_mirror_when_credits_fail(mock_cursor, mocker):
+    """Test that a credits error payload fails the slice instead of storing an unknown director."""
+    def fake_tmdb_get(endpoint, params=None):
+        if endpoint == '/discover/movie':
+            return {'results': [{'id': 1, 'title': 'One', 'original_language': 'en', 'genre_ids': []}], 'total_pages': 1}
+        return {'success': False, 'status_message': 'Internal error.'}
+
+    mocker.patch("movie_collection.mirror_sync._tmdb_get", side_effect=fake_tmdb_get)
+
+    with pytest.raises(RuntimeError, match="Internal error."):
+        sync_slice('year', 2001)
+    mock_cursor.execute.assert_not_called()
+
+
+def test_sync_slice_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown mirror slice kind"):
+        sync_slice('decade', 1990)
+
+
+def test_sync_mirror_continues_past_failures(mocker):
+    """Test that one failing slice does not stop the others."""
+    mocker.patch("movie_collection.mirror_sync.ensure_mirror_schema")
+    mocker.patch("movie_collection.mirror_sync.sync_slice", side_effect=[RuntimeError("Request to TMDB timed out."), 4])
+
+    assert sync_mirror([('year', 2001), ('language', 'fr')]) == {'year:2001': None, 'language:fr': 4}
+
+
+@pytest.fixture
+def mirror_db(tmp_path, mocker):
+    """A real SQLite database with the mirror tables."""
+    path = str(tmp_path / "movies.db")
+    with sqlite3.connect(path) as conn, open("sql/migrate_tmdb_mirror.sql") as fh:
+        conn.executescript(fh.read())
+
+    @contextmanager
+    def real_get_db_connection():
+        conn = sqlite3.connect(path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    mocker.patch("movie_collection.mirror_sync.get_db_connection", real_get_db_connection)
+    mocker.patch("movie_collection.mirror_sync.ensure_mirror_schema")
+    return path
+
+
+def test_sync_due_slices_skips_fresh_slices(mirror_db, tmp_path, mocker):
+    """Test that a slice another worker synced within the interval is not synced again."""
+    now = time.time()
+    with sqlite3.connect(mirror_db) as conn:
+        conn.executemany("INSERT INTO tmdb_mirror_slices (slice, movie_count, synced_at) VALUES (?, ?, ?)",
+                         [('year:2001', 3, now - 10), ('year:2002', 3, now - 7200)])
+    mock_sync = mocker.patch("movie_collection.mirror_sync.sync_mirror", return_value={'year:2002': 3, 'genre:28': 2})
+
+    slices = [('year', 2001), ('year', 2002), ('genre', 28)]
+    assert sync_due_slices(slices, 3600, lock_path=str(tmp_path / "mirror.lock")) == {'year:2002': 3, 'genre:28': 2}
+    mock_sync.assert_called_once_with([('year', 2002), ('genre', 28)])
+
+
+def test_sync_due_slices_while_another_process_syncs(mirror_db, tmp_path, mocker):
+    """Test that only one process syncs at a time."""
+    mock_sync = mocker.patch("movie_collection.mirror_sync.sync_mirror")
+    lock_path = str(tmp_path / "mirror.lock")
+
+    with open(lock_path, 'w') as held:
+        fcntl.flock(held, fcntl.LOCK_EX)
+        assert sync_due_slices([('year', 2001)], 3600, lock_path=lock_path) is None
+    mock_sync.assert_not_called()
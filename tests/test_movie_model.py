@@ -1,11 +1,22 @@
 from contextlib import contextmanager
+import os
 import re
 import sqlite3
+import threading
+import time
 import pytest
 
 from movie_collection.models.movie_model import (
     Movie,
     add_movie_to_list,
+    bulk_add_movies,
+    bulk_update_movies,
+    get_movie_genres,
+    list_movies_by_genre,
+    migrate_movie_genres,
+    list_movies,
+    pick_random_movie,
+    search_local_movies,
     delete_movie_from_list, 
     clear_movie_list,
     find_movie_by_name,
@@ -14,8 +25,23 @@ from movie_collection.models.movie_model import (
     find_movie_by_director,
     find_movie_by_genre,
     mark_movie_as_favorite,
-    list_favorite_movies
+    list_favorite_movies,
+    list_favorite_movies_page,
+    migrate_favorites_index,
+    migrate_director_index,
+    migrate_movie_sampling,
+    migrate_movies_fts,
+    pick_from_mirror,
+    clear_tmdb_cache,
+    tmdb_cache,
+    tmdb_negative_cache,
+    tmdb_flight,
+    get_genres,
+    refresh_genres,
+    reset_genre_map
 )
+from movie_collection.utils.catalog_version import CatalogVersion
+from movie_collection.utils.metrics_utils import metrics
 
 ######################################################
 #
@@ -33,9 +59,37 @@ from movie_collection.models.movie_model import (
 #     yield  # This ensures the tests are run after the table is cleared
 
 
+@pytest.fixture(autouse=True)
+def reset_tmdb_cache():
+    """Start every test with an empty TMDB response cache and genre map."""
+    clear_tmdb_cache()
+    reset_genre_map()
+    yield
+    clear_tmdb_cache()
+    reset_genre_map()
+
+
+@pytest.fixture(autouse=True)
+def catalog_version(tmp_path, mocker):
+    """Keep catalog version bumps in a per-test file."""
+    version = CatalogVersion(str(tmp_path / "movies.db.version"))
+    mocker.patch("movie_collection.models.movie_model.catalog_version", version)
+    return version
+
+
 def normalize_whitespace(sql_query: str) -> str:
     return re.sub(r'\s+', ' ', sql_query).strip()
 
+def mock_tmdb(mocker, responses: dict):
+    """Patch the TMDB session so each endpoint (matched on the URL suffix) returns its mock response."""
+    def fake_get(url, params=None, timeout=None):
+        for endpoint, response in responses.items():
+            if url.endswith(endpoint):
+                response.status_code = 200
+                return response
+        raise AssertionError(f"Unexpected TMDB request: {url}")
+    return mocker.patch('requests.Session.get', side_effect=fake_get)
+
 # Mocking the database connection for tests
 @pytest.fixture
 def mock_cursor(mocker):
@@ -57,6 +111,27 @@ def mock_cursor(mocker):
 
     return mock_cursor  # Return the mock cursor so we can set expectations per test
 
+CREATE_TABLE_SQL = os.path.join(os.path.dirname(__file__), '..', 'sql', 'create_movie_table.sql')
+
+@pytest.fixture
+def catalog_db(tmp_path, mocker):
+    """A real SQLite catalog built from create_movie_table.sql, for tests that exercise triggers."""
+    path = str(tmp_path / "movies.db")
+    with sqlite3.connect(path) as conn, open(CREATE_TABLE_SQL) as fh:
+        conn.executescript(fh.read())
+        conn.executemany("INSERT INTO genres (id, name) VALUES (?, ?)", [(28, 'Action'), (35, 'Comedy')])
+
+    @contextmanager
+    def real_get_db_connection():
+        conn = sqlite3.connect(path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    mocker.patch("movie_collection.models.movie_model.get_db_connection", real_get_db_connection)
+    return path
+
 ##########################################################
 # Movie Creation Tests
 ##########################################################
@@ -83,6 +158,11 @@ def test_add_movie_to_list(mock_cursor):
     expected_arguments = ("Movie Title", 2022, "Director Name", "Drama, Action", "en", False)
     assert actual_arguments == expected_arguments, f"Arguments mismatch: expected {expected_arguments}, got {actual_arguments}."
 
+    # Genres are also linked through the movie_genres join table
+    link_query, link_arguments = mock_cursor.executemany.call_args[0]
+    assert "INSERT OR IGNORE INTO movie_genres" in normalize_whitespace(link_query)
+    assert link_arguments == [("Drama", "Movie Title"), ("Action", "Movie Title")]
+
 
 def test_create_movie_duplicate(mock_cursor):
     """Test creating a movie with a duplicate name."""
@@ -155,6 +235,190 @@ def test_add_movie_default_favorite(mock_cursor):
 
 
 
+def test_bulk_add_movies(mock_cursor):
+    """Test bulk adding movies in chunked executemany transactions."""
+    rows = [
+        {"name": "Movie A", "year": 2001, "director": "Dir", "genres": ["Drama"], "original_language": "en"},
+        {"name": "Movie B", "year": 2002, "director": "Dir", "genres": ["Action", "Drama"], "language_code": "fr", "favorite": True},
+        {"name": "Movie C", "year": 2003, "director": "Dir", "genres": ["Drama"], "original_language": "en"},
+    ]
+
+    summary = bulk_add_movies(iter(rows), chunk_size=2)
+
+    assert summary["inserted"] == 3
+    assert summary["rejected_count"] == 0
+
+    expected_query = normalize_whitespace("""
+        INSERT INTO movies (name, year, director, genres, original_language, favorite)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """)
+    movie_inserts = [call[0][1] for call in mock_cursor.executemany.call_args_list
+                     if normalize_whitespace(call[0][0]) == expected_query]
+    assert movie_inserts == [
+        [("Movie A", 2001, "Dir", "Drama", "en", False), ("Movie B", 2002, "Dir", "Action, Drama", "fr", True)],
+        [("Movie C", 2003, "Dir", "Drama", "en", False)],
+    ]
+
+    # Genre links for the first chunk
+    assert mock_cursor.executemany.call_args_list[1][0][1] == [
+        ("Drama", "Movie A"), ("Action", "Movie B"), ("Drama", "Movie B")
+    ]
+
+def test_bulk_add_movies_duplicates_and_rejects(mock_cursor):
+    """Test that stored, repeated and invalid rows are reported per row."""
+    mock_cursor.fetchall.return_value = [("Stored Movie",)]
+    rows = [
+        {"name": "Stored Movie", "year": 2001, "director": "Dir", "genres": ["Drama"], "original_language": "en"},
+        {"name": "New Movie", "year": 2002, "director": "Dir", "genres": ["Drama"], "original_language": "en"},
+        {"name": "New Movie", "year": 2002, "director": "Dir", "genres": ["Drama"], "original_language": "en"},
+        {"name": "Old Movie", "year": 1850, "director": "Dir", "genres": ["Drama"], "original_language": "en"},
+        "not an object",
+    ]
+
+    summary = bulk_add_movies(rows)
+
+    assert summary["received"] == 5
+    assert summary["inserted"] == 1
+    assert [row["index"] for row in summary["duplicates"]] == [0, 2]
+    assert [row["index"] for row in summary["rejected"]] == [3, 4]
+    assert summary["rejected"][1]["error"] == "Row must be a JSON object"
+    assert mock_cursor.executemany.call_args_list[0][0][1] == [("New Movie", 2002, "Dir", "Drama", "en", False)]
+
+def test_bulk_add_movies_malformed_stream(mock_cursor):
+    """Test that rows read before a malformed stream are still inserted."""
+    def rows():
+        yield {"name": "Movie A", "year": 2001, "director": "Dir", "genres": ["Drama"], "original_language": "en"}
+        raise ValueError("Unexpected end of JSON array")
+
+    summary = bulk_add_movies(rows())
+
+    assert summary["inserted"] == 1
+    assert summary["error"] == "Unexpected end of JSON array"
+
+##########################################################
+# Genre Index
+##########################################################
+
+def test_get_movie_genres(mock_cursor):
+    """Test reading a movie's genres through the join table."""
+    mock_cursor.fetchall.return_value = [(18, "Drama"), (28, "Action")]
+
+    assert get_movie_genres(1) == [(18, "Drama"), (28, "Action")]
+
+    expected_query = normalize_whitespace("""
+        SELECT genres.id, genres.name
+        FROM movie_genres JOIN genres ON genres.id = movie_genres.genre_id
+        WHERE movie_genres.movie_id = ?
+        ORDER BY genres.id
+    """)
+    assert normalize_whitespace(mock_cursor.execute.call_args[0][0]) == expected_query
+    assert mock_cursor.execute.call_args[0][1] == (1,)
+
+def test_list_movies_by_genre(mock_cursor):
+    """Test listing stored movies in a genre via the genre index."""
+    mock_cursor.fetchall.return_value = [("Movie A",), ("Movie B",)]
+
+    assert list_movies_by_genre(28) == ["Movie A", "Movie B"]
+
+    actual_query = normalize_whitespace(mock_cursor.execute.call_args[0][0])
+    assert "FROM movie_genres JOIN movies ON movies.id = movie_genres.movie_id" in actual_query
+    assert "WHERE movie_genres.genre_id = ? AND movies.deleted = FALSE" in actual_query
+    assert mock_cursor.execute.call_args[0][1] == (28,)
+
+def test_migrate_movie_genres(mock_cursor, mocker):
+    """Test that the migration loads genres, runs the migration script and bumps the catalog version."""
+    mocker.patch.dict('os.environ', {'SQL_MIGRATE_GENRES_PATH': 'sql/migrate_movie_genres.sql'})
+    mock_get_genres = mocker.patch('movie_collection.models.movie_model.get_genres')
+    mock_open = mocker.patch('builtins.open', mocker.mock_open(read_data="The migration script"))
+    mock_version = mocker.patch("movie_collection.models.movie_model.catalog_version")
+
+    migrate_movie_genres()
+
+    mock_get_genres.assert_called_once()
+    mock_open.assert_called_once_with('sql/migrate_movie_genres.sql', 'r')
+    mock_cursor.executescript.assert_called_once_with("The migration script")
+    mock_version.bump.assert_called_once()
+
+@pytest.mark.parametrize("migrate", [
+    migrate_movies_fts, migrate_favorites_index, migrate_director_index, migrate_movie_sampling
+])
+def test_migrations_bump_catalog_version(mock_cursor, mocker, migrate):
+    """Test that a migration invalidates cached catalog reads, since it can change their results."""
+    mocker.patch('builtins.open', mocker.mock_open(read_data="The migration script"))
+    mock_version = mocker.patch("movie_collection.models.movie_model.catalog_version")
+
+    migrate()
+
+    mock_cursor.executescript.assert_called_once_with("The migration script")
+    mock_version.bump.assert_called_once()
+
+def test_migrate_director_index(tmp_path, mocker):
+    """Test that the migration adds the director tables to a database without them and can run again."""
+    path = str(tmp_path / "movies.db")
+    mocker.patch.dict('os.environ', {'SQL_MIGRATE_DIRECTORS_PATH': 'sql/migrate_director_index.sql'})
+
+    @contextmanager
+    def real_get_db_connection():
+        conn = sqlite3.connect(path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    mocker.patch("movie_collection.models.movie_model.get_db_connection", real_get_db_connection)
+
+    migrate_director_index()
+    migrate_director_index()
+
+    with sqlite3.connect(path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {'tmdb_directors', 'tmdb_director_movies'} <= tables
+
+##########################################################
+# Catalog Listing
+##########################################################
+
+def test_list_movies_filters_and_cursor(mock_cursor):
+    """Test that filters and the cursor become an index-friendly keyset query."""
+    mock_cursor.fetchall.return_value = [
+        (5, "Movie A", 2001, "Dir", "Drama, Action", "en", 1, 0),
+        (9, "Movie B", 2003, "Dir", "Drama", "en", 0, 0),
+        (12, "Movie C", 2004, "Dir", "Drama", "en", 0, 0),
+    ]
+
+    page = list_movies(year_from=2000, year_to=2005, director="Dir", after_id=4, limit=2)
+
+    actual_query = normalize_whitespace(mock_cursor.execute.call_args[0][0])
+    assert actual_query.endswith(
+        "FROM movies WHERE movies.deleted = ? AND movies.director = ? AND movies.year >= ? "
+        "AND movies.year <= ? AND movies.id > ? ORDER BY movies.id LIMIT ?"
+    )
+    assert mock_cursor.execute.call_args[0][1] == [False, "Dir", 2000, 2005, 4, 3]
+
+    assert [movie["name"] for movie in page["movies"]] == ["Movie A", "Movie B"]
+    assert page["movies"][0]["genres"] == ["Drama", "Action"]
+    assert page["movies"][0]["favorite"] is True
+    assert page["next_cursor"] == 9
+
+def test_list_movies_by_genre_uses_join_table(mock_cursor):
+    """Test that the genre filter pages through movie_genres."""
+    list_movies(genre_id=28, deleted=None)
+
+    actual_query = normalize_whitespace(mock_cursor.execute.call_args[0][0])
+    assert "FROM movie_genres CROSS JOIN movies ON movies.id = movie_genres.movie_id" in actual_query
+    assert actual_query.endswith("WHERE movie_genres.genre_id = ? ORDER BY movie_genres.movie_id LIMIT ?")
+    assert mock_cursor.execute.call_args[0][1] == [28, 51]
+
+def test_list_movies_last_page(mock_cursor):
+    """Test that the last page has no next cursor."""
+    mock_cursor.fetchall.return_value = [(5, "Movie A", 2001, "Dir", "Drama", "en", 0, 0)]
+    assert list_movies()["next_cursor"] is None
+
+def test_list_movies_invalid_limit():
+    """Test error when the page size is out of range."""
+    with pytest.raises(ValueError, match="Limit must be between 1 and 500, got 0"):
+        list_movies(limit=0)
+
 ##########################################################
 # Clear Catalog
 ##########################################################
@@ -165,9 +429,11 @@ def test_clear_movie_list(mock_cursor, mocker):
     # Mock the file reading
     mocker.patch.dict('os.environ', {'SQL_CREATE_TABLE_PATH': 'sql/create_movie_table.sql'})
     mock_open = mocker.patch('builtins.open', mocker.mock_open(read_data="The body of the create statement"))
+    mock_version = mocker.patch("movie_collection.models.movie_model.catalog_version")
 
     # Call the clear_database function
     clear_movie_list()
+    mock_version.bump.assert_called_once()
 
     # Ensure the file was opened using the environment variable's path
     mock_open.assert_called_once_with('sql/create_movie_table.sql', 'r')
@@ -221,6 +487,46 @@ def test_delete_movie_bad_id(mock_cursor):
     with pytest.raises(ValueError, match="Movie with ID 999 not found"):
         delete_movie_from_list(999)
 
+def test_pick_random_movie_follows_soft_deletes(catalog_db):
+    """Test that random picks only return live movies matching every filter."""
+    add_movie_to_list("Heat", 1995, "Michael Mann", ["Action"], "en")
+    add_movie_to_list("Amelie", 2001, "Jean-Pierre Jeunet", ["Comedy"], "fr")
+    add_movie_to_list("Snatch", 2000, "Guy Ritchie", ["Action", "Comedy"], "en")
+    delete_movie_from_list(1)
+
+    for _ in range(20):
+        assert pick_random_movie()['name'] in ("Amelie", "Snatch")
+        assert pick_random_movie(genre_id=28)['name'] == "Snatch"
+        assert pick_random_movie(genre_id=35, original_language="EN")['name'] == "Snatch"
+
+    with sqlite3.connect(catalog_db) as conn:
+        slots = conn.execute("SELECT bucket, slot, movie_id FROM movie_sample_slots WHERE bucket = 'all' ORDER BY slot").fetchall()
+        sizes = dict(conn.execute("SELECT bucket, size FROM movie_sample_buckets").fetchall())
+    assert slots == [('all', 0, 3), ('all', 1, 2)]
+    assert sizes['year:1995'] == 0 and sizes['genre:28'] == 1 and sizes['language:en'] == 1
+
+def test_pick_random_movie_no_match(catalog_db):
+    """Test that a filter with no live movies raises."""
+    add_movie_to_list("Heat", 1995, "Michael Mann", ["Action"], "en")
+    with pytest.raises(ValueError, match="No movies found matching the filters."):
+        pick_random_movie(year=1995, genre_id=35)
+    with pytest.raises(ValueError, match="No movies found matching the filters."):
+        pick_random_movie(original_language="de")
+
+def test_pick_random_movie_falls_back_when_probes_miss(mock_cursor, mocker):
+    """Test that sparse filter combinations fall back to the exact candidate query."""
+    mocker.patch('movie_collection.models.movie_model.RANDOM_MAX_PROBES', 2)
+    heat = (1, 'Heat', 1995, 'Michael Mann', 'Action', 'en', False, False)
+    mock_cursor.fetchall.side_effect = [[('year:1995', 3), ('language:en', 50)], [heat]]
+    mock_cursor.fetchone.return_value = (2, 'Se7en', 1995, 'David Fincher', 'Crime', 'fr', False, False)
+
+    movie = pick_random_movie(year=1995, original_language='en')
+
+    assert movie['name'] == 'Heat'
+    fallback_query = normalize_whitespace(mock_cursor.execute.call_args_list[-1][0][0])
+    assert "movies.year = ?" in fallback_query and "lower(trim(movies.original_language)) = ?" in fallback_query
+    assert mock_cursor.execute.call_args_list[-1][0][1] == ['year:1995', 1995, 'en']
+
 def test_delete_movie_already_deleted(mock_cursor):
     """Test error when trying to delete a movie that's already marked as deleted."""
 
@@ -231,6 +537,136 @@ def test_delete_movie_already_deleted(mock_cursor):
     with pytest.raises(ValueError, match="Movie with ID 999 has already been deleted"):
         delete_movie_from_list(999)
 
+##########################################################
+# Bulk Updates
+##########################################################
+
+def add_catalog_movies(path, *rows):
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO movies (name, year, director, genres, original_language, favorite, deleted) VALUES (?, 2000, 'D', 'Action', 'en', ?, ?)",
+            rows
+        )
+
+def test_bulk_update_favorite_by_name(catalog_db):
+    """Test that updated, unchanged and missing names are reported separately."""
+    add_catalog_movies(catalog_db, ('Alien', False, False), ('Heat', True, False))
+
+    summary = bulk_update_movies('favorite', names=['Alien', 'Heat', 'Nope', 'Alien'])
+
+    assert summary['requested'] == 3
+    assert (summary['updated_count'], summary['unchanged_count'], summary['missing_count']) == (1, 1, 1)
+    assert summary['updated'] == [{'id': 1, 'name': 'Alien'}]
+    assert summary['unchanged'] == [{'id': 2, 'name': 'Heat'}]
+    assert summary['missing'] == [{'name': 'Nope'}]
+    with sqlite3.connect(catalog_db) as conn:
+        assert conn.execute("SELECT name FROM movies WHERE favorite ORDER BY id").fetchall() == [('Alien',), ('Heat',)]
+
+def test_bulk_update_delete_and_restore_by_id(catalog_db):
+    """Test soft deleting and restoring by ID across several chunks."""
+    add_catalog_movies(catalog_db, *[(f"Movie {index}", False, index == 0) for index in range(5)])
+
+    deleted = bulk_update_movies('delete', ids=[1, 2, 3, 4, 5, 99], chunk_size=2)
+    restored = bulk_update_movies('restore', ids=[1, 2], chunk_size=2)
+
+    assert deleted['updated'] == [{'id': movie_id, 'name': f"Movie {movie_id - 1}"} for movie_id in (2, 3, 4, 5)]
+    assert deleted['unchanged'] == [{'id': 1, 'name': 'Movie 0'}]
+    assert deleted['missing'] == [{'id': 99}]
+    assert restored['updated_count'] == 2
+    with sqlite3.connect(catalog_db) as conn:
+        assert conn.execute("SELECT id FROM movies WHERE deleted ORDER BY id").fetchall() == [(3,), (4,), (5,)]
+        # The sampling triggers follow the bulk change like any other update.
+        assert conn.execute("SELECT count(*) FROM movie_sample_slots WHERE bucket = 'all'").fetchone()[0] == 2
+
+def test_bulk_update_truncates_reports(catalog_db, mocker):
+    """Test that per-movie lists are capped while counts stay exact."""
+    mocker.patch("movie_collection.models.movie_model.BULK_MAX_REPORTED_ROWS", 2)
+
+    summary = bulk_update_movies('unfavorite', ids=[10, 11, 12])
+
+    assert summary['missing_count'] == 3
+    assert len(summary['missing']) == 2
+    assert summary['truncated'] is True
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({'operation': 'archive', 'ids': [1]}, "Unknown operation: 'archive'"),
+    ({'operation': 'favorite'}, "At least one movie ID or name is required"),
+    ({'operation': 'favorite', 'ids': '1,2'}, "ids must be a list"),
+    ({'operation': 'favorite', 'ids': [1, True]}, "Invalid movie ID: True"),
+    ({'operation': 'favorite', 'names': ['']}, "Invalid movie name: ''"),
+])
+def test_bulk_update_invalid_input(kwargs, message):
+    """Test that bad input is rejected before touching the database."""
+    with pytest.raises(ValueError, match=re.escape(message)):
+        bulk_update_movies(**kwargs)
+
+def test_bulk_update_too_many(mocker):
+    """Test the limit on keys per request."""
+    mocker.patch("movie_collection.models.movie_model.BULK_UPDATE_MAX_ITEMS", 2)
+
+    with pytest.raises(ValueError, match="At most 2 movies"):
+        bulk_update_movies('delete', ids=[1, 2], names=['Alien'])
+
+def test_mutations_bump_catalog_version(catalog_db, catalog_version):
+    """Test that every committed catalog change moves the version forward, and no-ops do not."""
+    def version():
+        return catalog_version.current()[1]
+
+    add_movie_to_list("Heat", 1995, "Michael Mann", ["Action"], "en")
+    assert version() == 1
+    mark_movie_as_favorite("Heat")
+    assert version() == 2
+    bulk_update_movies('favorite', names=['Heat'])
+    assert version() == 2
+    bulk_update_movies('unfavorite', names=['Heat'])
+    assert version() == 3
+    delete_movie_from_list(1)
+    assert version() == 4
+    with pytest.raises(ValueError):
+        delete_movie_from_list(1)
+    assert version() == 4
+
+##########################################################
+# Genres
+##########################################################
+
+def test_get_genres_loads_from_database(mock_cursor, mocker):
+    """Test that stored genres are used without calling TMDB."""
+    mock_cursor.fetchall.return_value = [(28, "Action"), (35, "Comedy")]
+    mock_get = mocker.patch('requests.Session.get')
+
+    assert get_genres() == {28: "Action", 35: "Comedy"}
+    assert get_genres() == {28: "Action", 35: "Comedy"}
+
+    mock_get.assert_not_called()
+    assert mock_cursor.execute.call_count == 1
+    assert normalize_whitespace(mock_cursor.execute.call_args[0][0]) == "SELECT id, name FROM genres"
+
+def test_get_genres_fetches_and_persists_when_not_stored(mock_cursor, mocker):
+    """Test that an empty genres table falls back to TMDB once and stores the result."""
+    mock_genres = mocker.Mock()
+    mock_genres.json.return_value = {'genres': [{'id': 28, 'name': 'Action'}]}
+    mock_get = mocker.patch('requests.Session.get', return_value=mock_genres)
+
+    assert get_genres() == {28: "Action"}
+    assert get_genres() == {28: "Action"}
+
+    assert mock_get.call_count == 1
+    mock_cursor.executemany.assert_called_once_with(
+        "INSERT INTO genres (id, name) VALUES (?, ?)", [(28, "Action")]
+    )
+
+def test_refresh_genres_keeps_map_on_empty_response(mock_cursor, mocker):
+    """Test that a failed refresh does not wipe the current genre map."""
+    mock_cursor.fetchall.return_value = [(28, "Action")]
+    get_genres()
+    mock_empty = mocker.Mock()
+    mock_empty.json.return_value = {'success': False, 'status_code': 7}
+    mocker.patch('requests.Session.get', return_value=mock_empty)
+
+    assert refresh_genres() == {28: "Action"}
+    assert get_genres() == {28: "Action"}
+
 ##########################################################
 # Movie Search Tests
 ##########################################################
@@ -272,7 +708,7 @@ def test_find_movie_by_name(mocker):
             'name': 'Directron'
         }]
     }
-    mocker.patch('requests.get', side_effect=[mock_response, mock_genres, mock_credit])
+    mock_tmdb(mocker, {'/search/movie': mock_response, '/genre/movie/list': mock_genres, '/credits': mock_credit})
     mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
     
     movie = find_movie_by_name("Test Movie")
@@ -280,11 +716,190 @@ def test_find_movie_by_name(mocker):
     assert movie.year == 2023
     assert movie.original_language == "en"
 
+def test_find_movie_by_name_served_from_cache(mocker):
+    """Test that a repeated search does not call TMDB again."""
+    mock_response = mocker.Mock()
+    mock_response.json.return_value = {
+        'results': [{
+            'id': 1,
+            'title': 'Test Movie',
+            'release_date': '2023-01-01',
+            'original_language': 'en',
+            'genre_ids': [28],
+        }]
+    }
+    mock_genres = mocker.Mock()
+    mock_genres.json.return_value = {'genres': [{'id': 28, 'name': 'action'}]}
+    mock_credit = mocker.Mock()
+    mock_credit.json.return_value = {'crew': [{'job': 'Director', 'name': 'Directron'}]}
+    mock_get = mock_tmdb(mocker, {'/search/movie': mock_response, '/genre/movie/list': mock_genres, '/credits': mock_credit})
+    mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
+
+    first = find_movie_by_name("Test Movie")
+    # Normalized params: case and surrounding whitespace do not change the key
+    second = find_movie_by_name("  test movie ")
+
+    assert first == second
+    assert mock_get.call_count == 3
+    assert tmdb_cache.stats()['hits'] == 2  # search and credits; genres stay in memory
+
+def empty_results_count(endpoint, source):
+    return metrics.snapshot()[0].get(('tmdb_empty_results_total', (('endpoint', endpoint), ('source', source))), 0)
+
+def test_find_movie_by_name_miss_served_from_negative_cache(mocker):
+    """Test that a repeated search with no results is answered without TMDB, apart from real results."""
+    mock_response = mocker.Mock()
+    mock_response.json.return_value = {'results': []}
+    mock_get = mock_tmdb(mocker, {'/search/movie': mock_response})
+    before = empty_results_count('/search/movie', 'cache')
+
+    for name in ("Nonexistent Movie", " nonexistent movie"):
+        with pytest.raises(ValueError, match="No movies found."):
+            find_movie_by_name(name)
+
+    search_calls = [call for call in mock_get.call_args_list if call[0][0].endswith('/search/movie')]
+    assert len(search_calls) == 1
+    assert tmdb_negative_cache.stats()['size'] == 1
+    assert tmdb_cache.stats()['size'] == 0
+    assert empty_results_count('/search/movie', 'cache') == before + 1
+
+def test_concurrent_identical_searches_share_one_tmdb_call(mocker):
+    """Test that identical searches in flight at the same time make a single TMDB request."""
+    release = threading.Event()
+
+    def slow_get(url, params=None, timeout=None):
+        release.wait(timeout=5)
+        response = mocker.Mock(status_code=200)
+        response.json.return_value = {'results': []}
+        return response
+
+    mock_get = mocker.patch('requests.Session.get', side_effect=slow_get)
+    mocker.patch('movie_collection.models.movie_model.get_genres', return_value={})
+    waiters = tmdb_flight.stats()['waiters']
+    errors = []
+
+    def search():
+        try:
+            find_movie_by_name("Alien")
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while tmdb_flight.stats()['waiters'] < waiters + 3 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ["No movies found."] * 4
+    assert sum(call[0][0].endswith('/search/movie') for call in mock_get.call_args_list) == 1
+
+def test_negative_cache_disabled(mocker):
+    """Test that a TTL of 0 sends every miss to TMDB."""
+    mocker.patch.object(tmdb_negative_cache, 'default_ttl', 0)
+    mock_response = mocker.Mock()
+    mock_response.json.return_value = {'results': []}
+    mock_get = mock_tmdb(mocker, {'/search/person': mock_response})
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Director not found."):
+            find_movie_by_director("Nobody")
+    assert sum(call[0][0].endswith('/search/person') for call in mock_get.call_args_list) == 2
+
+@pytest.mark.parametrize("find, arg, endpoint, message", [
+    (find_movie_by_name, "   ", '/search/movie', "No movies found."),
+    (find_movie_by_year, 1700, '/discover/movie', "No movies found for the year: '1700'."),
+    (find_movie_by_director, "", '/search/person', "Director not found."),
+    (find_movie_by_genre, 0, '/discover/movie', "No movies found with the genre with ID '0'."),
+])
+def test_known_empty_queries_skip_tmdb(mocker, find, arg, endpoint, message):
+    """Test that queries that cannot match anything are answered without any TMDB call."""
+    mock_get = mocker.patch('requests.Session.get')
+    before = empty_results_count(endpoint, 'skipped')
+
+    with pytest.raises(ValueError, match=re.escape(message)):
+        find(arg)
+
+    mock_get.assert_not_called()
+    assert empty_results_count(endpoint, 'skipped') == before + 1
+
+def test_unknown_genre_skips_tmdb_once_genres_are_loaded(mocker):
+    """Test that a genre missing from the loaded genre map is answered locally."""
+    mocker.patch('movie_collection.models.movie_model._genre_map', {28: 'Action'})
+    mock_get = mocker.patch('requests.Session.get')
+
+    with pytest.raises(ValueError, match="No movies found with the genre with ID '9999'."):
+        find_movie_by_genre(9999)
+    mock_get.assert_not_called()
+
+def test_find_movie_by_name_local_first_hit(mock_cursor, mocker):
+    """Test that a local-first search answers from the full-text index without TMDB."""
+    mock_cursor.fetchall.return_value = [(3, "The Matrix", 1999, "Lana Wachowski", "Action", "en", 1, 0)]
+    mock_get = mocker.patch('requests.Session.get')
+
+    movie = find_movie_by_name("matrix", local_first=True)
+
+    assert movie == Movie("The Matrix", 1999, "Lana Wachowski", ["Action"], "en", favorite=True)
+    mock_get.assert_not_called()
+    assert "WHERE movies_fts MATCH ?" in normalize_whitespace(mock_cursor.execute.call_args[0][0])
+    assert mock_cursor.execute.call_args[0][1] == ('name : ("matrix")', 20)
+
+def test_find_movie_by_name_local_first_miss(mock_cursor, mocker):
+    """Test that a local-first search falls back to TMDB when nothing is stored."""
+    mock_cursor.fetchall.return_value = []
+    mock_response = mocker.Mock()
+    mock_response.json.return_value = {'results': []}
+    mock_get = mocker.patch('requests.Session.get', return_value=mock_response)
+
+    with pytest.raises(ValueError, match="No movies found."):
+        find_movie_by_name("Nonexistent Movie", local_first=True)
+    mock_get.assert_called_once()
+
+def test_search_local_movies_escapes_operators(mock_cursor):
+    """Test that FTS5 operators in user input are quoted as plain words."""
+    search_local_movies('star* OR "wars', column=None)
+    assert mock_cursor.execute.call_args[0][1] == ('"star" "OR" "wars"', 20)
+
+def test_search_local_movies_no_words(mock_cursor):
+    """Test that input without words does not query the index."""
+    assert search_local_movies("  ?! ") == []
+    mock_cursor.execute.assert_not_called()
+
+def test_find_movie_fetches_genres_concurrently(mocker):
+    """Test that the genre lookup runs while the search request is in flight."""
+    genres_started = threading.Event()
+
+    def get_genres_in_background():
+        genres_started.set()
+        return {28: 'action'}
+
+    mocker.patch('movie_collection.models.movie_model.get_genres', side_effect=get_genres_in_background)
+    mock_response = mocker.Mock()
+    # The search only "returns" once the genre lookup has started elsewhere
+    mock_response.json.side_effect = lambda: {'results': [{
+        'id': 1,
+        'title': 'Test Movie',
+        'release_date': '2023-01-01',
+        'original_language': 'en',
+        'genre_ids': [28],
+    }]} if genres_started.wait(timeout=2) else {'results': []}
+    mock_credit = mocker.Mock()
+    mock_credit.json.return_value = {'crew': [{'job': 'Director', 'name': 'Directron'}]}
+    mock_tmdb(mocker, {'/search/movie': mock_response, '/credits': mock_credit})
+    mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
+
+    movie = find_movie_by_name("Test Movie")
+    assert movie.genres == ['action']
+    assert movie.director == 'Directron'
+
 def test_find_movie_by_name_not_found(mocker):
     """Test searching for a non-existent movie."""
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'results': []}
-    mocker.patch('requests.get', return_value=mock_response)
+    mocker.patch('requests.Session.get', return_value=mock_response)
     
     with pytest.raises(ValueError, match="No movies found."):
         find_movie_by_name("Nonexistent Movie")
@@ -315,13 +930,111 @@ def test_find_movie_by_year(mocker):
             'name': 'Directron'
         }]
     }
-    mocker.patch('requests.get', side_effect=[mock_response, mock_genres, mock_credit])
+    mock_tmdb(mocker, {'/discover/movie': mock_response, '/genre/movie/list': mock_genres, '/credits': mock_credit})
     mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
     
     movie = find_movie_by_year(2023)
     assert movie.year == 2023
     assert isinstance(movie, Movie)
 
+def test_find_movie_by_year_served_from_mirror(mock_cursor, mocker):
+    """Test that a mirrored year is answered without calling TMDB discover or credits."""
+    mock_cursor.fetchone.side_effect = [
+        (3,),
+        (7, 'Mirrored Movie', '2001-05-01', 'en', '28,12', 'Mirror Director'),
+        None,  # not in the catalog yet
+    ]
+    mocker.patch('movie_collection.models.movie_model.random.randrange', return_value=1)
+    mocker.patch('movie_collection.models.movie_model.get_genres', return_value={28: 'Action', 12: 'Adventure'})
+    mock_add = mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
+    mock_get = mocker.patch('requests.Session.get')
+
+    movie = find_movie_by_year(2001)
+
+    assert movie.name == 'Mirrored Movie'
+    assert movie.director == 'Mirror Director'
+    assert movie.genres == ['Action', 'Adventure']
+    mock_get.assert_not_called()
+    mock_add.assert_called_once_with('Mirrored Movie', 2001, 'Mirror Director', ['Action', 'Adventure'], 'en', upsert=True)
+    assert mock_cursor.execute.call_args_list[1][0][1] == ('year:2001', 1)
+
+def tmdb_discover_result(mocker, title):
+    """Mock a discover call returning one movie, plus the genre map and its credits."""
+    mock_discover = mocker.Mock()
+    mock_discover.json.return_value = {'results': [{
+        'id': 1, 'title': title, 'release_date': '1995-12-15', 'original_language': 'en', 'genre_ids': [28],
+    }]}
+    mock_genres = mocker.Mock()
+    mock_genres.json.return_value = {'genres': [{'id': 28, 'name': 'Action'}]}
+    mock_credit = mocker.Mock()
+    mock_credit.json.return_value = {'crew': [{'job': 'Director', 'name': 'Michael Mann'}]}
+    return mock_tmdb(mocker, {'/discover/movie': mock_discover, '/genre/movie/list': mock_genres, '/credits': mock_credit})
+
+def test_find_movie_returns_stored_movie_without_credits(catalog_db, mocker, catalog_version):
+    """Test that a pick already in the catalog is served as stored, with no credits call or write."""
+    add_movie_to_list("Heat", 1995, "Stored Director", ["Action"], "en", favorite=True)
+    mock_get = tmdb_discover_result(mocker, "Heat")
+
+    movie = find_movie_by_year(1995)
+
+    assert movie == Movie("Heat", 1995, "Stored Director", ["Action"], "en", favorite=True)
+    assert not any(call[0][0].endswith('/credits') for call in mock_get.call_args_list)
+    assert catalog_version.current()[1] == 1
+
+def test_find_movie_keeps_deleted_movie_deleted(catalog_db, catalog_version, mocker):
+    """Test that finding a movie the user deleted returns it without putting it back in the list."""
+    add_movie_to_list("Heat", 1995, "Michael Mann", ["Action"], "en")
+    delete_movie_from_list(1)
+    tmdb_discover_result(mocker, "Heat")
+    version = catalog_version.current()[1]
+
+    assert find_movie_by_year(1995).name == "Heat"
+
+    with sqlite3.connect(catalog_db) as conn:
+        assert conn.execute("SELECT id, deleted FROM movies").fetchall() == [(1, 1)]
+    assert catalog_version.current()[1] == version
+
+def test_add_movie_to_list_upsert_keeps_deleted_movie(catalog_db):
+    """Test that an upsert of a deleted movie does not restore it."""
+    add_movie_to_list("Heat", 1995, "Michael Mann", ["Action"], "en")
+    delete_movie_from_list(1)
+
+    assert add_movie_to_list("Heat", 1995, "Michael Mann", ["Action"], "en", upsert=True) is False
+    with sqlite3.connect(catalog_db) as conn:
+        assert conn.execute("SELECT deleted FROM movies").fetchall() == [(1,)]
+
+def test_find_movie_adds_new_movie(catalog_db, mocker):
+    """Test that a new pick is fetched with its credits and stored."""
+    mock_get = tmdb_discover_result(mocker, "Heat")
+
+    movie = find_movie_by_year(1995)
+
+    assert movie.director == "Michael Mann"
+    assert any(call[0][0].endswith('/credits') for call in mock_get.call_args_list)
+    with sqlite3.connect(catalog_db) as conn:
+        assert conn.execute("SELECT name, director, deleted FROM movies").fetchall() == [("Heat", "Michael Mann", 0)]
+
+def test_add_movie_to_list_upsert(catalog_db, catalog_version):
+    """Test that an upsert keeps a stored movie instead of raising, and reports whether it changed."""
+    assert add_movie_to_list("Heat", 1995, "Michael Mann", ["Action"], "en", upsert=True) is True
+    assert add_movie_to_list("Heat", 2000, "Someone Else", ["Comedy"], "fr", upsert=True) is False
+
+    with sqlite3.connect(catalog_db) as conn:
+        assert conn.execute("SELECT year, director FROM movies").fetchall() == [(1995, "Michael Mann")]
+    assert catalog_version.current()[1] == 1
+
+def test_pick_from_mirror_slice_not_synced(mock_cursor):
+    """Test that an unsynced slice falls through to TMDB."""
+    assert pick_from_mirror('genre', 28) is None
+    mock_cursor.execute.assert_called_once_with(
+        "SELECT movie_count FROM tmdb_mirror_slices WHERE slice = ?", ('genre:28',)
+    )
+
+def test_pick_from_mirror_database_error(mock_cursor):
+    """Test that a missing mirror table does not break the search."""
+    mock_cursor.execute.side_effect = sqlite3.OperationalError("no such table: tmdb_mirror_slices")
+    assert pick_from_mirror('language', 'fr') is None
+
 def test_find_movie_by_name_empty_input():
     """Test searching for a movie with empty name."""
     with pytest.raises(ValueError, match="No movies found."):
@@ -331,7 +1044,7 @@ def test_find_movie_by_year_not_found(mocker):
     """Test searching for a movie in a year with no results."""
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'results': []}
-    mocker.patch('requests.get', return_value=mock_response)
+    mocker.patch('requests.Session.get', return_value=mock_response)
     
     with pytest.raises(ValueError, match="No movies found for the year: '1800'."):
         find_movie_by_year(1800)
@@ -372,7 +1085,7 @@ def test_search_movie_by_language(mocker):
             'name': 'Directron'
         }]
     }
-    mocker.patch('requests.get', side_effect=[mock_response, mock_genres, mock_credit])
+    mock_tmdb(mocker, {'/discover/movie': mock_response, '/genre/movie/list': mock_genres, '/credits': mock_credit})
     mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
     
     movie = find_movie_by_language("fr")
@@ -415,13 +1128,128 @@ def test_search_movie_by_director(mocker):
             'name': 'action'
         }]
     }
-    mocker.patch('requests.get', side_effect = [mock_response, mock_credits, mock_genres])
+    mock_tmdb(mocker, {'/search/person': mock_response, '/movie_credits': mock_credits, '/genre/movie/list': mock_genres})
     mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
     
     movie = find_movie_by_director("Test Director")
     assert movie.director == "Test Director"
     assert isinstance(movie, Movie)
 
+def mock_director_tmdb(mocker):
+    """Mock TMDB for a director with two directed movies and one other credit."""
+    mock_person = mocker.Mock()
+    mock_person.json.return_value = {'results': [{'id': 9, 'name': 'Michael Mann'}]}
+    mock_credits = mocker.Mock()
+    mock_credits.json.return_value = {'crew': [
+        {'id': 3, 'job': 'Director', 'title': 'Heat', 'release_date': '1995-12-15', 'original_language': 'en', 'genre_ids': [28]},
+        {'id': 4, 'job': 'Director', 'title': 'Collateral', 'release_date': '2004-08-06', 'original_language': 'en', 'genre_ids': [28, 35]},
+        {'id': 5, 'job': 'Writer', 'title': 'Miami Vice', 'release_date': '2006-07-28', 'original_language': 'en', 'genre_ids': [28]},
+    ]}
+    return mock_tmdb(mocker, {'/search/person': mock_person, '/movie_credits': mock_credits})
+
+def director_calls(mock_get):
+    return [call[0][0] for call in mock_get.call_args_list if '/person' in call[0][0]]
+
+def test_find_movie_by_director_uses_stored_filmography(catalog_db, mocker):
+    """Test that a repeat director query reads the stored filmography instead of calling TMDB."""
+    mock_get = mock_director_tmdb(mocker)
+
+    first = find_movie_by_director("Michael Mann")
+    clear_tmdb_cache()
+    second = find_movie_by_director("  michael   MANN ")
+
+    assert {first.name, second.name} <= {'Heat', 'Collateral'}
+    assert len(director_calls(mock_get)) == 2
+    with sqlite3.connect(catalog_db) as conn:
+        assert conn.execute("SELECT name, person_id FROM tmdb_directors").fetchall() == [('michael mann', 9)]
+        assert conn.execute("SELECT tmdb_id, genre_ids FROM tmdb_director_movies ORDER BY tmdb_id").fetchall() == [(3, '28'), (4, '28,35')]
+
+def test_find_movie_by_director_refreshes_expired_filmography(catalog_db, mocker):
+    """Test that a filmography past its TTL is fetched again."""
+    mocker.patch('movie_collection.models.movie_model.TMDB_DIRECTOR_TTL', 0)
+    mock_get = mock_director_tmdb(mocker)
+
+    find_movie_by_director("Michael Mann")
+    clear_tmdb_cache()
+    find_movie_by_director("Michael Mann")
+
+    assert len(director_calls(mock_get)) == 4
+
+def test_find_movie_by_director_serves_stale_filmography_when_tmdb_fails(catalog_db, mocker):
+    """Test that an expired filmography is used when TMDB is unavailable."""
+    mock_director_tmdb(mocker)
+    find_movie_by_director("Michael Mann")
+    mocker.patch('movie_collection.models.movie_model.TMDB_DIRECTOR_TTL', 0)
+    mocker.patch('movie_collection.models.movie_model._tmdb_get', side_effect=RuntimeError("TMDB is down"))
+
+    assert find_movie_by_director("Michael Mann").name in ('Heat', 'Collateral')
+
+    with pytest.raises(RuntimeError, match="TMDB is down"):
+        find_movie_by_director("Someone Else")
+
+def test_find_movie_by_director_does_not_store_error_payload(catalog_db, mocker):
+    """Test that a TMDB error instead of credits is not stored as an empty filmography."""
+    mock_person = mocker.Mock()
+    mock_person.json.return_value = {'results': [{'id': 9, 'name': 'Michael Mann'}]}
+    mock_error = mocker.Mock()
+    mock_error.json.return_value = {'success': False, 'status_code': 11, 'status_message': 'Internal error.'}
+    mock_tmdb(mocker, {'/search/person': mock_person, '/movie_credits': mock_error})
+
+    with pytest.raises(RuntimeError, match="TMDB movie credits failed: Internal error."):
+        find_movie_by_director("Michael Mann")
+    with sqlite3.connect(catalog_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM tmdb_directors").fetchone() == (0,)
+
+    clear_tmdb_cache()
+    mock_get = mock_director_tmdb(mocker)
+    assert find_movie_by_director("Michael Mann").name in ('Heat', 'Collateral')
+    assert len(director_calls(mock_get)) == 2
+
+def test_find_movie_by_director_serves_stale_filmography_on_error_payload(catalog_db, mocker):
+    """Test that an expired filmography is kept and served when TMDB answers with an error payload."""
+    mock_director_tmdb(mocker)
+    find_movie_by_director("Michael Mann")
+    mocker.patch('movie_collection.models.movie_model.TMDB_DIRECTOR_TTL', 0)
+    clear_tmdb_cache()
+    mock_error = mocker.Mock()
+    mock_error.json.return_value = {'success': False, 'status_message': 'Internal error.'}
+    mocker.patch('requests.Session.get', return_value=mock_error)
+
+    assert find_movie_by_director("Michael Mann").name in ('Heat', 'Collateral')
+    with sqlite3.connect(catalog_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM tmdb_director_movies").fetchone() == (2,)
+
+def test_find_movie_by_director_serves_stale_filmography_on_non_json_response(catalog_db, mocker):
+    """Test that an expired filmography is served when TMDB answers with a body that is not JSON."""
+    mock_director_tmdb(mocker)
+    find_movie_by_director("Michael Mann")
+    mocker.patch('movie_collection.models.movie_model.TMDB_DIRECTOR_TTL', 0)
+    clear_tmdb_cache()
+    mock_html = mocker.Mock()
+    mock_html.status_code = 404
+    mock_html.json.side_effect = ValueError("Expecting value")
+    mocker.patch('requests.Session.get', return_value=mock_html)
+
+    assert find_movie_by_director("Michael Mann").name in ('Heat', 'Collateral')
+
+def test_find_movie_by_director_drops_filmography_of_replaced_person(catalog_db, mocker):
+    """Test that when a name resolves to a new person, the old person's stored movies are deleted."""
+    mocker.patch('movie_collection.models.movie_model.TMDB_DIRECTOR_TTL', 0)
+    mock_director_tmdb(mocker)
+    find_movie_by_director("Michael Mann")
+    clear_tmdb_cache()
+    mock_person = mocker.Mock()
+    mock_person.json.return_value = {'results': [{'id': 12, 'name': 'Michael Mann'}]}
+    mock_credits = mocker.Mock()
+    mock_credits.json.return_value = {'crew': [
+        {'id': 6, 'job': 'Director', 'title': 'Thief', 'release_date': '1981-03-27', 'original_language': 'en', 'genre_ids': [80]},
+    ]}
+    mock_tmdb(mocker, {'/search/person': mock_person, '/movie_credits': mock_credits})
+
+    assert find_movie_by_director("Michael Mann").name == 'Thief'
+    with sqlite3.connect(catalog_db) as conn:
+        assert conn.execute("SELECT person_id, tmdb_id FROM tmdb_director_movies").fetchall() == [(12, 6)]
+
 def test_search_movie_by_director_empty_input():
     """Test searching for a movie with empty director name."""
     with pytest.raises(ValueError, match="Director not found."):
@@ -431,7 +1259,7 @@ def test_search_movie_by_director_not_found(mocker):
     """Test searching for a non-existent director."""
     mock_response = mocker.Mock()
     mock_response.json.return_value = {'results': []}
-    mocker.patch('requests.get', return_value=mock_response)
+    mocker.patch('requests.Session.get', return_value=mock_response)
     
     with pytest.raises(ValueError, match="Director not found."):
         find_movie_by_director("Nonexistent Director")
@@ -447,7 +1275,7 @@ def test_search_movie_by_director_no_movies(mocker):
     }
     mock_credits = mocker.Mock()
     mock_credits.json.return_value = {'crew': []}
-    mocker.patch('requests.get', side_effect=[mock_response, mock_credits])
+    mock_tmdb(mocker, {'/search/person': mock_response, '/movie_credits': mock_credits})
     
     with pytest.raises(ValueError, match="No movies found with the director 'Test Director'."):
         find_movie_by_director("Test Director")
@@ -478,7 +1306,7 @@ def test_search_movie_by_genre(mocker):
             'name': 'Directron'
         }]
     }
-    mocker.patch('requests.get', side_effect=[mock_response, mock_genres, mock_credit])
+    mock_tmdb(mocker, {'/discover/movie': mock_response, '/genre/movie/list': mock_genres, '/credits': mock_credit})
     mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
     
     movie = find_movie_by_genre(28)  # Action genre ID
@@ -554,3 +1382,35 @@ def test_list_favorite_movies_empty(mock_cursor):
     # Verify the result
     assert favorite_movies == []
 
+def test_list_favorite_movies_page(catalog_db):
+    """Test paging through live favorites with the returned cursor."""
+    add_catalog_movies(catalog_db, ('Alien', True, False), ('Heat', False, False), ('Ran', True, True),
+                       ('Up', True, False), ('Jaws', True, False))
+
+    first = list_favorite_movies_page(limit=2)
+    second = list_favorite_movies_page(after_id=first['next_cursor'], limit=2)
+
+    assert first == {'favorite_movies': ['Alien', 'Up'], 'next_cursor': 4}
+    assert second == {'favorite_movies': ['Jaws'], 'next_cursor': None}
+
+def test_list_favorite_movies_page_without_index(catalog_db, mocker):
+    """Test that a database not yet migrated still serves pages, and the migration adds the index."""
+    mocker.patch.dict('os.environ', {'SQL_MIGRATE_FAVORITES_PATH': 'sql/migrate_favorites_index.sql'})
+    add_catalog_movies(catalog_db, ('Alien', True, False))
+    with sqlite3.connect(catalog_db) as conn:
+        conn.execute("DROP INDEX idx_movies_favorite_live")
+
+    assert list_favorite_movies_page() == {'favorite_movies': ['Alien'], 'next_cursor': None}
+
+    migrate_favorites_index()
+    with sqlite3.connect(catalog_db) as conn:
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT id FROM movies INDEXED BY idx_movies_favorite_live "
+                            "WHERE favorite = TRUE AND deleted = FALSE").fetchall()
+    assert 'idx_movies_favorite_live' in plan[0][-1]
+
+@pytest.mark.parametrize("limit", [0, 501])
+def test_list_favorite_movies_page_invalid_limit(limit):
+    """Test that out-of-range page sizes are rejected."""
+    with pytest.raises(ValueError, match="Limit must be between 1"):
+        list_favorite_movies_page(limit=limit)
+
@@ -0,0 +1,198 @@
+from contextlib import contextmanager
+import logging
+import os
+import sqlite3
+import time
+
+import pytest
+
+import movie_collection.utils.session_utils as session_utils
+from movie_collection.utils.catalog_version import CatalogVersion
+from movie_collection.utils.session_utils import (
+    RevocationStore,
+    issue_session_token,
+    reset_sessions,
+    revoke_session_token,
+    revoke_user_sessions,
+    verify_session_token
+)
+
+MIGRATE_SESSIONS_SQL = "sql/migrate_session_revocations.sql"
+
+
+@pytest.fixture(autouse=True)
+def secret_key(mocker):
+    mocker.patch.object(session_utils, 'SESSION_SECRET_KEY', 'test-secret')
+    reset_sessions()
+    yield
+    reset_sessions()
+
+
+@pytest.fixture(autouse=True)
+def session_db(tmp_path, mocker):
+    """Keep revocations in a per-test database and version file."""
+    path = str(tmp_path / "users.db")
+    with sqlite3.connect(path) as conn, open(MIGRATE_SESSIONS_SQL) as fh:
+        conn.executescript(fh.read())
+
+    @contextmanager
+    def real_get_users_db_connection():
+        conn = sqlite3.connect(path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    mocker.patch.object(session_utils, 'get_users_db_connection', real_get_users_db_connection)
+    mocker.patch.object(session_utils, 'session_version', CatalogVersion(str(tmp_path / "movies.db.sessions")))
+    return path
+
+
+def test_issue_and_verify_token():
+    """Test that an issued token verifies to its user."""
+    token = issue_session_token("testuser")
+    assert verify_session_token(token) == "testuser"
+
+
+def test_verify_token_tampered():
+    """Test that a token with a modified payload or signature is rejected."""
+    token = issue_session_token("testuser")
+    with pytest.raises(ValueError, match="Invalid session token"):
+        verify_session_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+    with pytest.raises(ValueError, match="Invalid session token"):
+        verify_session_token("")
+
+
+def test_verify_token_signed_with_other_key(mocker):
+    """Test that a token signed with a different secret key is rejected."""
+    token = issue_session_token("testuser")
+    mocker.patch.object(session_utils, 'SESSION_SECRET_KEY', 'other-secret')
+    reset_sessions()
+    with pytest.raises(ValueError, match="Invalid session token"):
+        verify_session_token(token)
+
+
+def test_verify_token_expired(mocker):
+    """Test that a token older than SESSION_TTL is rejected."""
+    token = issue_session_token("testuser")
+    mocker.patch.object(session_utils, 'SESSION_TTL', -1)
+    with pytest.raises(ValueError, match="Session token expired"):
+        verify_session_token(token)
+
+
+def test_revoke_session_token():
+    """Test that logging out one session leaves the user's other sessions valid."""
+    first = issue_session_token("testuser")
+    second = issue_session_token("testuser")
+    revoke_session_token(first)
+    with pytest.raises(ValueError, match="Session token revoked"):
+        verify_session_token(first)
+    assert verify_session_token(second) == "testuser"
+
+
+def test_revoke_user_sessions():
+    """Test that revoking a user's sessions only affects tokens issued before it."""
+    old_token = issue_session_token("testuser")
+    other_user = issue_session_token("otheruser")
+    revoke_user_sessions("testuser")
+    new_token = issue_session_token("testuser")
+
+    with pytest.raises(ValueError, match="Session token revoked"):
+        verify_session_token(old_token)
+    assert verify_session_token(new_token) == "testuser"
+    assert verify_session_token(other_user) == "otheruser"
+
+
+def test_revocation_store_prunes_old_entries(mocker):
+    """Test that revocations older than max_age are dropped."""
+    clock = mocker.patch('movie_collection.utils.session_utils.time.time', return_value=1000.0)
+    store = RevocationStore(max_age=60)
+    store.revoke_token("old")
+    store.revoke_user("olduser")
+    clock.return_value = 1100.0
+    store.revoke_token("new")
+
+    assert store._tokens == {"new": 1100.0}
+    assert store._users == {}
+
+
+def test_revocation_seen_by_other_workers(session_db, tmp_path, mocker):
+    """Test that a logout or password change recorded by another worker is enforced here."""
+    token = issue_session_token("testuser")
+    other_user = issue_session_token("otheruser")
+    assert verify_session_token(token) == "testuser"
+
+    # Another worker: same database and version file, its own in-memory state.
+    jti = session_utils._load(token)['jti']
+    with sqlite3.connect(session_db) as conn:
+        conn.execute("INSERT INTO session_revocations (jti, revoked_at) VALUES (?, ?)", (jti, time.time()))
+        conn.execute("INSERT INTO user_revocations (username, revoked_at) VALUES (?, ?)", ("otheruser", time.time()))
+    CatalogVersion(str(tmp_path / "movies.db.sessions")).bump()
+
+    with pytest.raises(ValueError, match="Session token revoked"):
+        verify_session_token(token)
+    with pytest.raises(ValueError, match="Session token revoked"):
+        verify_session_token(other_user)
+
+
+def test_revocations_reloaded_only_after_a_change(mocker):
+    """Test that verifying tokens reads the database only when the session version changed."""
+    token = issue_session_token("testuser")
+    verify_session_token(token)
+    load = mocker.spy(session_utils.revocations, 'load')
+
+    for _ in range(3):
+        verify_session_token(token)
+    load.assert_not_called()
+
+    revoke_user_sessions("otheruser")
+    verify_session_token(token)
+    load.assert_called_once()
+
+
+def test_revocations_reloaded_on_a_timer_without_version_file(mocker):
+    """Test that revocations are reloaded every SESSION_REVOCATION_RELOAD seconds when the version file is unreadable."""
+    mocker.patch.object(session_utils.session_version, 'current', return_value=None)
+    clock = mocker.patch('movie_collection.utils.session_utils.time.time', return_value=1000.0)
+    token = issue_session_token("testuser")
+    load = mocker.spy(session_utils.revocations, 'load')
+    mock_log = mocker.patch.object(session_utils, 'log_rate_limited')
+
+    for _ in range(3):
+        verify_session_token(token)
+    load.assert_called_once()
+
+    clock.return_value = 1000.0 + session_utils.SESSION_REVOCATION_RELOAD
+    verify_session_token(token)
+    assert load.call_count == 2
+    assert mock_log.call_args[0][1] == logging.WARNING
+
+
+def test_stored_revocations_are_pruned(session_db, mocker):
+    """Test that revocations older than SESSION_TTL are deleted when new ones are stored."""
+    clock = mocker.patch('movie_collection.utils.session_utils.time.time', return_value=1000.0)
+    revoke_user_sessions("olduser")
+    clock.return_value = 1000.0 + session_utils.SESSION_TTL + 1
+    revoke_user_sessions("newuser")
+
+    with sqlite3.connect(session_db) as conn:
+        assert conn.execute("SELECT username FROM user_revocations").fetchall() == [("newuser",)]
+
+
+def test_init_session_key_is_shared_after_fork(mocker):
+    """Test that without SESSION_SECRET_KEY a worker forked after init_session_key signs with the master's key."""
+    mocker.patch.object(session_utils, 'SESSION_SECRET_KEY', '')
+    reset_sessions()
+    session_utils.init_session_key()
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(write_fd, issue_session_token("testuser").encode())
+        os._exit(0)
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    with os.fdopen(read_fd) as fh:
+        token = fh.read()
+
+    assert verify_session_token(token) == "testuser"
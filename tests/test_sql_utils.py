@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from movie_collection.utils import sql_utils
+from movie_collection.utils.sql_utils import get_db_connection, get_pool_stats
+
+
+@pytest.fixture
+def db_path(tmp_path, mocker):
+    """Point the pool at a fresh database file and close its connections afterwards."""
+    path = str(tmp_path / "movies.db")
+    mocker.patch.object(sql_utils, "DB_PATH", path)
+    sql_utils.pool.close_all()
+    yield path
+    sql_utils.pool.close_all()
+
+##########################################################
+# Connection reuse
+##########################################################
+
+def test_connection_reused_on_same_thread(db_path):
+    """Test that repeated calls on one thread share a single connection."""
+    with get_db_connection() as first:
+        pass
+    with get_db_connection() as second:
+        pass
+    assert first is second
+    assert get_pool_stats()["opened_total"] == 1
+
+def test_connection_per_thread(db_path):
+    """Test that each thread gets its own connection."""
+    with get_db_connection() as main_conn:
+        pass
+    other = []
+
+    def worker():
+        with get_db_connection() as conn:
+            other.append(conn)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert other[0] is not main_conn
+
+def test_pragmas_applied(db_path):
+    """Test that pooled connections are opened with the tuned PRAGMA profile."""
+    with get_db_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+def test_checked_out_count(db_path):
+    """Test that the pool reports connections currently in use."""
+    assert get_pool_stats()["checked_out"] == 0
+    with get_db_connection():
+        with get_db_connection():
+            assert get_pool_stats()["checked_out"] == 2
+    assert get_pool_stats()["checked_out"] == 0
+
+##########################################################
+# Transactions
+##########################################################
+
+def test_uncommitted_work_rolled_back(db_path):
+    """Test that a failed block does not leak its transaction to the next caller."""
+    with get_db_connection() as conn:
+        conn.execute("CREATE TABLE movies (name TEXT)")
+        conn.commit()
+
+    with pytest.raises(ValueError):
+        with get_db_connection() as conn:
+            conn.execute("INSERT INTO movies VALUES ('Alien')")
+            raise ValueError("boom")
+
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0] == 0
+        assert not conn.in_transaction
+
+def test_reset_after_fork_opens_new_connection(db_path, mocker):
+    """Test that a process with a different pid does not reuse inherited connections."""
+    with get_db_connection() as parent_conn:
+        pass
+    mocker.patch("movie_collection.utils.sql_utils.os.getpid", return_value=-1)
+    with get_db_connection() as child_conn:
+        pass
+    assert child_conn is not parent_conn
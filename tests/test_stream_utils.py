@@ -0,0 +1,85 @@
+import io
+
+import pytest
+
+from movie_collection.utils.stream_utils import MalformedRecord, iter_json_records
+
+
+def test_iter_json_array_across_small_reads():
+    """Test that array elements split across reads are decoded correctly."""
+    body = b'[ {"name": "Alien", "year": 1979}, {"name": "Heat", "year": 1995}, 42 ]'
+    records = list(iter_json_records(io.BytesIO(body), read_size=3))
+    assert records == [{"name": "Alien", "year": 1979}, {"name": "Heat", "year": 1995}, 42]
+
+def test_iter_ndjson_keeps_going_after_bad_line():
+    """Test that a malformed NDJSON line is reported without stopping the stream."""
+    body = '{"name": "Alien"}\nnot json\n\n{"name": "Heat"}'.encode()
+    records = list(iter_json_records(io.BytesIO(body), read_size=4))
+    assert records[0] == {"name": "Alien"}
+    assert isinstance(records[1], MalformedRecord)
+    assert "line 2" in records[1].error
+    assert records[2] == {"name": "Heat"}
+
+def test_iter_ndjson_in_a_single_read():
+    """Test that NDJSON lines are split when the whole body arrives in the first read."""
+    body = b'{"name": "Alien"}\n{"name": "Heat"}\n{"name": "Ran"}\n'
+    assert list(iter_json_records(io.BytesIO(body))) == [{"name": "Alien"}, {"name": "Heat"}, {"name": "Ran"}]
+
+def test_iter_json_array_multibyte_split():
+    """Test that UTF-8 characters split across reads are decoded correctly."""
+    body = '[{"name": "Amélie"}]'.encode()
+    assert list(iter_json_records(io.BytesIO(body), read_size=1)) == [{"name": "Amélie"}]
+
+def test_iter_json_array_truncated():
+    """Test error when a JSON array body ends early."""
+    with pytest.raises(ValueError, match="Invalid JSON array element"):
+        list(iter_json_records(io.BytesIO(b'[{"name": "Alien"}, {"name": ')))
+
+def test_iter_json_array_numbers_split_before_exponent():
+    """Test that a number cut before its fraction or exponent is not ended early."""
+    body = b'[1.5e+10, -0.25, 2E-7]'
+    for read_size in range(1, len(body)):
+        assert list(iter_json_records(io.BytesIO(body), read_size=read_size)) == [1.5e+10, -0.25, 2E-7]
+
+class CountingReader(io.BytesIO):
+    """A body that records how many reads were made from it."""
+
+    def __init__(self, body):
+        super().__init__(body)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+def test_iter_json_array_syntax_error_stops_reading():
+    """Test that a malformed element fails at once instead of reading the rest of the body."""
+    body = CountingReader(b'[{"name": "Alien"}, {"name": x}, ' + b'{"name": "Heat"}, ' * 10000 + b'1]')
+    records = iter_json_records(body, read_size=64)
+
+    assert next(records) == {"name": "Alien"}
+    with pytest.raises(ValueError, match="Invalid JSON array element: Expecting value"):
+        next(records)
+    assert body.reads <= 2
+
+def test_iter_json_array_element_too_long():
+    """Test that an array element longer than max_record_size is rejected without buffering the body."""
+    body = CountingReader(b'[{"name": "' + b'x' * 10000 + b'"}]')
+
+    with pytest.raises(ValueError, match="longer than 100 characters"):
+        list(iter_json_records(body, read_size=64, max_record_size=100))
+    assert body.reads <= 4
+
+def test_iter_ndjson_line_too_long():
+    """Test that an overlong NDJSON line is reported and the following lines still parse."""
+    body = ('{"name": "' + 'x' * 500 + '"}\n{"name": "Heat"}\n').encode()
+    records = list(iter_json_records(io.BytesIO(body), read_size=64, max_record_size=100))
+
+    assert len(records) == 2
+    assert isinstance(records[0], MalformedRecord)
+    assert records[0].error == "Line 1 is longer than 100 characters"
+    assert records[1] == {"name": "Heat"}
+
+def test_iter_empty_body():
+    """Test that an empty body yields nothing."""
+    assert list(iter_json_records(io.BytesIO(b"  "))) == []
@@ -0,0 +1,92 @@
+import pytest
+import requests
+
+from movie_collection.utils.tmdb_client import TMDBClient, TokenBucket
+
+
+@pytest.fixture
+def client(mocker):
+    """A client with fast retries and no real sleeping."""
+    mocker.patch("movie_collection.utils.tmdb_client.time.sleep")
+    return TMDBClient(base_url="https://tmdb.test/3", api_key="key", max_retries=2, backoff_base=0.01)
+
+
+def make_response(mocker, status_code=200, payload=None, headers=None):
+    response = mocker.Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload if payload is not None else {}
+    return response
+
+##########################################################
+# Requests
+##########################################################
+
+def test_get_uses_session_with_timeouts(client, mocker):
+    """Test that requests go through the pooled session with the API key and timeouts."""
+    mock_get = mocker.patch.object(client.session, "get", return_value=make_response(mocker, payload={"results": []}))
+
+    assert client.get("/search/movie", {"query": "Alien"}) == {"results": []}
+
+    mock_get.assert_called_once_with(
+        "https://tmdb.test/3/search/movie",
+        params={"query": "Alien", "api_key": "key"},
+        timeout=client.timeout,
+    )
+
+def test_get_retries_on_rate_limit(client, mocker):
+    """Test that a 429 is retried, honouring Retry-After."""
+    sleep = mocker.patch("movie_collection.utils.tmdb_client.time.sleep")
+    mock_get = mocker.patch.object(client.session, "get", side_effect=[
+        make_response(mocker, 429, headers={"Retry-After": "1"}),
+        make_response(mocker, 503),
+        make_response(mocker, payload={"genres": []}),
+    ])
+
+    assert client.get("/genre/movie/list") == {"genres": []}
+    assert mock_get.call_count == 3
+    assert sleep.call_args_list[0][0][0] == 1.0
+
+def test_get_gives_up_after_max_retries(client, mocker):
+    """Test error when TMDB keeps returning server errors."""
+    mocker.patch.object(client.session, "get", return_value=make_response(mocker, 502))
+
+    with pytest.raises(RuntimeError, match="Request to TMDB failed with status 502"):
+        client.get("/discover/movie")
+    assert client.session.get.call_count == 3
+
+def test_get_timeout(client, mocker):
+    """Simulate a timeout on every attempt."""
+    mocker.patch.object(client.session, "get", side_effect=requests.exceptions.Timeout)
+
+    with pytest.raises(RuntimeError, match="Request to TMDB timed out."):
+        client.get("/discover/movie")
+
+def test_get_does_not_retry_client_errors(client, mocker):
+    """Test that a 401 is returned as-is rather than retried."""
+    mock_get = mocker.patch.object(client.session, "get", return_value=make_response(
+        mocker, 401, payload={"success": False, "status_code": 7}
+    ))
+
+    assert client.get("/search/movie")["success"] is False
+    assert mock_get.call_count == 1
+
+def test_get_non_json_response(client, mocker):
+    """Test that a body that is not JSON is reported as a failed request."""
+    response = make_response(mocker, 404)
+    response.json.side_effect = ValueError("Expecting value")
+    mocker.patch.object(client.session, "get", return_value=response)
+
+    with pytest.raises(RuntimeError, match="status 404: response is not JSON"):
+        client.get("/person/9/movie_credits")
+
+##########################################################
+# Rate limiting
+##########################################################
+
+def test_token_bucket_limits_burst(mocker):
+    """Test that the bucket only allows `capacity` immediate acquisitions."""
+    bucket = TokenBucket(rate=1, capacity=2)
+    assert bucket.acquire(timeout=0) is True
+    assert bucket.acquire(timeout=0) is True
+    assert bucket.acquire(timeout=0) is False
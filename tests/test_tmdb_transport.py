@@ -0,0 +1,106 @@
+import time
+
+import pytest
+import requests
+
+from benchmarks.stub_tmdb import StubTMDBServer
+from movie_collection.utils.tmdb_client import TMDBClient
+from movie_collection.utils.tmdb_transport import (
+    CassetteStore,
+    RecordingAdapter,
+    ReplayAdapter,
+    cassette_key,
+    make_adapter,
+)
+
+
+@pytest.fixture
+def stub():
+    with StubTMDBServer(results_per_page=2) as server:
+        yield server
+
+
+def make_client(base_url, transport, cassette_dir):
+    return TMDBClient(base_url=base_url, api_key="key", transport=transport, cassette_dir=str(cassette_dir), max_retries=0)
+
+##########################################################
+# Keys and store
+##########################################################
+
+def test_cassette_key_ignores_host_api_key_and_param_order():
+    """Test that recordings are found regardless of host, API key and parameter order."""
+    key = cassette_key("GET", "https://api.themoviedb.org/3/discover/movie?with_genres=35&page=2&api_key=one")
+
+    assert key == cassette_key("get", "http://127.0.0.1:8000/3/discover/movie?api_key=two&page=2&with_genres=35")
+    assert key != cassette_key("GET", "https://api.themoviedb.org/3/discover/movie?with_genres=35&page=3")
+    assert key != cassette_key("GET", "https://api.themoviedb.org/3/search/movie?with_genres=35&page=2")
+
+def test_cassette_store_round_trip(tmp_path):
+    """Test that entries are written to disk and readable by another store."""
+    entry = {'status': 200, 'body': '{"results": []}', 'elapsed': 0.1}
+    CassetteStore(str(tmp_path)).put("ab" * 32, entry)
+
+    assert CassetteStore(str(tmp_path)).get("ab" * 32) == entry
+    assert CassetteStore(str(tmp_path)).get("cd" * 32) is None
+    assert not list(tmp_path.rglob("*.tmp"))
+
+def test_make_adapter(tmp_path):
+    """Test that each transport gets its adapter and unknown ones are rejected."""
+    assert isinstance(make_adapter('record', 4, str(tmp_path)), RecordingAdapter)
+    assert isinstance(make_adapter('replay', 4, str(tmp_path)), ReplayAdapter)
+
+    with pytest.raises(ValueError, match="Unknown TMDB transport: 'tape'"):
+        make_adapter('tape', 4, str(tmp_path))
+
+##########################################################
+# Record and replay
+##########################################################
+
+def test_record_then_replay_offline(stub, tmp_path):
+    """Test that replay returns exactly what was recorded without calling the server."""
+    recorder = make_client(stub.base_url, 'record', tmp_path)
+    recorded = recorder.get('/discover/movie', {'primary_release_year': 1999})
+    credits = recorder.get('/movie/7/credits')
+    served = stub.requests
+
+    # A base URL nothing listens on proves the network is never used.
+    replayer = make_client("http://127.0.0.1:9/3", 'replay', tmp_path)
+
+    assert replayer.get('/discover/movie', {'primary_release_year': 1999}) == recorded
+    assert replayer.get('/movie/7/credits') == credits
+    assert stub.requests == served
+    assert replayer.limiter is None
+
+def test_replay_miss_fails_without_retrying(tmp_path, mocker):
+    """Test that a request that was never recorded fails immediately."""
+    sleep = mocker.patch("movie_collection.utils.tmdb_client.time.sleep")
+    client = TMDBClient(base_url="http://127.0.0.1:9/3", api_key="key", transport='replay',
+                        cassette_dir=str(tmp_path), max_retries=3)
+
+    with pytest.raises(RuntimeError, match="No recorded TMDB response for GET /3/search/movie"):
+        client.get('/search/movie', {'query': 'Alien'})
+    sleep.assert_not_called()
+
+def test_record_skips_retryable_statuses(tmp_path, mocker):
+    """Test that throttled and failed responses are not recorded."""
+    store = CassetteStore(str(tmp_path))
+    adapter = RecordingAdapter(store)
+    response = mocker.Mock(status_code=503)
+    mocker.patch("requests.adapters.HTTPAdapter.send", return_value=response)
+    request = mocker.Mock(method="GET", url="https://tmdb.test/3/discover/movie?page=1")
+
+    assert adapter.send(request) is response
+    assert store.get(cassette_key("GET", request.url)) is None
+
+def test_replay_latency(tmp_path):
+    """Test the fixed and the recorded replay latency."""
+    store = CassetteStore(str(tmp_path))
+    url = "https://tmdb.test/3/genre/movie/list"
+    store.put(cassette_key("GET", url), {'status': 200, 'body': '{"genres": []}', 'elapsed': 0.05})
+
+    request = requests.Request("GET", url).prepare()
+    for latency in ('0.05', 'recorded'):
+        start = time.perf_counter()
+        response = ReplayAdapter(store, latency).send(request)
+        assert time.perf_counter() - start >= 0.05
+        assert response.json() == {"genres": []}
@@ -1,8 +1,50 @@
+from contextlib import contextmanager
+import sqlite3
+
 import pytest
 from flask import Flask
+from sqlalchemy import event
 
-from movie_collection.models.user_model import Users
+import movie_collection.utils.session_utils as session_utils
+from movie_collection.models.user_model import Users, clear_user_cache, user_cache
 from movie_collection.db import db
+from movie_collection.utils.catalog_version import CatalogVersion
+
+@pytest.fixture(autouse=True)
+def reset_user_cache():
+    """Start every test with an empty credential cache."""
+    clear_user_cache()
+    yield
+    clear_user_cache()
+
+@pytest.fixture(autouse=True)
+def session_store(tmp_path, mocker):
+    """Keep revocations and the session version in per-test files."""
+    path = str(tmp_path / "users.db")
+    with sqlite3.connect(path) as conn, open("sql/migrate_session_revocations.sql") as fh:
+        conn.executescript(fh.read())
+
+    @contextmanager
+    def real_get_users_db_connection():
+        conn = sqlite3.connect(path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    version = CatalogVersion(str(tmp_path / "movies.db.sessions"))
+    mocker.patch.object(session_utils, 'get_users_db_connection', real_get_users_db_connection)
+    mocker.patch.object(session_utils, 'session_version', version)
+    session_utils.reset_sessions()
+    yield version
+    session_utils.reset_sessions()
+
+@pytest.fixture(autouse=True)
+def credentials_store(tmp_path, mocker):
+    """Keep the credentials version in a per-test file."""
+    version = CatalogVersion(str(tmp_path / "movies.db.credentials"))
+    mocker.patch("movie_collection.models.user_model.credentials_version", version)
+    return version
 
 @pytest.fixture
 def sample_user():
@@ -20,12 +62,14 @@ def app():
     app.config['TESTING'] = True
     
     # Import and register your routes
-    from app import create_account, login, update_password
+    from app import create_account, login, update_password, logout, current_session
     
     # Register the routes
     app.add_url_rule('/create-account', 'create_account', create_account, methods=['POST'])
     app.add_url_rule('/login', 'login', login, methods=['POST'])
     app.add_url_rule('/update-password', 'update_password', update_password, methods=['POST'])
+    app.add_url_rule('/logout', 'logout', logout, methods=['POST'])
+    app.add_url_rule('/session', 'current_session', current_session, methods=['GET'])
     
     return app
 
@@ -91,4 +135,140 @@ def test_update_password(session, sample_user):
 def test_update_password_user_not_found(session):
     """Test updating the password for a non-existent user."""
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
-        Users.update_password("nonexistentuser", "newpass")
\ No newline at end of file
+        Users.update_password("nonexistentuser", "newpass")
+
+##########################################################
+# Credential Cache
+##########################################################
+
+@pytest.fixture
+def statements(session):
+    """Record the SQL statements sent to users.db."""
+    executed = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+    event.listen(db.engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(db.engine, "before_cursor_execute", record)
+
+def test_check_password_reads_through_cache(session, sample_user, statements):
+    """Test that repeated logins query the users table once."""
+    Users.create_user(**sample_user)
+    statements.clear()
+    for _ in range(5):
+        assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    assert Users.check_password(sample_user["username"], "wrongpassword") is False
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+
+def test_unknown_user_is_negatively_cached(session, statements):
+    """Test that lookups of a missing user are cached briefly."""
+    for _ in range(3):
+        with pytest.raises(ValueError, match="User ghost not found"):
+            Users.check_password("ghost", "password")
+    assert len(statements) == 1
+
+def test_create_user_clears_negative_entry(session, sample_user):
+    """Test that creating a user replaces a cached 'not found'."""
+    with pytest.raises(ValueError):
+        Users.check_password(sample_user["username"], sample_user["password"])
+    Users.create_user(**sample_user)
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+
+def test_update_password_invalidates_cache(session, sample_user):
+    """Test that the old password stops working right after an update."""
+    Users.create_user(**sample_user)
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    Users.update_password(sample_user["username"], "newpass")
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is False
+    assert Users.check_password(sample_user["username"], "newpass") is True
+    assert user_cache.stats()["size"] == 1
+
+def test_password_changed_by_other_worker_invalidates_cache(session, sample_user, credentials_store):
+    """Test that a cached password stops working once another worker changes it."""
+    Users.create_user(**sample_user)
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+
+    # Another worker updates the row and bumps the shared version; this
+    # process's cache is left as it was.
+    salt, hashed_password = Users._generate_hashed_password("newpass")
+    Users.query.filter_by(username=sample_user["username"]).update({'salt': salt, 'password': hashed_password})
+    db.session.commit()
+    CatalogVersion(credentials_store.path).bump()
+
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is False
+    assert Users.check_password(sample_user["username"], "newpass") is True
+
+def test_create_user_keeps_other_cached_credentials(session, sample_user, statements):
+    """Test that a new account does not invalidate other users' cached credentials."""
+    Users.create_user(**sample_user)
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    Users.create_user(username="newuser", password="newpass")
+    statements.clear()
+
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    assert statements == []
+
+def test_cache_uses_ttl_without_version_file(session, sample_user, statements, credentials_store, mocker):
+    """Test that credentials are still cached, with a warning, when the version file is unreadable."""
+    mocker.patch.object(credentials_store, 'current', return_value=None)
+    mock_log = mocker.patch("movie_collection.models.user_model.log_rate_limited")
+    Users.create_user(**sample_user)
+    statements.clear()
+
+    for _ in range(3):
+        assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    assert len(statements) == 1
+    mock_log.assert_called()
+
+##########################################################
+# Session Tokens
+##########################################################
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+def test_login_issues_session_token(app, session, sample_user, mocker):
+    """Test that a session token from /login authenticates without checking the password again."""
+    Users.create_user(**sample_user)
+    client = app.test_client()
+    token = client.post('/login', json=sample_user).get_json()['token']
+
+    check_password = mocker.spy(Users, 'check_password')
+    response = client.get('/session', headers=_auth(token))
+
+    assert response.status_code == 200
+    assert response.get_json()['username'] == sample_user["username"]
+    check_password.assert_not_called()
+
+def test_session_requires_token(app, session):
+    """Test that requests without a valid bearer token are rejected."""
+    client = app.test_client()
+    assert client.get('/session').status_code == 401
+    assert client.get('/session', headers=_auth("not-a-token")).status_code == 401
+
+def test_logout_revokes_token(app, session, sample_user):
+    """Test that a token stops working after /logout."""
+    Users.create_user(**sample_user)
+    client = app.test_client()
+    token = client.post('/login', json=sample_user).get_json()['token']
+
+    assert client.post('/logout', headers=_auth(token)).status_code == 200
+    response = client.get('/session', headers=_auth(token))
+    assert response.status_code == 401
+    assert response.get_json()['error'] == "Session token revoked"
+
+def test_update_password_revokes_sessions(app, session, sample_user):
+    """Test that changing the password revokes earlier tokens and returns a new one."""
+    Users.create_user(**sample_user)
+    client = app.test_client()
+    old_token = client.post('/login', json=sample_user).get_json()['token']
+
+    response = client.post('/update-password', json={
+        "username": sample_user["username"],
+        "old_password": sample_user["password"],
+        "new_password": "newpass"
+    })
+
+    assert response.status_code == 200
+    assert client.get('/session', headers=_auth(old_token)).status_code == 401
+    assert client.get('/session', headers=_auth(response.get_json()['token'])).status_code == 200